@@ -1,10 +1,14 @@
 # ai_predictor/dataset.py
 
 from __future__ import annotations
+import mmap
 import os
 import numpy as np
 import torch
-from torch.utils.data import Dataset, DataLoader, random_split
+from torch.utils.data import Dataset, DataLoader, IterableDataset, Subset, get_worker_info
+
+from data.make_synthetic_data import generate_sequence_batch
+from data.shards import open_feature_store
 
 # Default temporal window settings (can be adjusted)
 T_IN = 10   # how many past steps we feed into the model
@@ -17,30 +21,50 @@ class OilSpillSequenceDataset(Dataset):
 
     Expected .npz structure:
         features: (N, T, C, H, W)
-        C = 3 : oil, U, V
+        C = 3 : oil, U, V   (C = 5 with wind: + wind U, wind V)
+
+    `npz_path` may also be a raw float32 .npy (memory-mapped, see
+    `python -m data.shards` to convert an .npz), a shard-set directory
+    written by data/shards.py, or an in-memory (N, T, C, H, W) array.
+    Files are read lazily per sample, and a memory map is re-opened rather
+    than copied in each DataLoader worker.
+
+    Samples are indexed by (sequence, offset): with all_windows=True every
+    window t0 = 0 .. T - T_IN - T_OUT of every sequence is a sample, otherwise
+    only t0 = 0. Windows are slices of the stored array, never stacked copies.
 
     __getitem__ returns:
         X: (T_IN, C, H, W)
         y: (T_OUT, 1, H, W)   # target is oil channel only
+        forcing: (T_OUT, C - 1, H, W)   # only with with_forcing=True:
+            the known forcing channels at the target times, for
+            autoregressive rollout (ai_predictor/rollout.py)
     """
 
     def __init__(
         self,
-        npz_path: str,
+        npz_path,
         t_in: int = T_IN,
         t_out: int = T_OUT,
+        all_windows: bool = True,
+        with_forcing: bool = False,
     ):
         super().__init__()
-        if not os.path.isfile(npz_path):
-            raise FileNotFoundError(f"npz file not found: {npz_path}")
-
-        data = np.load(npz_path)
-        if "features" not in data:
-            raise KeyError("npz file must contain 'features' array")
-
-        self.features = data["features"].astype(np.float32)  # (N, T, C, H, W)
+        self._memmap_args = None
+        if isinstance(npz_path, np.ndarray):
+            self.path = None
+            self.features = npz_path.astype(np.float32, copy=False)
+            if isinstance(self.features, np.memmap) and isinstance(self.features.base, mmap.mmap):
+                # A whole-file memory map (not a view of one): reopen it in
+                # workers instead of pickling its data
+                f = self.features
+                self._memmap_args = (f.filename, f.dtype, f.offset, f.shape)
+        else:
+            self.path = npz_path
+            self.features = open_feature_store(npz_path)  # (N, T, C, H, W)
         self.t_in = int(t_in)
         self.t_out = int(t_out)
+        self.with_forcing = bool(with_forcing)
 
         self.N, self.T, self.C, self.H, self.W = self.features.shape
         if self.T < self.t_in + self.t_out:
@@ -48,20 +72,186 @@ class OilSpillSequenceDataset(Dataset):
                 f"Sequence length T={self.T} is too short for T_IN+T_OUT={self.t_in + self.t_out}"
             )
 
+        # Window index: sample i -> (window_seq[i], window_offset[i])
+        n_offsets = self.T - self.t_in - self.t_out + 1 if all_windows else 1
+        self.window_seq = np.repeat(np.arange(self.N), n_offsets)
+        self.window_offset = np.tile(np.arange(n_offsets), self.N)
+
+    def __getstate__(self):
+        # Pickling a memmap would copy the whole array into each worker;
+        # drop it only when it can be reopened from a path
+        state = self.__dict__.copy()
+        reopenable = self.path is not None or self._memmap_args is not None
+        if isinstance(self.features, np.memmap) and reopenable:
+            state["features"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self.features is None:
+            if self.path is not None:
+                self.features = open_feature_store(self.path)
+            else:
+                filename, dtype, offset, shape = self._memmap_args
+                self.features = np.memmap(filename, dtype=dtype, mode="r", offset=offset, shape=shape)
+
     def __len__(self) -> int:
-        # each sequence is treated as one sample
-        return self.N
+        return len(self.window_seq)
 
     def __getitem__(self, idx: int):
-        seq = self.features[idx]  # (T, C, H, W)
+        n = self.window_seq[idx]
+        t0 = self.window_offset[idx]
+        seq = self.features[n]  # (T, C, H, W)
+
+        t1 = t0 + self.t_in
+        X = seq[t0:t1]                            # (T_IN, C, H, W)
+        y_oil = seq[t1:t1 + self.t_out, 0:1]      # (T_OUT, 1, H, W)
+
+        if self.with_forcing:
+            forcing = seq[t1:t1 + self.t_out, 1:]  # (T_OUT, C - 1, H, W)
+            return _as_tensor(X), _as_tensor(y_oil), _as_tensor(forcing)
+        return _as_tensor(X), _as_tensor(y_oil)
+
+    def subset(self, sequences) -> Subset:
+        """All windows of the given sequence indices, as a torch Subset."""
+        mask = np.isin(self.window_seq, np.asarray(sequences))
+        return Subset(self, np.flatnonzero(mask).tolist())
+
+
+def _as_tensor(a: np.ndarray) -> torch.Tensor:
+    """Share memory with `a` when possible; copy out of read-only memory maps."""
+    if not a.flags.writeable:
+        a = np.array(a)
+    return torch.from_numpy(a)
+
+
+class PhysicsSequenceStream(IterableDataset):
+    """
+    Training windows simulated on the fly, without touching disk.
+
+    Each DataLoader worker runs the same physics as make_synthetic_data.py
+    (generate_initial_oil, generate_current_field, batched step_physics) on
+    `sequences_per_batch` sequences at a time, then yields their windows in
+    shuffled order. Memory is bounded by one batch of sequences per worker,
+    and simulation overlaps with model compute in the main process.
+
+    Worker w in epoch e draws from SeedSequence([seed, e, w]), so workers
+    never repeat each other and `set_epoch` gives fresh data every epoch.
+    With samples_per_epoch=None the stream is endless.
+
+    Yields:
+        X: (T_IN, C, H, W)
+        y: (T_OUT, 1, H, W)
+        forcing: (T_OUT, C - 1, H, W)   # only with with_forcing=True
+    """
+
+    def __init__(
+        self,
+        t_in: int = T_IN,
+        t_out: int = T_OUT,
+        H: int = 40,
+        W: int = 40,
+        t_total: int | None = None,
+        sequences_per_batch: int = 16,
+        samples_per_epoch: int | None = 1024,
+        seed: int = 0,
+        with_forcing: bool = False,
+    ):
+        super().__init__()
+        self.t_in = int(t_in)
+        self.t_out = int(t_out)
+        self.H, self.W = int(H), int(W)
+        self.t_total = int(t_total) if t_total is not None else 2 * (self.t_in + self.t_out)
+        if self.t_total < self.t_in + self.t_out:
+            raise ValueError(
+                f"t_total={self.t_total} is too short for T_IN+T_OUT={self.t_in + self.t_out}"
+            )
+        self.sequences_per_batch = int(sequences_per_batch)
+        self.samples_per_epoch = samples_per_epoch
+        self.seed = int(seed)
+        self.with_forcing = bool(with_forcing)
+        self.epoch = 0
+
+    def set_epoch(self, epoch: int) -> None:
+        """Select the data for `epoch`; call before iterating each epoch."""
+        self.epoch = int(epoch)
+
+    def __len__(self) -> int:
+        if self.samples_per_epoch is None:
+            raise TypeError("endless PhysicsSequenceStream has no length")
+        return int(self.samples_per_epoch)
+
+    def __iter__(self):
+        info = get_worker_info()
+        worker_id = info.id if info is not None else 0
+        num_workers = info.num_workers if info is not None else 1
+
+        # Split the epoch's samples across workers
+        if self.samples_per_epoch is None:
+            quota = None
+        else:
+            quota = self.samples_per_epoch // num_workers
+            quota += int(worker_id < self.samples_per_epoch % num_workers)
+
+        seed_seq = np.random.SeedSequence([self.seed, self.epoch, worker_id])
+        shuffle_rng = np.random.default_rng(seed_seq.spawn(1)[0])
+        n_offsets = self.t_total - self.t_in - self.t_out + 1
+
+        produced = 0
+        while quota is None or produced < quota:
+            rngs = [np.random.default_rng(s) for s in seed_seq.spawn(self.sequences_per_batch)]
+            features = generate_sequence_batch(rngs, self.t_total, self.H, self.W)
+
+            for w in shuffle_rng.permutation(len(rngs) * n_offsets):
+                if quota is not None and produced >= quota:
+                    return
+                n, t0 = divmod(int(w), n_offsets)
+                t1 = t0 + self.t_in
+                X = features[n, t0:t1]
+                y_oil = features[n, t1:t1 + self.t_out, 0:1]
+                produced += 1
+                if self.with_forcing:
+                    forcing = features[n, t1:t1 + self.t_out, 1:]
+                    yield _as_tensor(X), _as_tensor(y_oil), _as_tensor(forcing)
+                else:
+                    yield _as_tensor(X), _as_tensor(y_oil)
+
+
+def build_stream_dataloaders(
+    batch_size: int = 4,
+    t_in: int = T_IN,
+    t_out: int = T_OUT,
+    num_workers: int = 0,
+    samples_per_epoch: int = 1024,
+    eval_samples: int = 256,
+    **stream_kwargs,
+):
+    """
+    Loaders backed by `PhysicsSequenceStream` instead of files on disk.
 
-        X = seq[: self.t_in]                      # (T_IN, C, H, W)
-        y_oil = seq[self.t_in:self.t_in + self.t_out, 0:1]  # (T_OUT, 1, H, W)
+    Training data changes every epoch (call `train_loader.dataset.set_epoch`);
+    validation and test streams use fixed seeds and stay the same.
+    """
+    train_set = PhysicsSequenceStream(
+        t_in=t_in, t_out=t_out, samples_per_epoch=samples_per_epoch, seed=0, **stream_kwargs
+    )
+    val_set = PhysicsSequenceStream(
+        t_in=t_in, t_out=t_out, samples_per_epoch=eval_samples, seed=1, **stream_kwargs
+    )
+    test_set = PhysicsSequenceStream(
+        t_in=t_in, t_out=t_out, samples_per_epoch=eval_samples, seed=2, **stream_kwargs
+    )
 
-        X = torch.from_numpy(X)  # float32
-        y = torch.from_numpy(y_oil)
+    train_loader = DataLoader(
+        train_set,
+        batch_size=batch_size,
+        num_workers=num_workers,
+        drop_last=True,
+    )
+    val_loader = DataLoader(val_set, batch_size=batch_size, num_workers=num_workers)
+    test_loader = DataLoader(test_set, batch_size=batch_size, num_workers=num_workers)
 
-        return X, y
+    return train_loader, val_loader, test_loader
 
 
 def build_dataloaders(
@@ -72,19 +262,20 @@ def build_dataloaders(
     t_in: int = T_IN,
     t_out: int = T_OUT,
     num_workers: int = 0,
+    with_forcing: bool = False,
 ):
-    dataset = OilSpillSequenceDataset(npz_path, t_in=t_in, t_out=t_out)
+    dataset = OilSpillSequenceDataset(npz_path, t_in=t_in, t_out=t_out, with_forcing=with_forcing)
 
-    n_total = len(dataset)
+    # Split by sequence so overlapping windows never straddle train/val/test
+    n_total = dataset.N
     n_test = int(n_total * test_ratio)
     n_val = int(n_total * val_ratio)
     n_train = n_total - n_val - n_test
 
-    train_set, val_set, test_set = random_split(
-        dataset,
-        [n_train, n_val, n_test],
-        generator=torch.Generator().manual_seed(42),
-    )
+    order = torch.randperm(n_total, generator=torch.Generator().manual_seed(42)).numpy()
+    train_set = dataset.subset(order[:n_train])
+    val_set = dataset.subset(order[n_train:n_train + n_val])
+    test_set = dataset.subset(order[n_train + n_val:])
 
     train_loader = DataLoader(
         train_set,
@@ -0,0 +1,221 @@
+# ai_predictor/inference.py
+"""
+Export and optimized inference for ConvLSTMPredictor.
+
+Production servers should not need the training code (or its Python loop
+over time steps and layers) to serve forecasts. `export_model` traces a
+trained model for a fixed T_in into a TorchScript artifact:
+
+    trace       the time / layer loops are unrolled into one graph
+    freeze      weights become constants, dead code is removed
+
+The artifact stores its own config (channels, T_in, t_out, ...) and is
+loaded with plain torch.jit.load, see `load_exported`. Batch size and grid
+size stay free; T_in is fixed by the trace. On CPU, loading also applies
+torch.jit.optimize_for_inference, which folds conv + bias and keeps
+activations in the oneDNN layout between convolutions instead of converting
+at every call. (Optimized modules hold oneDNN constants and cannot be saved,
+so this is done at load time and the file stays device-independent.)
+
+`InferenceEngine` runs batched predictions under torch.inference_mode with
+an exported artifact, an eager model, or an eager model wrapped in
+torch.compile (needs a C++ compiler; the first call compiles).
+
+`export_engine` is the one-call path for applications (app.py, run_demo.py):
+it exports a freshly trained model and serves it from the artifact, falling
+back to the eager model if the export fails.
+
+Usage:
+    export_model(model, "predictor_ts.pt", t_in=4)
+    engine = InferenceEngine.from_export("predictor_ts.pt")
+    pred = engine.predict(x)                 # (N, T_in, C, H, W) -> (N, t_out, H, W)
+
+    engine = export_engine(model, "predictor_ts.pt", t_in=4)
+
+    python -m ai_predictor.inference ai_predictor/checkpoints/predictor_best.pt predictor_ts.pt
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import os
+
+import numpy as np
+import torch
+
+CONFIG_FILE = "config.json"
+
+
+def model_config(model, t_in: int) -> dict:
+    """Shape parameters of a ConvLSTMPredictor, stored with exports."""
+    return {
+        "input_channels": model.cells[0].input_channels,
+        "hidden_channels": model.cells[0].hidden_channels,
+        "num_layers": model.num_layers,
+        "t_out": model.t_out,
+        "t_in": int(t_in),
+    }
+
+
+def export_model(
+    model,
+    path: str,
+    t_in: int,
+    grid_shape: tuple[int, int] = (64, 64),
+) -> torch.jit.ScriptModule:
+    """
+    Trace, freeze and save a trained model as TorchScript.
+
+    Args:
+        model: trained ConvLSTMPredictor (on the device it will run on)
+        path: output file (written atomically)
+        t_in: number of input frames the artifact accepts
+        grid_shape: (H, W) of the example input used for tracing; other
+            grid and batch sizes work with the artifact too
+
+    Returns:
+        the exported module
+    """
+    config = model_config(model, t_in)
+    param = next(model.parameters())
+    example = torch.zeros(1, t_in, config["input_channels"], *grid_shape,
+                          device=param.device, dtype=param.dtype)
+
+    model.eval()
+    with torch.no_grad():
+        module = torch.jit.freeze(torch.jit.trace(model, example))
+
+    tmp_path = path + ".tmp"
+    torch.jit.save(module, tmp_path, _extra_files={CONFIG_FILE: json.dumps(config)})
+    os.replace(tmp_path, path)
+    return module
+
+
+def load_exported(
+    path: str, map_location="cpu", optimize: bool | None = None
+) -> tuple[torch.jit.ScriptModule, dict]:
+    """
+    Load an artifact written by `export_model`: (module, config).
+
+    Needs only torch, not this package. `optimize` (default: on CPU) applies
+    torch.jit.optimize_for_inference to the loaded module.
+    """
+    extra = {CONFIG_FILE: ""}
+    module = torch.jit.load(path, map_location=map_location, _extra_files=extra).eval()
+    if optimize is None:
+        optimize = torch.device(map_location).type == "cpu"
+    if optimize:
+        module = torch.jit.optimize_for_inference(module)
+    return module, json.loads(extra[CONFIG_FILE])
+
+
+class InferenceEngine:
+    """
+    Batched forecasts with an exported, eager or compiled model.
+
+    Args:
+        model: ConvLSTMPredictor or TorchScript module
+        t_in: frames per input window (required for eager models only to
+            validate inputs; exported artifacts are fixed to their T_in)
+        batch_size: windows per forward pass
+        compile: wrap an eager model in torch.compile
+    """
+
+    def __init__(self, model, t_in: int | None = None, batch_size: int = 16, compile: bool = False):
+        self.model = model.eval()
+        self.t_in = t_in
+        self.batch_size = int(batch_size)
+        if compile:
+            if isinstance(model, torch.jit.ScriptModule):
+                raise ValueError("torch.compile applies to eager models, not TorchScript artifacts")
+            self.model = torch.compile(self.model)
+
+        param = next(model.parameters(), None)
+        self.device = param.device if param is not None else torch.device("cpu")
+
+    @classmethod
+    def from_export(cls, path: str, batch_size: int = 16, map_location="cpu",
+                    optimize: bool | None = None) -> "InferenceEngine":
+        module, config = load_exported(path, map_location, optimize)
+        engine = cls(module, t_in=config["t_in"], batch_size=batch_size)
+        engine.device = torch.device(map_location)
+        engine.config = config
+        return engine
+
+    def predict(self, x_seq) -> torch.Tensor:
+        """
+        Forecast every window of a batch.
+
+        Args:
+            x_seq: (N, T_in, C, H, W) tensor or numpy array
+
+        Returns:
+            (N, t_out, H, W) float32 tensor on the engine device
+        """
+        if isinstance(x_seq, np.ndarray):
+            x_seq = torch.from_numpy(np.ascontiguousarray(x_seq))
+        if self.t_in is not None and x_seq.shape[1] != self.t_in:
+            raise ValueError(f"expected {self.t_in} input frames, got {x_seq.shape[1]}")
+
+        outputs = []
+        with torch.inference_mode():
+            for start in range(0, x_seq.shape[0], self.batch_size):
+                batch = x_seq[start:start + self.batch_size]
+                batch = batch.to(device=self.device, dtype=torch.float32).contiguous()
+                outputs.append(self.model(batch))
+        return torch.cat(outputs)
+
+
+def export_engine(model, path: str, t_in: int, batch_size: int = 16) -> InferenceEngine:
+    """
+    Export `model` to `path` and return an engine over the artifact.
+
+    The artifact is loaded on the model's device (optimized on CPU). If
+    tracing or loading fails, the eager model is served instead, so an
+    application always gets a working engine.
+    """
+    device = next(model.parameters()).device
+    try:
+        export_model(model, path, t_in=t_in)
+        return InferenceEngine.from_export(path, batch_size=batch_size, map_location=device)
+    except (RuntimeError, torch.jit.Error) as e:
+        print(f"[WARN] TorchScript export failed ({e}); using the eager model")
+        return InferenceEngine(model, t_in=t_in, batch_size=batch_size)
+
+
+def main():
+    from ai_predictor.model_conv_lstm import ConvLSTMPredictor
+
+    parser = argparse.ArgumentParser(
+        description="Export a ConvLSTMPredictor checkpoint to TorchScript."
+    )
+    parser.add_argument("checkpoint", help="train_predictor checkpoint or a plain state_dict (.pth)")
+    parser.add_argument("out", help="output TorchScript file")
+    parser.add_argument("--t-in", type=int, help="input frames (default: from checkpoint, else 4)")
+    parser.add_argument("--channels", type=int, help="input channels (default: from checkpoint, else 3)")
+    parser.add_argument("--hidden", type=int, help="hidden channels (default: from checkpoint, else 32)")
+    parser.add_argument("--layers", type=int, help="ConvLSTM layers (default: from checkpoint, else 2)")
+    args = parser.parse_args()
+
+    checkpoint = torch.load(args.checkpoint, map_location="cpu")
+    if "model_state_dict" in checkpoint:
+        state_dict, saved = checkpoint["model_state_dict"], checkpoint.get("config", {})
+    else:
+        state_dict, saved = checkpoint, {}
+
+    t_out = saved.get("T_OUT", 1) if saved.get("MODE") == "direct" else 1
+    model = ConvLSTMPredictor(
+        input_channels=args.channels or saved.get("input_channels", 3),
+        hidden_channels=args.hidden or saved.get("hidden_channels", 32),
+        num_layers=args.layers or saved.get("num_layers", 2),
+        t_out=t_out,
+    )
+    model.load_state_dict(state_dict)
+    t_in = args.t_in or saved.get("T_IN", 4)
+
+    export_model(model, args.out, t_in=t_in)
+    print(f"[INFO] Exported {args.checkpoint} (T_in={t_in}, t_out={t_out}) to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 
 import torch
 import torch.nn as nn
+import torch.nn.functional as F
 
 
 class ConvLSTMCell(nn.Module):
@@ -8,11 +9,16 @@ class ConvLSTMCell(nn.Module):
     기본 ConvLSTM 셀.
     입력:  (B, C_in, H, W)
     hidden: (h, c) 각각 (B, C_hidden, H, W)
+
+    gate = conv(cat([x, h])) 를 시점마다 conv 한 번으로 계산 (forward).
+    conv weight 를 입력 / hidden 부분으로 잘라 쓰는 input_gates / hidden_gates 는
+    ConvLSTMPredictor(hoist_input=True) 용 (weight 는 같은 것을 공유).
     """
 
     def __init__(self, input_channels, hidden_channels, kernel_size=3):
         super().__init__()
         padding = kernel_size // 2
+        self.input_channels = input_channels
         self.hidden_channels = hidden_channels
 
         self.conv = nn.Conv2d(
@@ -22,10 +28,23 @@ class ConvLSTMCell(nn.Module):
             padding=padding,
         )
 
+    def input_gates(self, x):
+        """입력 → gate 부분만 계산 (bias 포함). x: (N, C_in, H, W) → (N, 4*C_h, H, W)"""
+        weight = self.conv.weight[:, :self.input_channels]
+        return F.conv2d(x, weight, self.conv.bias, padding=self.conv.padding)
+
+    def hidden_gates(self, h):
+        """hidden → gate 부분만 계산 (bias 없음). h: (B, C_h, H, W) → (B, 4*C_h, H, W)"""
+        weight = self.conv.weight[:, self.input_channels:]
+        return F.conv2d(h, weight, None, padding=self.conv.padding)
+
     def forward(self, x, state):
         h, c = state  # (B, C_h, H, W)
         combined = torch.cat([x, h], dim=1)  # (B, C_in + C_h, H, W)
         gates = self.conv(combined)
+        return self._update(gates, c)
+
+    def _update(self, gates, c):
         (i, f, o, g) = torch.chunk(gates, 4, dim=1)
 
         i = torch.sigmoid(i)
@@ -54,11 +73,22 @@ class ConvLSTMPredictor(nn.Module):
     - input_channels: grid 당 채널 수
         예: [oil, u_curr, v_curr, u_wind, v_wind, Hs, Tp, SST] 등
     - hidden_channels: ConvLSTM hidden 크기
+    - t_out: 출력 프레임 수. 1 이면 다음 한 프레임 (autoregressive rollout 은
+        ai_predictor/rollout.py), >1 이면 t_out 개의 미래 프레임을 한 번에 내는
+        direct multi-output head
+    - hoist_input: True 면 layer 별 입력→gate conv 를 시퀀스 전체 (T*B, C, H, W)
+        에 대해 한 번에 계산하고, 시간 루프 안에서는 hidden→gate conv 만 돌림.
+        결과는 기본 (시점마다 concat 후 conv) 과 같고 weight 도 같음.
+        1코어 CPU 에서는 기본이 더 빨랐음 (benchmarks/bench_conv_lstm.py 로
+        하드웨어별로 비교해서 선택)
     """
 
-    def __init__(self, input_channels, hidden_channels=32, num_layers=2):
+    def __init__(self, input_channels, hidden_channels=32, num_layers=2, t_out=1,
+                 hoist_input=False):
         super().__init__()
         self.num_layers = num_layers
+        self.t_out = t_out
+        self.hoist_input = hoist_input
 
         cells = []
         for layer_idx in range(num_layers):
@@ -66,34 +96,86 @@ class ConvLSTMPredictor(nn.Module):
             cells.append(ConvLSTMCell(in_ch, hidden_channels))
         self.cells = nn.ModuleList(cells)
 
-        # 마지막 hidden → oil 예측 채널 (1채널 가정: oil thickness/conc)
-        self.out_conv = nn.Conv2d(hidden_channels, 1, kernel_size=1)
+        # 마지막 hidden → oil 예측 채널 (미래 시점당 1채널: oil thickness/conc)
+        self.out_conv = nn.Conv2d(hidden_channels, t_out, kernel_size=1)
 
     def forward(self, x_seq):
         """
         x_seq: (B, T_in, C_in, H, W)
-        출력:  (B, 1, H, W)  (다음 시간의 oil 분포)
+        출력:  (B, t_out, H, W)  (다음 t_out 시간의 oil 분포, 기본은 (B, 1, H, W))
+        """
+        states = self.encode(x_seq)
+        return self.head(states[-1][0])
+
+    def head(self, h_last):
+        """마지막 layer hidden (B, C_h, H, W) → oil 예측 (B, t_out, H, W)"""
+        out = self.out_conv(h_last)
+        # 음수 유막은 없으니 ReLU (clamp(min=0) 과 같은 값, TorchScript 최적화 pass 가 지원)
+        out = torch.relu(out)
+        return out
+
+    def step(self, x_t, states=None):
+        """
+        프레임 하나로 hidden state 를 갱신하고 다음 시간 oil 을 예측 (streaming 용).
+        x_t: (B, C_in, H, W)
+        states: encode / step 이 돌려준 layer 별 (h, c) 리스트, None 이면 0 에서 시작
+        반환: (out (B, t_out, H, W), 새 states)
         """
+        states = self.encode(x_t.unsqueeze(1), states)
+        return self.head(states[-1][0]), states
+
+    def encode(self, x_seq, states=None):
+        """
+        시퀀스를 읽어서 layer 별 마지막 (h, c) 리스트를 반환.
+        x_seq: (B, T, C_in, H, W)
+        states: 이어서 계산할 layer 별 (h, c). None 이면 0 으로 초기화
+        """
+        if self.hoist_input:
+            return self._encode_hoisted(x_seq, states)
+
         B, T, C, H, W = x_seq.shape
         device = x_seq.device
 
         # layer별 hidden state 초기화
-        states = []
-        for cell in self.cells:
-            states.append(cell.init_state(B, (H, W), device=device))
+        if states is None:
+            states = [cell.init_state(B, (H, W), device=device) for cell in self.cells]
+        states = list(states)
 
         # 시간 순회
         for t in range(T):
             xt = x_seq[:, t]  # (B, C, H, W)
             for layer_idx, cell in enumerate(self.cells):
-                h, c = states[layer_idx]
-                h, c = cell(xt, (h, c))
+                h, c = cell(xt, states[layer_idx])
                 states[layer_idx] = (h, c)
                 xt = h  # 다음 layer 입력
+        return states
 
-        # 마지막 layer hidden → output
-        h_last, _ = states[-1]
-        out = self.out_conv(h_last)
-        # 음수 유막은 없으니 ReLU or clamp
-        out = torch.clamp(out, min=0.0)
-        return out
+    def _encode_hoisted(self, x_seq, states=None):
+        """encode 의 hoist_input=True 버전 (layer 순서로 처리)."""
+        B, T, C, H, W = x_seq.shape
+
+        # 시간 축을 앞에 두어 시점별 gate 가 연속 메모리가 되게 함
+        layer_input = x_seq.transpose(0, 1).reshape(T * B, C, H, W)
+        new_states = []
+        for layer_idx, cell in enumerate(self.cells):
+            # unbind: backward 에서 시점별 gradient 를 한 번에 모음 (x_gates[t] 인덱싱은
+            # 시점마다 전체 크기 gradient 를 만들어서 T 에 대해 제곱으로 느려짐)
+            x_gates = cell.input_gates(layer_input).reshape(T, B, -1, H, W).unbind(0)
+
+            if states is None:
+                # 초기 hidden 이 0 이므로 hidden_gates(h) = 0, conv 생략
+                h, c = cell._update(x_gates[0], cell.init_state(B, (H, W), device=x_seq.device)[1])
+                start = 1
+            else:
+                h, c = states[layer_idx]
+                start = 0
+            outputs = [h] if start else []
+            for t in range(start, T):
+                h, c = cell._update(cell.hidden_gates(h) + x_gates[t], c)
+                outputs.append(h)
+            new_states.append((h, c))
+
+            # 다음 layer 입력 (마지막 layer 는 필요 없음)
+            if layer_idx < self.num_layers - 1:
+                layer_input = torch.cat(outputs, dim=0)  # (T*B, C_h, H, W)
+        return new_states
@@ -0,0 +1,86 @@
+# ai_predictor/rollout.py
+"""
+Multi-horizon forecasts with ConvLSTMPredictor.
+
+Two ways to get K future oil frames from T_in observed frames:
+
+    autoregressive  (model.t_out == 1) the one-step model is rolled forward:
+                    each predicted oil frame is stacked with the *known*
+                    forcing (U, V[, wind]) of that time and fed back as the
+                    next input frame. The recurrent state is carried over,
+                    so every extra frame costs one cell step per layer
+                    instead of re-reading a T_in window.
+    direct          (model.t_out >= K) one forward pass; the output head
+                    emits all t_out frames at once (no feedback, no forcing
+                    needed, fixed horizon).
+
+Frame layout follows the dataset: channel 0 is oil, channels 1: are forcing.
+Both functions return (B, K, 1, H, W), the shape of the dataset targets, and
+keep the autograd graph, so they can be used in training as well.
+"""
+
+from __future__ import annotations
+
+import torch
+
+
+def rollout(model, x_seq: torch.Tensor, future_forcing: torch.Tensor | None = None,
+            horizon: int | None = None, states=None) -> torch.Tensor:
+    """
+    Autoregressive K-step forecast with a one-step model.
+
+    Args:
+        model: ConvLSTMPredictor with t_out == 1
+        x_seq: (B, T_in, C, H, W) observed frames
+        future_forcing: (B, >= K - 1, C - 1, H, W) forcing channels at the
+            forecast times; frame k is the forcing at the time of target k
+            (the same window as the dataset's targets). Only the first K - 1
+            frames are read: the last prediction is never fed back.
+        horizon: K (default: future_forcing.shape[1], or 1 without forcing)
+        states: optional per-layer (h, c) to continue from (e.g. a
+            StreamingPredictor's states); x_seq is consumed after them
+
+    Returns:
+        (B, K, 1, H, W) predicted oil
+    """
+    if model.t_out != 1:
+        raise ValueError(f"rollout needs a one-step model, got t_out={model.t_out}")
+    if horizon is None:
+        horizon = 1 if future_forcing is None else future_forcing.shape[1]
+    if horizon > 1:
+        if future_forcing is None or future_forcing.shape[1] < horizon - 1:
+            got = 0 if future_forcing is None else future_forcing.shape[1]
+            raise ValueError(f"horizon {horizon} needs {horizon - 1} future forcing frames, got {got}")
+        if future_forcing.shape[2] != x_seq.shape[2] - 1:
+            raise ValueError(
+                f"future_forcing has {future_forcing.shape[2]} channels, "
+                f"expected {x_seq.shape[2] - 1} (input channels without oil)"
+            )
+
+    states = model.encode(x_seq, states)
+    pred = model.head(states[-1][0])  # (B, 1, H, W)
+    preds = [pred]
+    for k in range(1, horizon):
+        frame = torch.cat([pred, future_forcing[:, k - 1].to(pred.dtype)], dim=1)
+        pred, states = model.step(frame, states)
+        preds.append(pred)
+    return torch.stack(preds, dim=1)
+
+
+def forecast(model, x_seq: torch.Tensor, horizon: int | None = None,
+             future_forcing: torch.Tensor | None = None) -> torch.Tensor:
+    """
+    K-step forecast with either kind of model.
+
+    Models with t_out > 1 use their direct multi-output head (horizon at most
+    t_out, forcing ignored); one-step models are rolled out with `rollout`.
+
+    Returns:
+        (B, K, 1, H, W) predicted oil
+    """
+    if model.t_out == 1:
+        return rollout(model, x_seq, future_forcing, horizon)
+    horizon = model.t_out if horizon is None else horizon
+    if horizon > model.t_out:
+        raise ValueError(f"direct head predicts {model.t_out} frames, asked for {horizon}")
+    return model(x_seq)[:, :horizon].unsqueeze(2)
@@ -0,0 +1,160 @@
+# ai_predictor/streaming.py
+"""
+Stateful, frame-by-frame inference with a trained ConvLSTMPredictor.
+
+`ConvLSTMPredictor.forward` starts from zero states and re-reads all T_in
+frames on every call, so a live feed that appends one frame at a time pays
+T_in times the work per update. `StreamingPredictor` keeps the (h, c) of
+every layer between calls instead: each update consumes one new frame per
+stream and costs one cell step per layer, whatever the history length.
+
+Many independent streams (e.g. several monitored spill sites on the same
+grid) are batched along the first dimension of the states; an update may
+touch all of them or just the streams that received a frame.
+
+Usage:
+    stream = StreamingPredictor(model, num_streams=3, grid_shape=(64, 64))
+    stream.warmup(history)                  # (3, T, C, H, W), optional
+    for frames in feed:                     # (3, C, H, W)
+        next_oil = stream.update(frames)    # (3, 1, H, W)
+
+    saved = stream.snapshot()               # branch a what-if scenario
+    stream.update(what_if_frames)
+    stream.restore(saved)
+"""
+
+from __future__ import annotations
+
+import torch
+
+
+class StreamingPredictor:
+    """
+    Recurrent state of `num_streams` independent streams for one model.
+
+    Args:
+        model: trained ConvLSTMPredictor (switched to eval mode)
+        num_streams: number of independent streams batched together
+        grid_shape: (H, W) of the frames
+
+    Attributes:
+        states: per layer (h, c), each (num_streams, hidden, H, W)
+        steps: (num_streams,) frames consumed per stream since its last reset
+    """
+
+    def __init__(self, model, num_streams: int = 1, grid_shape: tuple[int, int] = (64, 64)):
+        if num_streams < 1:
+            raise ValueError(f"num_streams must be positive, got {num_streams}")
+        self.model = model.eval()
+        self.num_streams = int(num_streams)
+        self.grid_shape = tuple(grid_shape)
+        param = next(model.parameters())
+        self.device, self.dtype = param.device, param.dtype
+
+        # Zero states: the same initial (h, c) as a fresh
+        # ConvLSTMPredictor.forward, so the first step matches it exactly
+        with torch.inference_mode():
+            self.states = [
+                tuple(
+                    torch.zeros(self.num_streams, cell.hidden_channels, *self.grid_shape,
+                                device=self.device, dtype=self.dtype)
+                    for _ in range(2)
+                )
+                for cell in model.cells
+            ]
+        self.steps = torch.zeros(self.num_streams, dtype=torch.long)
+
+    def _select(self, streams) -> torch.Tensor | None:
+        """Stream indices as a long tensor on the state device (None = all)."""
+        if streams is None:
+            return None
+        index = torch.as_tensor(streams, dtype=torch.long).reshape(-1)
+        if index.numel() and (index.min() < 0 or index.max() >= self.num_streams):
+            raise IndexError(f"stream index out of range for {self.num_streams} streams")
+        return index.to(self.device)
+
+    def _check_frames(self, frames: torch.Tensor, index, time_axis: bool) -> torch.Tensor:
+        n = self.num_streams if index is None else index.numel()
+        spatial = frames.shape[-2:]
+        if frames.ndim != (5 if time_axis else 4) or frames.shape[0] != n or tuple(spatial) != self.grid_shape:
+            expected = "(n, T, C, H, W)" if time_axis else "(n, C, H, W)"
+            raise ValueError(
+                f"expected frames of shape {expected} with n={n}, (H, W)={self.grid_shape}; "
+                f"got {tuple(frames.shape)}"
+            )
+        return frames.to(device=self.device, dtype=self.dtype)
+
+    @torch.inference_mode()
+    def _advance(self, x_seq: torch.Tensor, index) -> torch.Tensor:
+        if index is None:
+            self.states = self.model.encode(x_seq, self.states)
+            h_last = self.states[-1][0]
+            self.steps += x_seq.shape[1]
+        else:
+            updated = self.model.encode(x_seq, [(h[index], c[index]) for h, c in self.states])
+            for (h, c), (h_new, c_new) in zip(self.states, updated):
+                h.index_copy_(0, index, h_new)
+                c.index_copy_(0, index, c_new)
+            h_last = updated[-1][0]
+            self.steps[index.cpu()] += x_seq.shape[1]
+        return self.model.head(h_last)
+
+    def update(self, frames: torch.Tensor, streams=None) -> torch.Tensor:
+        """
+        Consume one frame per stream and predict each stream's next oil frame.
+
+        Args:
+            frames: (n, C, H, W), one frame for each selected stream
+            streams: indices of the n streams the frames belong to
+                (default: all streams, in order); the others are untouched
+
+        Returns:
+            (n, 1, H, W) next-step oil prediction
+        """
+        index = self._select(streams)
+        frames = self._check_frames(frames, index, time_axis=False)
+        return self._advance(frames.unsqueeze(1), index)
+
+    def warmup(self, x_seq: torch.Tensor, streams=None) -> torch.Tensor:
+        """
+        Consume a whole history at once (same result as T calls to `update`,
+        in one call).
+
+        Args:
+            x_seq: (n, T, C, H, W)
+            streams: see `update`
+
+        Returns:
+            (n, 1, H, W) prediction after the last frame
+        """
+        index = self._select(streams)
+        x_seq = self._check_frames(x_seq, index, time_axis=True)
+        return self._advance(x_seq, index)
+
+    @torch.inference_mode()
+    def reset(self, streams=None) -> None:
+        """Zero the state of the given streams (default: all)."""
+        index = self._select(streams)
+        for h, c in self.states:
+            if index is None:
+                h.zero_()
+                c.zero_()
+            else:
+                h.index_fill_(0, index, 0.0)
+                c.index_fill_(0, index, 0.0)
+        if index is None:
+            self.steps.zero_()
+        else:
+            self.steps[index.cpu()] = 0
+
+    def snapshot(self) -> dict:
+        """Copy of the current states, for `restore`."""
+        return {
+            "states": [(h.clone(), c.clone()) for h, c in self.states],
+            "steps": self.steps.clone(),
+        }
+
+    def restore(self, snapshot: dict) -> None:
+        """Return to a state saved by `snapshot` (the snapshot stays reusable)."""
+        self.states = [(h.clone(), c.clone()) for h, c in snapshot["states"]]
+        self.steps = snapshot["steps"].clone()
@@ -0,0 +1,174 @@
+# ai_predictor/tiling.py
+"""
+Tiled inference of ConvLSTMPredictor on large domains.
+
+A full-domain forward keeps (h, c) and the gate tensors of every layer at the
+full grid size; at 2048 x 2048 with hidden_channels=32 that is several GB.
+`tiled_predict` instead runs the model on overlapping patches, a few
+at a time, and blends the patch outputs into the full field, so peak memory
+depends on the tile size and batch, not on the domain.
+
+The ConvLSTM is local: an output pixel only sees input pixels within its
+receptive radius (`receptive_radius`), which grows by the conv padding with
+every cell step and layer, and with every fed-back frame of a rollout.
+Patch outputs are exact except within that radius of a patch edge that lies
+inside the domain (where the model sees zero padding instead of the
+neighbouring data). Every patch is weighted by a separable window that is
+zero on that margin, rises smoothly (sin^2) over the rest of the overlap and
+is one in the middle and along the domain boundary. With the default
+overlap (twice the radius plus a ramp) every pixel is taken only from
+patches where it is exact, so the tiled field matches full-domain inference
+to rounding; a smaller overlap trades exactness near seams for fewer
+patches, and the ramp hides the seams.
+
+Usage:
+    field = tiled_predict(model, x_seq, tile_size=256, batch_size=4)
+    future = tiled_predict(model, x_seq, future_forcing=forcing, horizon=12)
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import torch
+
+from ai_predictor.rollout import forecast
+
+
+def receptive_radius(model, t_in: int, horizon: int = 1) -> int:
+    """
+    Receptive radius in pixels of a `horizon`-frame forecast from `t_in`
+    frames (autoregressive rollout when horizon > 1 and model.t_out == 1).
+
+    Each cell step adds its conv padding to the radius of its inputs (the
+    layer below at the same time, and its own state at the previous time);
+    in a rollout the fed-back prediction carries the radius of the top layer.
+    """
+    pads = [cell.conv.padding[0] for cell in model.cells]
+    feedback = model.t_out == 1
+    n_steps = t_in + (horizon - 1 if feedback else 0)
+
+    state = [None] * len(pads)  # radius of each layer's (h, c); None = zero state
+    worst = 0
+    for t in range(n_steps):
+        r = 0 if t < t_in else state[-1]  # observed frame or fed-back prediction
+        for layer, pad in enumerate(pads):
+            r = pad + (r if state[layer] is None else max(r, state[layer]))
+            state[layer] = r
+        if t >= t_in - 1:
+            worst = max(worst, r)
+    return worst
+
+
+def _tile_layout(size: int, tile_max: int, overlap: int) -> tuple[int, list[int]]:
+    """
+    Tile length and evenly spaced origins covering [0, size).
+
+    Uses the fewest tiles of at most `tile_max` pixels that overlap by at
+    least `overlap`, then shrinks the tiles to the smallest length that still
+    covers the axis, so no tile is mostly redundant.
+    """
+    if size <= tile_max:
+        return size, [0]
+    n = -(-(size - overlap) // (tile_max - overlap))
+    tile = -(-(size + (n - 1) * overlap) // n)
+    return tile, [round(i * (size - tile) / (n - 1)) for i in range(n)]
+
+
+def _window_1d(length: int, margin: int, ramp: int, lead: bool, trail: bool) -> np.ndarray:
+    """Blend weights along one tile axis.
+
+    Zero for `margin` pixels at each edge that faces a neighbouring tile
+    (`lead` / `trail`), then a sin^2 ramp over `ramp` pixels, then one.
+    Edges on the domain boundary keep weight one.
+    """
+    w = np.ones(length, dtype=np.float64)
+    if ramp > 0:
+        rise = np.sin(0.5 * np.pi * (np.arange(ramp) + 0.5) / ramp) ** 2
+    else:
+        rise = np.zeros(0)
+    edge = np.concatenate([np.zeros(margin), rise])[:length]
+    if lead:
+        w[:edge.size] = np.minimum(w[:edge.size], edge)
+    if trail:
+        w[length - edge.size:] = np.minimum(w[length - edge.size:], edge[::-1])
+    return w
+
+
+def tiled_predict(
+    model,
+    x_seq,
+    tile_size: int = 256,
+    overlap: int | None = None,
+    batch_size: int = 4,
+    future_forcing=None,
+    horizon: int | None = None,
+) -> torch.Tensor:
+    """
+    Forecast a large domain patch by patch.
+
+    Args:
+        model: ConvLSTMPredictor (used in eval mode, under inference_mode)
+        x_seq: (T_in, C, H, W) observed frames of one domain; a numpy array
+            (memory maps are read patch by patch) or a tensor
+        tile_size: maximum patch edge in pixels (memory scales with
+            batch_size * tile_size^2); patches are shrunk to spread the
+            domain evenly
+        overlap: pixels shared by neighbouring patches; default
+            2 * receptive radius + 8, which makes the result exact
+        batch_size: patches per forward pass
+        future_forcing: (>= K - 1, C - 1, H, W) known forcing for an
+            autoregressive rollout, see ai_predictor.rollout
+        horizon: K future frames (default: model.t_out, or the forcing
+            length for a one-step model with forcing)
+
+    Returns:
+        (K, H, W) float32 tensor on the model device (K = 1 for a plain
+        one-step forecast)
+    """
+    T_in, C, H, W = x_seq.shape
+    if horizon is None:
+        horizon = future_forcing.shape[0] if (model.t_out == 1 and future_forcing is not None) else model.t_out
+    radius = receptive_radius(model, T_in, horizon)
+    if overlap is None:
+        overlap = 2 * radius + 8
+    if overlap >= tile_size:
+        raise ValueError(
+            f"overlap {overlap} must be smaller than tile_size {tile_size} "
+            f"(receptive radius is {radius}; use a larger tile)"
+        )
+    margin = min(radius, overlap // 2)
+    ramp = overlap - 2 * margin
+
+    param = next(model.parameters())
+    device, dtype = param.device, param.dtype
+    model.eval()
+
+    ty, starts_y = _tile_layout(H, tile_size, overlap)
+    tx, starts_x = _tile_layout(W, tile_size, overlap)
+    tiles = [(y0, x0) for y0 in starts_y for x0 in starts_x]
+    out = torch.zeros(horizon, H, W, dtype=torch.float32, device=device)
+    weight_sum = torch.zeros(H, W, dtype=torch.float32, device=device)
+
+    def crop(a, y0, x0):
+        patch = a[..., y0:y0 + ty, x0:x0 + tx]
+        if isinstance(patch, np.ndarray):
+            patch = torch.from_numpy(np.ascontiguousarray(patch))
+        return patch.to(device=device, dtype=dtype)
+
+    with torch.inference_mode():
+        for b in range(0, len(tiles), batch_size):
+            batch = tiles[b:b + batch_size]
+            xb = torch.stack([crop(x_seq, y0, x0) for y0, x0 in batch])
+            fb = None
+            if future_forcing is not None and model.t_out == 1:
+                fb = torch.stack([crop(future_forcing[:max(horizon - 1, 1)], y0, x0) for y0, x0 in batch])
+            pred = forecast(model, xb, horizon, fb)[:, :, 0]  # (n, K, ty, tx)
+
+            for (y0, x0), p in zip(batch, pred):
+                wy = _window_1d(ty, margin, ramp, lead=y0 > 0, trail=y0 + ty < H)
+                wx = _window_1d(tx, margin, ramp, lead=x0 > 0, trail=x0 + tx < W)
+                w = torch.from_numpy(np.outer(wy, wx).astype(np.float32)).to(device)
+                out[:, y0:y0 + ty, x0:x0 + tx] += p.float() * w
+                weight_sum[y0:y0 + ty, x0:x0 + tx] += w
+
+    return out / weight_sum
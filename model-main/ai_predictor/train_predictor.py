@@ -8,25 +8,44 @@ import torch
 import torch.nn as nn
 from torch.optim import AdamW
 
-from ai_predictor.dataset import build_dataloaders, T_IN, T_OUT
-from ai_predictor.model_conv_lstm import OilSpillPredictor
+from ai_predictor.dataset import build_dataloaders, build_stream_dataloaders, T_IN, T_OUT
+from data.shards import is_shard_set
+from ai_predictor.model_conv_lstm import ConvLSTMPredictor
+from ai_predictor.rollout import forecast
 
 DEVICE = "cuda" if torch.cuda.is_available() else "cpu"
 
 EPOCHS = 20
 BATCH_SIZE = 4
 LR = 1e-3
+STREAM_WORKERS = 2   # DataLoader workers simulating data when none is on disk
+HIDDEN_CHANNELS = 32
+NUM_LAYERS = 2
+# Input-to-gates conv batched over the whole sequence (same weights and
+# results; compare speed with benchmarks/bench_conv_lstm.py on the target)
+HOIST_INPUT = False
+# "rollout": one-step model rolled out over T_OUT frames with the known future
+#            forcing fed back (ai_predictor/rollout.py)
+# "direct":  output head predicting all T_OUT frames at once
+MODE = "rollout"
+
+
+def predict(model, X, y, forcing=None):
+    """(B, T_OUT, 1, H, W) forecast for a batch, matching y."""
+    if forcing is not None:
+        forcing = forcing.to(DEVICE)
+    return forecast(model, X, horizon=y.shape[1], future_forcing=forcing)
 
 
 def train_epoch(model, loader, criterion, optimizer):
     model.train()
     total_loss = 0.0
-    for X, y in loader:
+    for X, y, *forcing in loader:
         X = X.to(DEVICE)  # (B, T_IN, C, H, W)
         y = y.to(DEVICE)  # (B, T_OUT, 1, H, W)
 
         optimizer.zero_grad()
-        y_pred = model(X)
+        y_pred = predict(model, X, y, *forcing)
         loss = criterion(y_pred, y)
         loss.backward()
         optimizer.step()
@@ -40,10 +59,10 @@ def eval_epoch(model, loader, criterion):
     model.eval()
     total_loss = 0.0
     with torch.no_grad():
-        for X, y in loader:
+        for X, y, *forcing in loader:
             X = X.to(DEVICE)
             y = y.to(DEVICE)
-            y_pred = model(X)
+            y_pred = predict(model, X, y, *forcing)
             loss = criterion(y_pred, y)
             total_loss += loss.item() * X.size(0)
     return total_loss / len(loader.dataset)
@@ -52,18 +71,36 @@ def eval_epoch(model, loader, criterion):
 def main():
     base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     npz_path = os.path.join(base_dir, "data", "processed", "train_sequences.npz")
-
-    if not os.path.isfile(npz_path):
-        raise FileNotFoundError(
-            f"Training data not found at {npz_path}. "
-            f"Run data/make_synthetic_data.py first."
+    npy_path = os.path.join(base_dir, "data", "processed", "train_sequences.npy")
+    shard_dir = os.path.join(base_dir, "data", "processed", "train_shards")
+
+    # Prefer a streamed shard set, then a memory-mappable .npy
+    if is_shard_set(shard_dir):
+        npz_path = shard_dir
+    elif os.path.isfile(npy_path):
+        npz_path = npy_path
+
+    with_forcing = MODE == "rollout"
+    if os.path.exists(npz_path):
+        train_loader, val_loader, test_loader = build_dataloaders(
+            npz_path, batch_size=BATCH_SIZE, t_in=T_IN, t_out=T_OUT, with_forcing=with_forcing
+        )
+    else:
+        # No dataset on disk: simulate training windows inside the loader workers
+        print("[INFO] No training data on disk; simulating sequences on the fly.")
+        train_loader, val_loader, test_loader = build_stream_dataloaders(
+            batch_size=BATCH_SIZE, t_in=T_IN, t_out=T_OUT, num_workers=STREAM_WORKERS,
+            with_forcing=with_forcing,
         )
 
-    train_loader, val_loader, test_loader = build_dataloaders(
-        npz_path, batch_size=BATCH_SIZE, t_in=T_IN, t_out=T_OUT
-    )
-
-    model = OilSpillPredictor(in_channels=3, t_out=T_OUT).to(DEVICE)
+    in_channels = next(iter(val_loader))[0].shape[2]
+    model = ConvLSTMPredictor(
+        input_channels=in_channels,
+        hidden_channels=HIDDEN_CHANNELS,
+        num_layers=NUM_LAYERS,
+        t_out=T_OUT if MODE == "direct" else 1,
+        hoist_input=HOIST_INPUT,
+    ).to(DEVICE)
     criterion = nn.MSELoss()
     optimizer = AdamW(model.parameters(), lr=LR)
 
@@ -77,6 +114,8 @@ def main():
     print(f"[INFO] Training for {EPOCHS} epochs...")
 
     for epoch in range(1, EPOCHS + 1):
+        if hasattr(train_loader.dataset, "set_epoch"):
+            train_loader.dataset.set_epoch(epoch)
         t0 = time.time()
         train_loss = train_epoch(model, train_loader, criterion, optimizer)
         val_loss = eval_epoch(model, val_loader, criterion)
@@ -98,6 +137,10 @@ def main():
                     "config": {
                         "T_IN": T_IN,
                         "T_OUT": T_OUT,
+                        "MODE": MODE,
+                        "input_channels": in_channels,
+                        "hidden_channels": HIDDEN_CHANNELS,
+                        "num_layers": NUM_LAYERS,
                     },
                 },
                 best_ckpt_path,
@@ -19,6 +19,9 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 # Import your modules
 from data.make_synthetic_data import generate_synthetic_dataset
 from ai_predictor.model_conv_lstm import ConvLSTMPredictor
+from ai_predictor.tiling import tiled_predict
+from ai_predictor.inference import export_engine
+from ai_predictor.dataset import OilSpillSequenceDataset
 from utils.biology_ops import update_DO, plankton_response, ecological_recovery_index
 from utils.chemistry_ops import check_toxicity_thresholds
 from utils.metrics import calculate_metrics
@@ -124,27 +127,6 @@ with st.sidebar.expander("3. Biology & Chemistry", expanded=True):
     oil_dampening = st.slider("Oil Dampening Factor", 0.0, 1.0, 0.2, help="Reduction in reaeration due to slick")
     lc50_zoo = st.slider("Zooplankton LC50 (mg/L)", 1.0, 100.0, 30.0, help="Lethal Concentration 50%")
 
-# Helper function for data loading
-def prepare_data(features, T_in=4, T_out=1):
-    # features: (N, T, C, H, W)
-    X_list, y_list = [], []
-    N, T, C, H, W = features.shape
-    
-    for n in range(N):
-        for t in range(T - T_in - T_out + 1):
-            x = features[n, t : t + T_in] # (T_in, C, H, W)
-            y = features[n, t + T_in : t + T_in + T_out, 0] # (T_out, H, W) - predict oil only
-            X_list.append(x)
-            y_list.append(y)
-            
-    X = np.stack(X_list) # (B_total, T_in, C, H, W)
-    y = np.stack(y_list) # (B_total, T_out, H, W)
-    
-    # Add channel dim to y
-    y = np.expand_dims(y, axis=2) # (B_total, T_out, 1, H, W)
-    
-    return torch.from_numpy(X).float(), torch.from_numpy(y).float()
-
 def plot_interactive_heatmap(data, title, colorscale, zmin=None, zmax=None):
     """
     Creates an interactive Plotly heatmap.
@@ -194,23 +176,22 @@ if st.sidebar.button("🚀 RUN SIMULATION"):
     # --- STEP 2: AI TRAINING ---
     
     
-    # Prepare Data
+    # Prepare Data: every (T_in, T_out) window, served as views of `features`
     status_text.text("Preparing tensors for training...")
-    X_train, y_train = prepare_data(features, T_in=4, T_out=1)
+    dataset = OilSpillSequenceDataset(features, t_in=4, t_out=1)
     
-    # Split (Simple 80/20)
-    split_idx = int(0.8 * len(X_train))
-    X_tr, y_tr = X_train[:split_idx], y_train[:split_idx]
-    X_val, y_val = X_train[split_idx:], y_train[split_idx:]
+    # Split (Simple 80/20) by sequence, so overlapping windows don't leak into validation
+    split_seq = int(0.8 * dataset.N)
+    train_ds = dataset.subset(range(split_seq))
+    val_ds = dataset.subset(range(split_seq, dataset.N))
     
     # Dataset & Loader
     batch_size = 8
-    train_ds = torch.utils.data.TensorDataset(X_tr, y_tr)
     train_loader = torch.utils.data.DataLoader(train_ds, batch_size=batch_size, shuffle=True)
     
     # Model Setup
     device = "cuda" if torch.cuda.is_available() else "cpu"
-    model = ConvLSTMPredictor(input_channels=3, hidden_channels=32, num_layers=2).to(device)
+    model = ConvLSTMPredictor(input_channels=dataset.C, hidden_channels=32, num_layers=2).to(device)
     optimizer = AdamW(model.parameters(), lr=learning_rate)
     criterion = nn.MSELoss()
     
@@ -220,7 +201,8 @@ if st.sidebar.button("🚀 RUN SIMULATION"):
         model.train()
         epoch_loss = 0.0
         for batch_X, batch_y in train_loader:
-            batch_X, batch_y = batch_X.to(device), batch_y.to(device)
+            # y: (B, T_out=1, 1, H, W) -> (B, 1, H, W) to match the model output
+            batch_X, batch_y = batch_X.to(device), batch_y[:, 0].to(device)
             
             optimizer.zero_grad()
             pred = model(batch_X)
@@ -239,8 +221,9 @@ if st.sidebar.button("🚀 RUN SIMULATION"):
         
     st.success("✅ AI Model Trained Successfully")
     
-    # Save Model
+    # Save Model, and export it for optimized inference
     torch.save(model.state_dict(), "conv_lstm_predictor.pth")
+    engine = export_engine(model, "conv_lstm_predictor_ts.pt", t_in=4)
 
     # --- STEP 3: PREDICTION & BIO ---
     st.markdown("#### 3. Prediction & Ecological Impact")
@@ -248,13 +231,16 @@ if st.sidebar.button("🚀 RUN SIMULATION"):
     
     # Take a test sample (last one from validation set)
     test_idx = -1
-    input_seq = X_val[test_idx].unsqueeze(0).to(device) # (1, 4, 3, 64, 64)
-    true_future = y_val[test_idx].squeeze().numpy() # (64, 64)
-    
-    model.eval()
-    with torch.no_grad():
-        pred_tensor = model(input_seq)
-        pred_oil = pred_tensor.squeeze().cpu().numpy() # (64, 64)
+    test_X, test_y = val_ds[test_idx] # (4, 3, H, W)
+    true_future = test_y.squeeze().numpy() # (H, W)
+    
+    # Grids that fit in one tile go through the exported engine; larger ones
+    # are predicted patch-wise with bounded memory
+    tile_size = 256
+    if max(test_X.shape[-2:]) <= tile_size:
+        pred_oil = engine.predict(test_X[None])[0, 0].cpu().numpy() # (H, W)
+    else:
+        pred_oil = tiled_predict(model, test_X, tile_size=tile_size)[0].cpu().numpy() # (H, W)
         
     # Bio Analysis
     H, W = pred_oil.shape
@@ -0,0 +1,65 @@
+# benchmarks/bench_active_region.py
+"""
+Full-grid vs active-region `step_physics` for a small slick on a large domain.
+
+Usage:
+    python benchmarks/bench_active_region.py [--steps 50] [--threshold 1e-4]
+"""
+
+from __future__ import annotations
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from utils.physics_ops import generate_current_field_batch, step_physics
+
+GRID_SIZES = [256, 1024, 2048]
+SLICK_RADIUS = 6.0
+D = 0.3
+DT = 1.0
+DX = 1.0
+
+
+def rollout(oil, U, V, steps, **kwargs):
+    """Run `steps` physics steps; returns (final field, seconds per step)."""
+    t0 = time.perf_counter()
+    for t in range(steps):
+        oil = step_physics(oil, U[t], V[t], D=D, dt=DT, dx=DX, **kwargs)
+    return oil, (time.perf_counter() - t0) / steps
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--steps", type=int, default=50)
+    parser.add_argument("--threshold", type=float, default=1e-4)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+
+    print(f"{'grid':>6} {'full ms':>9} {'active ms':>10} {'speedup':>8} {'max diff':>10}")
+    for n in GRID_SIZES:
+        y, x = np.mgrid[0:n, 0:n].astype(np.float32)
+        oil = np.exp(-((x - n / 2) ** 2 + (y - n / 2) ** 2) / (2 * SLICK_RADIUS**2))
+        oil = oil.astype(np.float32)
+        U, V = generate_current_field_batch(1, args.steps, n, n, base_speed_min=0.5, base_speed_max=1.0, rng=rng)
+
+        full, t_full = rollout(oil, U[0], V[0], args.steps)
+        active, t_active = rollout(
+            oil, U[0], V[0], args.steps, active_threshold=args.threshold
+        )
+
+        print(
+            f"{n:>6} {t_full * 1e3:>9.2f} {t_active * 1e3:>10.2f} "
+            f"{t_full / t_active:>7.1f}x {np.abs(full - active).max():>10.2e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# benchmarks/bench_advection.py
+"""
+Per-step time and allocation of `apply_advection` vs `SemiLagrangianAdvector`.
+
+Allocation is the tracemalloc peak of one step (numpy reports its buffers to
+tracemalloc), measured separately from the timing loop.
+
+Usage:
+    python benchmarks/bench_advection.py [--steps 50]
+"""
+
+from __future__ import annotations
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from utils.physics_ops import apply_advection, SemiLagrangianAdvector
+
+GRID_SIZES = [64, 256, 1024]
+DT = 1.0
+DX = 1.0
+
+
+def time_steps(step, oil: np.ndarray, steps: int) -> float:
+    """Mean seconds per step for a rollout of `steps` advection calls."""
+    oil = step(oil)  # warm-up
+    t0 = time.perf_counter()
+    for _ in range(steps):
+        oil = step(oil)
+    return (time.perf_counter() - t0) / steps
+
+
+def peak_alloc(step, oil: np.ndarray) -> int:
+    """Peak bytes allocated during one advection call."""
+    step(oil)  # warm-up
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    step(oil)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--steps", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+
+    print(
+        f"{'grid':>6} {'func ms':>9} {'object ms':>10} {'speedup':>8} "
+        f"{'func MB':>9} {'object MB':>10}"
+    )
+    for n in GRID_SIZES:
+        oil = rng.random((n, n), dtype=np.float32)
+        u = rng.normal(0.0, 0.5, (n, n)).astype(np.float32)
+        v = rng.normal(0.0, 0.5, (n, n)).astype(np.float32)
+
+        advector = SemiLagrangianAdvector((n, n))
+        work = oil.copy()
+
+        def func_step(f):
+            return apply_advection(f, u, v, DT, DX)
+
+        def object_step(f):
+            return advector(f, u, v, DT, DX, out=work)
+
+        t_func = time_steps(func_step, oil, args.steps)
+        t_obj = time_steps(object_step, work, args.steps)
+        m_func = peak_alloc(func_step, oil)
+        m_obj = peak_alloc(object_step, work)
+
+        print(
+            f"{n:>6} {t_func * 1e3:>9.2f} {t_obj * 1e3:>10.2f} {t_func / t_obj:>7.2f}x "
+            f"{m_func / 2**20:>9.2f} {m_obj / 2**20:>10.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
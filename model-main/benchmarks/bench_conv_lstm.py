@@ -0,0 +1,98 @@
+# benchmarks/bench_conv_lstm.py
+"""
+ConvLSTMPredictor on CPU: fused concat cell vs hoist_input=True.
+
+The default model runs one conv over torch.cat([x, h]) per cell step. With
+hoist_input=True the input part of that conv runs once per layer for the
+whole sequence as a (T*B, C, H, W) batch, and only the hidden part stays in
+the time loop. Both share the same weights, so the hoisted model is loaded
+from the fused one's state_dict; the table reports the max output
+difference next to the timings. Which is faster depends on the hardware
+(thread count, GPU), so run this before switching the mode.
+
+    inference   forward under torch.no_grad()
+    training    forward + MSE backward + Adam step
+
+Usage:
+    python benchmarks/bench_conv_lstm.py [--batch 8] [--t-in 4] [--size 64] [--threads 4]
+"""
+
+from __future__ import annotations
+import argparse
+import os
+import sys
+import time
+
+import torch
+import torch.nn as nn
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from ai_predictor.model_conv_lstm import ConvLSTMPredictor
+
+
+def timed(fn, repeat):
+    fn()  # warm-up
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batch", type=int, default=8)
+    parser.add_argument("--t-in", type=int, default=4)
+    parser.add_argument("--channels", type=int, default=3)
+    parser.add_argument("--size", type=int, default=64)
+    parser.add_argument("--hidden", type=int, default=32)
+    parser.add_argument("--layers", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--threads", type=int, default=None, help="torch CPU threads")
+    args = parser.parse_args()
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    torch.manual_seed(0)
+    model = ConvLSTMPredictor(args.channels, args.hidden, args.layers)
+    with torch.no_grad():
+        model.out_conv.bias.fill_(0.1)  # keep outputs off the ReLU at 0
+    hoisted = ConvLSTMPredictor(args.channels, args.hidden, args.layers, hoist_input=True)
+    hoisted.load_state_dict(model.state_dict())
+
+    x = torch.rand(args.batch, args.t_in, args.channels, args.size, args.size)
+    y = torch.rand(args.batch, 1, args.size, args.size)
+
+    with torch.no_grad():
+        diff = (hoisted(x) - model(x)).abs().max().item()
+
+    def infer(net):
+        def run():
+            with torch.no_grad():
+                net(x)
+        return run
+
+    def train(net):
+        optimizer = torch.optim.Adam(net.parameters(), lr=1e-4)
+        loss_fn = nn.MSELoss()
+
+        def run():
+            optimizer.zero_grad()
+            loss_fn(net(x), y).backward()
+            optimizer.step()
+        return run
+
+    print(f"B={args.batch} T_in={args.t_in} C={args.channels} {args.size}x{args.size} "
+          f"hidden={args.hidden} layers={args.layers} threads={torch.get_num_threads()}")
+    print(f"max |output diff| = {diff:.2e}")
+    print(f"{'mode':>10} {'fused ms':>10} {'hoisted ms':>11} {'hoisted speedup':>16}")
+    for mode, make in (("inference", infer), ("training", train)):
+        t_fused = timed(make(model), args.repeat)
+        t_hoisted = timed(make(hoisted), args.repeat)
+        print(f"{mode:>10} {1e3 * t_fused:10.1f} {1e3 * t_hoisted:11.1f} {t_fused / t_hoisted:15.2f}x")
+
+
+if __name__ == "__main__":
+    main()
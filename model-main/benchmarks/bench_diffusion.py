@@ -0,0 +1,61 @@
+# benchmarks/bench_diffusion.py
+"""
+Compare the Gaussian and spectral diffusion backends of utils.physics_ops.
+
+Usage:
+    python benchmarks/bench_diffusion.py [--steps 50]
+"""
+
+from __future__ import annotations
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from utils.physics_ops import apply_diffusion, apply_diffusion_spectral
+
+GRID_SIZES = [128, 256, 512, 1024]
+D_VALUES = [0.3, 3.0, 30.0]     # sigma = sqrt(2 D dt) / dx ~ 0.8, 2.4, 7.7 cells
+DT = 1.0
+DX = 1.0
+
+
+def time_steps(fn, oil: np.ndarray, D: float, steps: int) -> float:
+    """Mean seconds per step for `steps` repeated diffusion calls."""
+    fn(oil, D=D, dt=DT, dx=DX)  # warm-up (fills the spectral cache)
+    t0 = time.perf_counter()
+    for _ in range(steps):
+        oil = fn(oil, D=D, dt=DT, dx=DX)
+    return (time.perf_counter() - t0) / steps
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--steps", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+
+    print(f"{'grid':>6} {'D':>6} {'gaussian ms':>12} {'spectral ms':>12} {'speedup':>8} {'max diff':>10}")
+    for n in GRID_SIZES:
+        oil = rng.random((n, n), dtype=np.float32)
+        for D in D_VALUES:
+            t_gauss = time_steps(apply_diffusion, oil, D, args.steps)
+            t_spec = time_steps(apply_diffusion_spectral, oil, D, args.steps)
+            diff = np.abs(
+                apply_diffusion(oil, D, DT, DX) - apply_diffusion_spectral(oil, D, DT, DX)
+            ).max()
+            print(
+                f"{n:>6} {D:>6.1f} {t_gauss * 1e3:>12.2f} {t_spec * 1e3:>12.2f} "
+                f"{t_gauss / t_spec:>7.2f}x {diff:>10.2e}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# benchmarks/bench_domain_decomposition.py
+"""
+Single-process `step_physics` vs `DomainDecomposedSimulation` on one large grid.
+
+Usage:
+    python benchmarks/bench_domain_decomposition.py [--size 2048] [--steps 10]
+"""
+
+from __future__ import annotations
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from utils.domain_decomposition import DomainDecomposedSimulation
+from utils.physics_ops import generate_current_field_batch, step_physics
+
+D = 0.3
+DT = 1.0
+DX = 1.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=2048)
+    parser.add_argument("--steps", type=int, default=10)
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4, 8])
+    args = parser.parse_args()
+
+    n = args.size
+    rng = np.random.default_rng(0)
+    oil = rng.random((n, n), dtype=np.float32)
+    U, V = generate_current_field_batch(
+        1, args.steps, n, n, base_speed_min=0.5, base_speed_max=1.0, rng=rng
+    )
+    U, V = U[0], V[0]
+
+    t0 = time.perf_counter()
+    ref = oil
+    for t in range(args.steps):
+        ref = step_physics(ref, U[t], V[t], D=D, dt=DT, dx=DX)
+    t_single = (time.perf_counter() - t0) / args.steps
+
+    print(f"grid {n}x{n}, {args.steps} steps, {os.cpu_count()} CPUs")
+    print(f"{'workers':>8} {'ms/step':>9} {'speedup':>8} {'max diff':>10}")
+    print(f"{'single':>8} {t_single * 1e3:>9.1f} {1.0:>7.2f}x {0.0:>10.2e}")
+
+    for workers in args.workers:
+        with DomainDecomposedSimulation(n, n, D=D, dt=DT, dx=DX, num_workers=workers) as sim:
+            sim.run(oil, U[:1], V[:1])  # warm-up: start the pool
+            t0 = time.perf_counter()
+            out = sim.run(oil, U, V)
+            t_multi = (time.perf_counter() - t0) / args.steps
+
+        print(
+            f"{workers:>8} {t_multi * 1e3:>9.1f} {t_single / t_multi:>7.2f}x "
+            f"{np.abs(out - ref).max():>10.2e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# benchmarks/bench_inference_engine.py
+"""
+CPU inference throughput: eager ConvLSTMPredictor vs exported / compiled.
+
+    eager       model(x) under torch.no_grad (what app.py / run_demo.py do)
+    engine      InferenceEngine around the eager model (inference_mode, batched)
+    script      exported TorchScript artifact (traced + frozen), reloaded
+    optimized   the artifact with optimize_for_inference (default on CPU)
+    compiled    torch.compile of the eager model (--compile; first call
+                compiles, which is timed separately)
+
+Usage:
+    python benchmarks/bench_inference_engine.py [--windows 32] [--batch 8] [--size 64] [--compile]
+"""
+
+from __future__ import annotations
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import torch
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from ai_predictor.inference import InferenceEngine, export_model
+from ai_predictor.model_conv_lstm import ConvLSTMPredictor
+
+
+def eager_predict(model, x, batch):
+    with torch.no_grad():
+        return torch.cat([model(x[i:i + batch]) for i in range(0, x.shape[0], batch)])
+
+
+def timed(fn, repeat):
+    fn()  # warm-up
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        out = fn()
+    return (time.perf_counter() - t0) / repeat, out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--windows", type=int, default=32, help="forecasts per call")
+    parser.add_argument("--batch", type=int, default=8)
+    parser.add_argument("--t-in", type=int, default=4)
+    parser.add_argument("--channels", type=int, default=3)
+    parser.add_argument("--size", type=int, default=64)
+    parser.add_argument("--hidden", type=int, default=32)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--compile", action="store_true", help="also time torch.compile")
+    args = parser.parse_args()
+
+    torch.manual_seed(0)
+    model = ConvLSTMPredictor(args.channels, args.hidden).eval()
+    with torch.no_grad():
+        model.out_conv.bias.fill_(0.1)  # keep outputs off the relu at 0
+    x = torch.rand(args.windows, args.t_in, args.channels, args.size, args.size)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "predictor_ts.pt")
+        export_model(model, path, t_in=args.t_in, grid_shape=(args.size, args.size))
+        runners = {
+            "eager": lambda x: eager_predict(model, x, args.batch),
+            "engine": InferenceEngine(model, args.t_in, args.batch).predict,
+            "script": InferenceEngine.from_export(path, args.batch, optimize=False).predict,
+            "optimized": InferenceEngine.from_export(path, args.batch).predict,
+        }
+        compile_s = None
+        if args.compile:
+            engine = InferenceEngine(model, args.t_in, args.batch, compile=True)
+            t0 = time.perf_counter()
+            engine.predict(x[:args.batch])
+            compile_s = time.perf_counter() - t0
+            runners["compiled"] = engine.predict
+
+        print(f"{args.windows} windows, batch {args.batch}, T_in={args.t_in} C={args.channels} "
+              f"{args.size}x{args.size} hidden={args.hidden} threads={torch.get_num_threads()}")
+        if compile_s is not None:
+            print(f"torch.compile first call: {compile_s:.1f} s")
+        print(f"{'runner':>10} {'ms/call':>9} {'forecasts/s':>12} {'vs eager':>9} {'max |diff|':>11}")
+        t_eager, ref = None, None
+        for name, fn in runners.items():
+            seconds, out = timed(lambda: fn(x), args.repeat)
+            if t_eager is None:
+                t_eager, ref = seconds, out
+            diff = (out - ref).abs().max().item()
+            print(f"{name:>10} {1e3 * seconds:9.1f} {args.windows / seconds:12.1f} "
+                  f"{t_eager / seconds:8.2f}x {diff:11.2e}")
+
+
+if __name__ == "__main__":
+    main()
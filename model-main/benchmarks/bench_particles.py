@@ -0,0 +1,87 @@
+# benchmarks/bench_particles.py
+"""
+Particle engine (utils.particle_ops) vs grid `step_physics` for a point-source
+spill on domains of increasing size.
+
+Reports per-step time of both engines, the cost of one rasterization, and
+the distance between the two slick centroids after the run as a sanity check.
+
+Usage:
+    python benchmarks/bench_particles.py [--steps 50] [--particles 20000]
+"""
+
+from __future__ import annotations
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from utils.particle_ops import ParticleTransport
+from utils.physics_ops import generate_current_field_batch, step_physics
+
+GRID_SIZES = [128, 512, 2048]
+D = 0.3
+DT = 1.0
+DX = 1.0
+
+
+def centroid(field: np.ndarray) -> np.ndarray:
+    y, x = np.indices(field.shape)
+    total = field.sum()
+    return np.array([(x * field).sum() / total, (y * field).sum() / total])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--steps", type=int, default=50)
+    parser.add_argument("--particles", type=int, default=20_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+
+    print(
+        f"{'grid':>6} {'grid ms/step':>13} {'particle ms/step':>17} "
+        f"{'raster ms':>10} {'centroid diff':>14}"
+    )
+    for n in GRID_SIZES:
+        U, V = generate_current_field_batch(
+            1, args.steps, n, n, base_speed_min=0.5, base_speed_max=1.0, rng=rng
+        )
+        U, V = U[0], V[0]
+
+        # Point source: a single cell of oil in the middle
+        oil = np.zeros((n, n), dtype=np.float32)
+        oil[n // 2, n // 2] = 1.0
+
+        t0 = time.perf_counter()
+        grid_oil = oil
+        for t in range(args.steps):
+            grid_oil = step_physics(grid_oil, U[t], V[t], D=D, dt=DT, dx=DX)
+        t_grid = (time.perf_counter() - t0) / args.steps
+
+        engine = ParticleTransport(n, n, D=D, dx=DX, rng=rng)
+        engine.release_point(n // 2, n // 2, args.particles, mass=1.0)
+        t0 = time.perf_counter()
+        for t in range(args.steps):
+            engine.step(U[t], V[t], dt=DT)
+        t_part = (time.perf_counter() - t0) / args.steps
+
+        t0 = time.perf_counter()
+        frame = engine.rasterize()
+        t_raster = time.perf_counter() - t0
+
+        diff = np.linalg.norm(centroid(grid_oil) - centroid(frame))
+        print(
+            f"{n:>6} {t_grid * 1e3:>13.2f} {t_part * 1e3:>17.2f} "
+            f"{t_raster * 1e3:>10.2f} {diff:>11.2f} px"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# benchmarks/bench_regrid.py
+"""
+Sparse regridding (data.regrid.Regridder) vs per-timestep interpolation.
+
+Regrids `--hours` hourly frames of a 1/12 degree source grid onto a coarser
+model grid, comparing:
+    xarray interp       DataArray.interp on the whole stack (scipy per frame)
+    sparse build        one-off weight-matrix construction
+    sparse apply        all frames as one sparse matmul
+    cached build        re-opening the matrix from the on-disk cache
+
+Usage:
+    python benchmarks/bench_regrid.py [--hours 720] [--src 240] [--dst 64]
+"""
+
+from __future__ import annotations
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from data.regrid import Regridder
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--hours", type=int, default=720)
+    parser.add_argument("--src", type=int, default=240, help="source grid points per axis")
+    parser.add_argument("--dst", type=int, default=64, help="model grid points per axis")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    src_lat = np.linspace(40.0, 40.0 - args.src / 12.0, args.src)
+    src_lon = np.linspace(120.0, 120.0 + args.src / 12.0, args.src)
+    dst_lat = np.linspace(src_lat[-1] + 0.5, src_lat[0] - 0.5, args.dst)
+    dst_lon = np.linspace(src_lon[0] + 0.5, src_lon[-1] - 0.5, args.dst)
+
+    da = xr.DataArray(
+        rng.standard_normal((args.hours, args.src, args.src), dtype=np.float32),
+        dims=("time", "latitude", "longitude"),
+        coords={
+            "time": pd.date_range("2024-06-01", periods=args.hours, freq="h"),
+            "latitude": src_lat,
+            "longitude": src_lon,
+        },
+        name="uo",
+    )
+
+    t0 = time.perf_counter()
+    ref = da.interp(latitude=dst_lat, longitude=dst_lon).values
+    t_interp = time.perf_counter() - t0
+
+    print(f"{args.hours} frames, {args.src}x{args.src} -> {args.dst}x{args.dst}")
+    print(f"{'method':>14} {'build s':>9} {'apply s':>9} {'max |diff|':>11}")
+    print(f"{'xarray interp':>14} {'-':>9} {t_interp:9.3f} {'-':>11}")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for method in ("bilinear", "conservative"):
+            t0 = time.perf_counter()
+            regrid = Regridder(src_lat, src_lon, dst_lat, dst_lon, method=method, cache_dir=cache_dir)
+            t_build = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            out = regrid.regrid_dataset(da).values
+            t_apply = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            Regridder(src_lat, src_lon, dst_lat, dst_lon, method=method, cache_dir=cache_dir)
+            t_cached = time.perf_counter() - t0
+
+            diff = f"{np.abs(out - ref).max():11.2e}" if method == "bilinear" else f"{'-':>11}"
+            print(f"{method:>14} {t_build:9.3f} {t_apply:9.3f} {diff}")
+            print(f"{'  (cached)':>14} {t_cached:9.3f} {'':>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# benchmarks/bench_rollout.py
+"""
+Latency per forecast hour of multi-horizon forecasts (one frame = 1 h, as
+in app.py).
+
+    window      one-step model; every step re-reads the last T_in frames
+                (observed + predicted) with ConvLSTMPredictor.forward
+    rollout     one-step model; ai_predictor.rollout.rollout carries the
+                recurrent state, one cell step per layer per extra frame
+    direct      multi-output head (t_out = K), a single forward pass
+
+Usage:
+    python benchmarks/bench_rollout.py [--batch 1] [--t-in 4] [--size 64] [--repeat 3]
+"""
+
+from __future__ import annotations
+import argparse
+import os
+import sys
+import time
+
+import torch
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from ai_predictor.model_conv_lstm import ConvLSTMPredictor
+from ai_predictor.rollout import forecast, rollout
+
+HORIZONS = [6, 12, 24]
+
+
+def window_rollout(model, x_seq, future_forcing, horizon):
+    """Sliding-window baseline: re-read the last T_in frames at every step."""
+    t_in = x_seq.shape[1]
+    seq, preds = x_seq, []
+    for k in range(horizon):
+        pred = model(seq[:, -t_in:])
+        preds.append(pred)
+        if k + 1 < horizon:
+            frame = torch.cat([pred, future_forcing[:, k]], dim=1)
+            seq = torch.cat([seq, frame.unsqueeze(1)], dim=1)
+    return torch.stack(preds, dim=1)
+
+
+def timed(fn, repeat):
+    with torch.inference_mode():
+        fn()  # warm-up
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            out = fn()
+    return (time.perf_counter() - t0) / repeat, out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batch", type=int, default=1)
+    parser.add_argument("--t-in", type=int, default=4)
+    parser.add_argument("--channels", type=int, default=3)
+    parser.add_argument("--size", type=int, default=64)
+    parser.add_argument("--hidden", type=int, default=32)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    torch.manual_seed(0)
+    one_step = ConvLSTMPredictor(args.channels, args.hidden).eval()
+    x = torch.rand(args.batch, args.t_in, args.channels, args.size, args.size)
+    forcing = torch.rand(args.batch, max(HORIZONS), args.channels - 1, args.size, args.size)
+
+    print(f"B={args.batch} T_in={args.t_in} C={args.channels} {args.size}x{args.size} "
+          f"hidden={args.hidden} threads={torch.get_num_threads()}")
+    print(f"{'K':>4} {'window ms/h':>12} {'rollout ms/h':>13} {'direct ms/h':>12} {'speedup':>8}")
+    for K in HORIZONS:
+        direct = ConvLSTMPredictor(args.channels, args.hidden, t_out=K).eval()
+        t_window, ref = timed(lambda: window_rollout(one_step, x, forcing, K), args.repeat)
+        t_rollout, out = timed(lambda: rollout(one_step, x, forcing, horizon=K), args.repeat)
+        t_direct, _ = timed(lambda: forecast(direct, x, K), args.repeat)
+
+        # rollout carries the full history, the window baseline truncates it to
+        # T_in frames, so only the first step is identical
+        assert torch.allclose(out[:, 0], ref[:, 0])
+        print(f"{K:4d} {1e3 * t_window / K:12.1f} {1e3 * t_rollout / K:13.1f} "
+              f"{1e3 * t_direct / K:12.1f} {t_window / t_rollout:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
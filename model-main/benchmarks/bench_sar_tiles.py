@@ -0,0 +1,87 @@
+# benchmarks/bench_sar_tiles.py
+"""
+Tiled SAR reads (data.sar_tiles.SARTileReader) vs loading the whole scene.
+
+Writes a synthetic `--size` x `--size` float32 .npy scene to a temporary
+directory and times, for a model-domain window and a full-scene overview:
+    full load       np.load of the scene, then crop / block-average
+    tiled (cold)    first read through the reader, tiles from disk
+    tiled (warm)    same read again, tiles from the LRU cache
+Peak Python-side memory is measured with tracemalloc.
+
+Usage:
+    python benchmarks/bench_sar_tiles.py [--size 8192] [--tile 1024] [--cache-mib 64]
+"""
+
+from __future__ import annotations
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from data.sar_tiles import SARTileReader
+
+
+def measure(fn):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - t0
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+
+def full_load(path, bbox, factor):
+    scene = np.load(path)
+    r0, r1, c0, c1 = bbox
+    window = scene[r0:r1, c0:c1]
+    h, w = window.shape[0] // factor, window.shape[1] // factor
+    return window[:h * factor, :w * factor].reshape(h, factor, w, factor).mean(axis=(1, 3))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=8192)
+    parser.add_argument("--tile", type=int, default=1024)
+    parser.add_argument("--cache-mib", type=int, default=64, help="tile cache bound")
+    args = parser.parse_args()
+
+    n = args.size
+    cases = {
+        "window": ((n // 3, n // 3 + 2048, n // 2, n // 2 + 2048), 4),
+        "overview": ((0, n, 0, n), 32),
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "scene.npy")
+        scene = np.lib.format.open_memmap(path, mode="w+", dtype=np.float32, shape=(n, n))
+        rng = np.random.default_rng(0)
+        for r in range(0, n, 1024):
+            scene[r:r + 1024] = rng.random((min(1024, n - r), n), dtype=np.float32)
+        scene.flush()
+        del scene
+
+        print(f"scene {n}x{n} float32 ({n * n * 4 / 2**20:.0f} MiB), tile {args.tile}, cache {args.cache_mib} MiB")
+        print(f"{'case':>9} {'method':>13} {'seconds':>9} {'peak MiB':>9}")
+        for name, (bbox, factor) in cases.items():
+            t, peak = measure(lambda: full_load(path, bbox, factor))
+            print(f"{name:>9} {'full load':>13} {t:9.3f} {peak:9.1f}")
+
+            reader = SARTileReader(path, tile_size=args.tile, cache_bytes=args.cache_mib * 2**20)
+            for label in ("tiled (cold)", "tiled (warm)"):
+                t, peak = measure(lambda: reader.read(bbox, downsample=factor))
+                print(f"{name:>9} {label:>13} {t:9.3f} {peak:9.1f}")
+            reader.close()
+
+
+if __name__ == "__main__":
+    main()
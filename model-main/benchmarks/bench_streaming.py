@@ -0,0 +1,75 @@
+# benchmarks/bench_streaming.py
+"""
+Per-update latency of a live feed: window re-read vs StreamingPredictor.
+
+Each update appends one frame per stream. The window baseline calls
+ConvLSTMPredictor.forward on the last T_in frames (what app.py does);
+the streaming path feeds the single new frame to a StreamingPredictor.
+The last streamed prediction is checked against forward() over the
+stream's whole history (max |diff|).
+
+Usage:
+    python benchmarks/bench_streaming.py [--streams 4] [--size 64] [--repeat 10]
+"""
+
+from __future__ import annotations
+import argparse
+import os
+import sys
+import time
+
+import torch
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from ai_predictor.model_conv_lstm import ConvLSTMPredictor
+from ai_predictor.streaming import StreamingPredictor
+
+T_IN_VALUES = [4, 8, 16]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--streams", type=int, default=4)
+    parser.add_argument("--channels", type=int, default=3)
+    parser.add_argument("--size", type=int, default=64)
+    parser.add_argument("--hidden", type=int, default=32)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    torch.manual_seed(0)
+    model = ConvLSTMPredictor(args.channels, args.hidden).eval()
+    S, grid = args.streams, (args.size, args.size)
+    feed = torch.rand(max(T_IN_VALUES) + args.repeat, S, args.channels, *grid)
+
+    print(f"{S} streams, C={args.channels} {args.size}x{args.size} hidden={args.hidden} "
+          f"threads={torch.get_num_threads()}")
+    print(f"{'T_in':>5} {'window ms':>10} {'stream ms':>10} {'speedup':>8} {'max |diff|':>11}")
+    for t_in in T_IN_VALUES:
+        # Window: re-read the last t_in frames at every update
+        t0 = time.perf_counter()
+        with torch.inference_mode():
+            for k in range(args.repeat):
+                model(feed[k:k + t_in].transpose(0, 1))
+        t_window = (time.perf_counter() - t0) / args.repeat
+
+        # Stream: warm up on the first t_in - 1 frames, then one frame per update
+        stream = StreamingPredictor(model, S, grid)
+        stream.warmup(feed[:t_in - 1].transpose(0, 1))
+        t0 = time.perf_counter()
+        for k in range(args.repeat):
+            stream_pred = stream.update(feed[t_in - 1 + k])
+        t_stream = (time.perf_counter() - t0) / args.repeat
+
+        # The stream has seen every frame so far: compare with a full re-read
+        with torch.inference_mode():
+            ref = model(feed[:t_in - 1 + args.repeat].transpose(0, 1))
+        diff = (stream_pred - ref).abs().max().item()
+        print(f"{t_in:5d} {1e3 * t_window:10.1f} {1e3 * t_stream:10.1f} "
+              f"{t_window / t_stream:7.2f}x {diff:11.2e}")
+
+
+if __name__ == "__main__":
+    main()
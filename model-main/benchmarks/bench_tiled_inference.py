@@ -0,0 +1,93 @@
+# benchmarks/bench_tiled_inference.py
+"""
+Peak memory and time of full-domain vs tiled ConvLSTMPredictor inference.
+
+Every case runs in a fresh subprocess, which reports its own peak resident
+set size (ru_maxrss), so the numbers are not polluted by earlier cases.
+Full-domain inference is skipped above --full-max pixels per side (it grows
+with the domain: ~8 GB at 2048x2048 with hidden 32); tiled inference is
+checked against it where both run.
+
+Usage:
+    python benchmarks/bench_tiled_inference.py [--sizes 256 512 1024 2048] [--tile 256]
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+import torch
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from ai_predictor.model_conv_lstm import ConvLSTMPredictor
+from ai_predictor.tiling import tiled_predict
+
+T_IN = 4
+CHANNELS = 3
+
+
+def run_case(mode: str, size: int, tile: int, batch: int, hidden: int) -> dict:
+    torch.manual_seed(0)
+    model = ConvLSTMPredictor(CHANNELS, hidden).eval()
+    x = torch.rand(T_IN, CHANNELS, size, size, generator=torch.Generator().manual_seed(1))
+
+    t0 = time.perf_counter()
+    if mode == "full":
+        with torch.inference_mode():
+            out = model(x[None])[0]
+    else:
+        out = tiled_predict(model, x, tile_size=tile, batch_size=batch)
+    elapsed = time.perf_counter() - t0
+
+    peak_mib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return {"seconds": elapsed, "peak_mib": peak_mib, "checksum": out.double().sum().item(),
+            "sample": out[0, ::max(size // 64, 1), ::max(size // 64, 1)].tolist()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[256, 512, 1024, 2048])
+    parser.add_argument("--tile", type=int, default=256)
+    parser.add_argument("--batch", type=int, default=2, help="patches per forward pass")
+    parser.add_argument("--hidden", type=int, default=32)
+    parser.add_argument("--full-max", type=int, default=512)
+    parser.add_argument("--case", nargs=2, metavar=("MODE", "SIZE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        mode, size = args.case
+        print(json.dumps(run_case(mode, int(size), args.tile, args.batch, args.hidden)))
+        return
+
+    def spawn(mode, size):
+        cmd = [sys.executable, os.path.abspath(__file__), "--case", mode, str(size),
+               "--tile", str(args.tile), "--batch", str(args.batch), "--hidden", str(args.hidden)]
+        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        return json.loads(result.stdout.strip().splitlines()[-1])
+
+    print(f"T_in={T_IN} C={CHANNELS} hidden={args.hidden} tile={args.tile} "
+          f"batch={args.batch} threads={torch.get_num_threads()}")
+    print(f"{'size':>6} {'full s':>8} {'full MiB':>9} {'tiled s':>8} {'tiled MiB':>10} {'max |diff|':>11}")
+    for size in args.sizes:
+        tiled = spawn("tiled", size)
+        if size <= args.full_max:
+            full = spawn("full", size)
+            diff = max(abs(a - b) for ra, rb in zip(full["sample"], tiled["sample"]) for a, b in zip(ra, rb))
+            full_cols = f"{full['seconds']:8.2f} {full['peak_mib']:9.0f}"
+            diff_col = f"{diff:11.2e}"
+        else:
+            full_cols = f"{'-':>8} {'-':>9}"
+            diff_col = f"{'-':>11}"
+        print(f"{size:6d} {full_cols} {tiled['seconds']:8.2f} {tiled['peak_mib']:10.0f} {diff_col}")
+
+
+if __name__ == "__main__":
+    main()
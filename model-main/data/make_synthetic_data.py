@@ -6,16 +6,33 @@ Output:
     data/processed/train_sequences.npz
     - features: (N, T, C, H, W)
       C = 3 channels: [0]=oil, [1]=U, [2]=V
+      C = 5 with --wind: [3]=wind U, [4]=wind V (10 m wind; the slick
+      drifts with U + windage * wind U)
+
+    or, with --shard-size, a streamed shard set (see data/shards.py):
+    data/processed/train_shards/manifest.json + shard_*.npy
+    (memory-mapped for training; --compress writes shard_*.npz instead)
+
+    --raw writes the single-file dataset as uncompressed,
+    memory-mappable train_sequences.npy.
 """
 
 from __future__ import annotations
+import argparse
 import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
 
+from data.shards import ShardWriter
+from utils.forcing import ForcingInterpolator
 from utils.physics_ops import (
     generate_initial_oil,
-    generate_current_field,
-    step_physics,
+    generate_current_field_batch,
+    step_physics_batch,
+    SemiLagrangianAdvector,
+    WINDAGE_DEFAULT,
 )
 
 # ---------------------------
@@ -28,71 +45,325 @@ DX = 1.0                # spatial resolution (arbitrary units)
 DT = 1.0                # time step (arbitrary units)
 D_BASE = 0.3            # baseline diffusion coefficient (tunable)
 
+# Wind forcing (only with wind=True): coarser in time than the model step,
+# interpolated onto each step like real reanalysis wind
+WIND_DT = 6.0           # time between wind frames (model time units)
+WIND_SPEED_MIN = 0.3    # range of mean wind speed (same units as U/V)
+WIND_SPEED_MAX = 1.0
+WINDAGE = WINDAGE_DEFAULT
+
 RANDOM_SEED = 42
+NUM_WORKERS = os.cpu_count() or 1   # processes used by main()
 
 
-def generate_synthetic_dataset(
-    num_sequences: int = NUM_SEQUENCES,
-    t_total: int = T_TOTAL,
-    H: int = H,
-    W: int = W,
+def sequence_rng(n: int, seed: int = RANDOM_SEED) -> np.random.Generator:
+    """
+    Independent random generator for sequence `n`.
+
+    Derived from (seed, n) only, so a sequence is the same no matter which
+    worker generates it or in which order.
+    """
+    return np.random.default_rng([seed, n])
+
+
+def num_channels(wind: bool = False) -> int:
+    """Feature channels: oil, U, V (+ wind U, wind V)."""
+    return 5 if wind else 3
+
+
+def generate_sequence_batch(
+    rngs: list[np.random.Generator],
+    t_total: int,
+    H: int,
+    W: int,
+    wind: bool = False,
 ) -> np.ndarray:
     """
-    Generate synthetic dataset with shape:
-        (N, T, C, H, W), C=3
+    Simulate one sequence per generator, shape (len(rngs), T, C, H, W).
+
+    Every value of sequence i depends only on rngs[i], and the batched
+    physics step is element-wise per sequence, so how sequences are grouped
+    into batches does not change the output.
+
+    With wind=True, a wind field is drawn every WIND_DT time units and
+    interpolated onto each step (channels 3, 4); the slick drifts with the
+    current plus WINDAGE times the wind. The wind draws come after all
+    other draws of a sequence, so oil / U / V of a given seed do not depend
+    on the flag except through the drift.
     """
-    rng = np.random.default_rng(RANDOM_SEED)
+    num_sequences = len(rngs)
 
-    all_features = np.zeros(
-        (num_sequences, t_total, 3, H, W), dtype=np.float32
+    features = np.zeros(
+        (num_sequences, t_total, num_channels(wind), H, W), dtype=np.float32
     )
+    oil = np.zeros((num_sequences, H, W), dtype=np.float32)
+    D = np.zeros(num_sequences, dtype=np.float64)
 
-    for n in range(num_sequences):
+    for i, rng in enumerate(rngs):
         # Initial oil field
-        oil = generate_initial_oil(H, W)
+        oil[i] = generate_initial_oil(H, W, rng=rng)
 
-        # Time-varying currents
-        U, V = generate_current_field(
+        # Time-varying currents (vectorized over time)
+        U, V = generate_current_field_batch(
+            N=1,
             T=t_total,
             H=H,
             W=W,
             base_speed_min=0.01,
             base_speed_max=0.05,
             noise_level=0.01,
+            rng=rng,
         )
+        features[i, :, 1] = U[0]
+        features[i, :, 2] = V[0]
 
         # Slightly random diffusion for each sequence
-        D = float(D_BASE * rng.uniform(0.5, 1.5))
-
-        for t in range(t_total):
-            all_features[n, t, 0] = oil
-            all_features[n, t, 1] = U[t]
-            all_features[n, t, 2] = V[t]
-
-            # Evolve oil field
-            oil = step_physics(
-                oil=oil,
-                u=U[t],
-                v=V[t],
-                D=D,
-                dt=DT,
-                dx=DX,
+        D[i] = D_BASE * rng.uniform(0.5, 1.5)
+
+        if wind:
+            # Coarse wind frames, interpolated onto the model steps
+            n_frames = int(np.ceil((t_total - 1) * DT / WIND_DT)) + 1
+            wind_u, wind_v = generate_current_field_batch(
+                N=1,
+                T=n_frames,
+                H=H,
+                W=W,
+                base_speed_min=WIND_SPEED_MIN,
+                base_speed_max=WIND_SPEED_MAX,
+                noise_level=0.05,
+                rng=rng,
+            )
+            interp = ForcingInterpolator(
+                np.arange(n_frames) * WIND_DT,
+                np.arange(t_total) * DT,
+                {"wind_u": wind_u[0], "wind_v": wind_v[0]},
             )
+            for t in range(t_total):
+                features[i, t, 3] = interp.field("wind_u", t)
+                features[i, t, 4] = interp.field("wind_v", t)
+
+    # Evolve all sequences together: one vectorized step per timestep
+    advector = SemiLagrangianAdvector((num_sequences, H, W))
+    for t in range(t_total):
+        features[:, t, 0] = oil
+
+        # Last frame is stored but not advanced
+        if t == t_total - 1:
+            break
+
+        oil = step_physics_batch(
+            oil=oil,
+            u=features[:, t, 1],
+            v=features[:, t, 2],
+            D=D,
+            dt=DT,
+            dx=DX,
+            advector=advector,
+            wind_u=features[:, t, 3] if wind else None,
+            wind_v=features[:, t, 4] if wind else None,
+            windage=WINDAGE,
+        )
+
+    return features
+
+
+def _generate_chunk(
+    start: int,
+    stop: int,
+    t_total: int,
+    H: int,
+    W: int,
+    seed: int = RANDOM_SEED,
+    wind: bool = False,
+) -> np.ndarray:
+    """Generate sequences start..stop-1 with shape (stop - start, T, C, H, W)."""
+    rngs = [sequence_rng(n, seed) for n in range(start, stop)]
+    return generate_sequence_batch(rngs, t_total, H, W, wind=wind)
+
+
+def iter_synthetic_chunks(
+    num_sequences: int,
+    t_total: int,
+    H: int,
+    W: int,
+    chunk_size: int,
+    num_workers: int = 1,
+    seed: int = RANDOM_SEED,
+    wind: bool = False,
+):
+    """
+    Yield (start, features) chunks of the dataset in sequence order.
+
+    With num_workers > 1, at most 2 * num_workers chunks are in flight, so
+    memory stays bounded by a few chunks however large the dataset is.
+    """
+    chunks = iter(
+        (start, min(start + chunk_size, num_sequences))
+        for start in range(0, num_sequences, chunk_size)
+    )
+
+    if num_workers <= 1:
+        for start, stop in chunks:
+            yield start, _generate_chunk(start, stop, t_total, H, W, seed, wind)
+        return
+
+    with ProcessPoolExecutor(max_workers=num_workers) as pool:
+        pending = deque()
 
-        print(f"[INFO] Sequence {n + 1}/{num_sequences} generated")
+        def submit_next() -> None:
+            chunk = next(chunks, None)
+            if chunk is not None:
+                start, stop = chunk
+                pending.append(
+                    (start, pool.submit(_generate_chunk, start, stop, t_total, H, W, seed, wind))
+                )
+
+        for _ in range(2 * num_workers):
+            submit_next()
+
+        while pending:
+            start, future = pending.popleft()
+            features = future.result()
+            submit_next()
+            yield start, features
+
+
+def generate_synthetic_dataset(
+    num_sequences: int = NUM_SEQUENCES,
+    t_total: int = T_TOTAL,
+    H: int = H,
+    W: int = W,
+    num_workers: int = 1,
+    seed: int = RANDOM_SEED,
+    wind: bool = False,
+) -> np.ndarray:
+    """
+    Generate synthetic dataset with shape:
+        (N, T, C, H, W), C=3 (C=5 with wind=True)
+
+    With num_workers > 1, sequences are split into chunks and generated in a
+    process pool. Each sequence draws from `sequence_rng(n, seed)`, so the
+    result is bit-identical for any worker count.
+    """
+    all_features = np.zeros(
+        (num_sequences, t_total, num_channels(wind), H, W), dtype=np.float32
+    )
+
+    # A few chunks per worker keeps the pool balanced
+    chunk_size = max(1, -(-num_sequences // (4 * max(num_workers, 1))))
+    for start, features in iter_synthetic_chunks(
+        num_sequences, t_total, H, W, chunk_size, num_workers, seed, wind
+    ):
+        stop = start + len(features)
+        all_features[start:stop] = features
+        print(f"[INFO] Sequences {start + 1}-{stop}/{num_sequences} generated")
 
     return all_features
 
 
+def generate_synthetic_shards(
+    out_dir: str,
+    num_sequences: int = NUM_SEQUENCES,
+    t_total: int = T_TOTAL,
+    H: int = H,
+    W: int = W,
+    shard_size: int = 64,
+    num_workers: int = 1,
+    seed: int = RANDOM_SEED,
+    compress: bool = False,
+    wind: bool = False,
+) -> str:
+    """
+    Generate the dataset straight into a shard set (see data/shards.py).
+
+    Sequences are identical to `generate_synthetic_dataset` for the same
+    seed, but only a few shards are ever held in memory. Shards are raw
+    .npy that the dataset memory-maps; compress=True writes .npz shards
+    for archiving.
+
+    Returns:
+        path of the written manifest.json
+    """
+    with ShardWriter(out_dir, shard_size=shard_size, compress=compress) as writer:
+        for start, features in iter_synthetic_chunks(
+            num_sequences, t_total, H, W, shard_size, num_workers, seed, wind
+        ):
+            writer.write(features)
+            print(f"[INFO] Sequences {start + 1}-{start + len(features)}/{num_sequences} written")
+    return writer.close()
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic oil spill sequences.")
+    parser.add_argument("--num-sequences", type=int, default=NUM_SEQUENCES)
+    parser.add_argument("--workers", type=int, default=NUM_WORKERS)
+    parser.add_argument(
+        "--shard-size",
+        type=int,
+        default=0,
+        help="write a shard set of this many sequences per file "
+             "instead of one train_sequences.npz",
+    )
+    parser.add_argument(
+        "--raw",
+        action="store_true",
+        help="write uncompressed train_sequences.npy (memory-mappable) instead of .npz",
+    )
+    parser.add_argument(
+        "--compress",
+        action="store_true",
+        help="with --shard-size, write compressed .npz shards (archiving; "
+             "slow to sample from) instead of raw .npy",
+    )
+    parser.add_argument(
+        "--wind",
+        action="store_true",
+        help="add wind forcing (wind U / V feature channels, windage drift)",
+    )
+    args = parser.parse_args()
+
     base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     processed_dir = os.path.join(base_dir, "data", "processed")
     os.makedirs(processed_dir, exist_ok=True)
 
+    if args.shard_size > 0:
+        shard_dir = os.path.join(processed_dir, "train_shards")
+        print("[INFO] Streaming synthetic dataset to shards...")
+        manifest = generate_synthetic_shards(
+            shard_dir,
+            num_sequences=args.num_sequences,
+            shard_size=args.shard_size,
+            num_workers=args.workers,
+            compress=args.compress,
+            wind=args.wind,
+        )
+        print(f"[INFO] Saved to: {manifest}")
+        return
+
+    if args.raw:
+        save_path = os.path.join(processed_dir, "train_sequences.npy")
+        print("[INFO] Streaming synthetic dataset to a raw .npy file...")
+        features = np.lib.format.open_memmap(
+            save_path,
+            mode="w+",
+            dtype=np.float32,
+            shape=(args.num_sequences, T_TOTAL, num_channels(args.wind), H, W),
+        )
+        chunk_size = max(1, -(-args.num_sequences // (4 * max(args.workers, 1))))
+        for start, chunk in iter_synthetic_chunks(
+            args.num_sequences, T_TOTAL, H, W, chunk_size, args.workers, wind=args.wind
+        ):
+            features[start:start + len(chunk)] = chunk
+        features.flush()
+        print(f"[INFO] Saved to: {save_path}")
+        return
+
     save_path = os.path.join(processed_dir, "train_sequences.npz")
 
     print("[INFO] Generating synthetic dataset...")
-    features = generate_synthetic_dataset()
+    features = generate_synthetic_dataset(
+        num_sequences=args.num_sequences, num_workers=args.workers, wind=args.wind
+    )
     print("[INFO] Dataset shape:", features.shape)
 
     np.savez_compressed(save_path, features=features)
@@ -0,0 +1,175 @@
+# data/netcdf_archive.py
+"""
+Multi-file NetCDF ingestion for forcing archives (currents, wind, SST).
+
+Operational products arrive as one NetCDF file per day. `open_netcdf_archive`
+takes a directory, glob pattern or list of files and:
+
+    1. opens and subsets every file (variables, depth level, time window,
+       lat/lon region) concurrently in a thread pool,
+    2. concatenates the pieces along time, in time order,
+    3. optionally caches the subsetted result on disk.
+
+The cache file name is a hash of each input file's path, size and mtime plus
+the subset parameters, so a repeated run over unchanged days reads a single
+small file, and touching or adding any day invalidates it.
+
+Subsetting happens before loading, so memory is bounded by the selected
+region rather than the global grid: pass `region` for large files.
+"""
+
+from __future__ import annotations
+import glob
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import xarray as xr
+
+NETCDF_SUFFIXES = (".nc", ".nc4", ".netcdf")
+
+
+def coordinate_slice(coord: np.ndarray, bounds) -> slice:
+    """Index slice covering coordinate values in [min(bounds), max(bounds)].
+
+    Works for ascending and descending coordinates (e.g. latitude in CMEMS
+    vs. ERA5).
+    """
+    lo, hi = min(bounds), max(bounds)
+    idx = np.flatnonzero((coord >= lo) & (coord <= hi))
+    if idx.size == 0:
+        raise ValueError(f"no grid cells inside coordinate range {bounds}")
+    return slice(int(idx[0]), int(idx[-1]) + 1)
+
+
+def is_archive(source) -> bool:
+    """True if `source` names several files: a directory, glob or list."""
+    if isinstance(source, (list, tuple)):
+        return True
+    return os.path.isdir(source) or glob.has_magic(source)
+
+
+def resolve_files(source) -> list[str]:
+    """Expand a file, directory, glob pattern or list into sorted file paths."""
+    if isinstance(source, (list, tuple)):
+        files = [str(path) for path in source]
+    elif os.path.isdir(source):
+        files = sorted(
+            os.path.join(source, name)
+            for name in os.listdir(source)
+            if name.endswith(NETCDF_SUFFIXES)
+        )
+    elif glob.has_magic(source):
+        files = sorted(glob.glob(source))
+    else:
+        files = [source]
+
+    if not files:
+        raise FileNotFoundError(f"no NetCDF files found for {source!r}")
+    return files
+
+
+def subset_dataset(
+    ds: xr.Dataset,
+    variables: list[str] | None = None,
+    region: dict | None = None,
+    time_range: tuple | None = None,
+    depth_index: int | None = None,
+) -> xr.Dataset:
+    """
+    Lazy selection of variables / depth level / time window / region.
+
+    Args:
+        variables: data variables to keep (default: all)
+        region: coordinate name -> (lo, hi), e.g.
+            {"latitude": (33.0, 36.0), "longitude": (125.0, 129.0)}
+        time_range: (start, end) labels for .sel on "time"
+        depth_index: surface = 0; ignored for variables without depth
+    """
+    if variables is not None:
+        ds = ds[list(variables)]
+    if depth_index is not None and "depth" in ds.dims:
+        ds = ds.isel(depth=depth_index)
+    if time_range is not None and "time" in ds.dims:
+        ds = ds.sel(time=slice(*time_range))
+    if region:
+        ds = ds.isel({
+            name: coordinate_slice(np.asarray(ds[name].values), bounds)
+            for name, bounds in region.items()
+        })
+    return ds
+
+
+def _load_subset(path: str, kwargs: dict) -> xr.Dataset:
+    """Open one file, subset it and read the selection into memory."""
+    with xr.open_dataset(path) as ds:
+        return subset_dataset(ds, **kwargs).load()
+
+
+def cache_key(files: list[str], **params) -> str:
+    """Hash of input paths, sizes, mtimes and subset parameters."""
+    stats = []
+    for path in files:
+        st = os.stat(path)
+        stats.append([os.path.abspath(path), st.st_size, st.st_mtime_ns])
+    payload = json.dumps({"files": stats, "params": params}, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def open_netcdf_archive(
+    source,
+    variables: list[str] | None = None,
+    region: dict | None = None,
+    time_range: tuple | None = None,
+    depth_index: int | None = None,
+    max_workers: int | None = None,
+    cache_dir: str | None = None,
+) -> xr.Dataset:
+    """
+    Load and concatenate a multi-file NetCDF archive along time.
+
+    Args:
+        source: file, directory (all *.nc inside), glob pattern or list
+        variables, region, time_range, depth_index: see `subset_dataset`
+        max_workers: thread-pool size (default: min(8, number of files))
+        cache_dir: if set, the subsetted result is stored there and reused
+            while no input file changes
+
+    Returns:
+        in-memory xr.Dataset sorted by time
+    """
+    files = resolve_files(source)
+    kwargs = dict(
+        variables=variables, region=region, time_range=time_range, depth_index=depth_index
+    )
+
+    cache_path = None
+    if cache_dir is not None:
+        cache_path = os.path.join(cache_dir, f"archive_{cache_key(files, **kwargs)}.nc")
+        if os.path.isfile(cache_path):
+            with xr.open_dataset(cache_path) as cached:
+                return cached.load()
+
+    workers = max_workers or min(8, len(files))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # map() yields results in input (file name) order
+        parts = list(pool.map(lambda path: _load_subset(path, kwargs), files))
+
+    if len(parts) == 1:
+        ds = parts[0]
+    else:
+        parts = [part for part in parts if part.sizes.get("time", 1) > 0]
+        if not parts:
+            raise ValueError(f"time_range {time_range} selects no data in {source!r}")
+        ds = xr.concat(parts, dim="time")
+    if "time" in ds.dims:
+        ds = ds.sortby("time")
+
+    if cache_path is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = cache_path + ".tmp"
+        ds.to_netcdf(tmp_path)
+        os.replace(tmp_path, cache_path)
+    return ds
@@ -1,5 +1,7 @@
 # data/prepare_cmems_data.py
 
+from __future__ import annotations
+import argparse
 import os
 import sys
 import numpy as np
@@ -10,7 +12,81 @@ PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 if PROJECT_ROOT not in sys.path:
     sys.path.append(PROJECT_ROOT)
 
-from utils.physics_ops import apply_diffusion, apply_current_advection
+from data.netcdf_archive import coordinate_slice, is_archive, open_netcdf_archive
+from data.regrid import Regridder
+from utils.forcing import ForcingInterpolator
+from utils.land_mask import LandMask
+from utils.physics_ops import step_physics
+
+
+def select_surface_patch(
+    da: xr.DataArray,
+    H: int,
+    W: int,
+    n_time: int | None = None,
+    region: dict | None = None,
+    time_range: tuple | None = None,
+    crop: bool = True,
+) -> xr.DataArray:
+    """
+    표층 / 영역 / 시간 구간을 xarray 수준에서 lazy 하게 선택하는 함수.
+    (isel / sel 만 쓰므로 이 단계에서는 실제 데이터를 읽지 않음)
+
+    da: (time, depth, Y, X) 혹은 (time, Y, X)
+    region: {"latitude": (lat_min, lat_max), "longitude": (lon_min, lon_max)} 처럼
+            좌표 이름 -> 범위. 주어지면 그 안에서 중앙 HxW 를 자름
+    time_range: (start, end) 시간 라벨 범위 (예: ("2024-06-01", "2024-08-31"))
+    n_time: 앞에서부터 사용할 time step 수
+    crop: False 면 중앙 HxW 자르기를 생략 (regrid 할 때는 영역 전체가 필요)
+    출력: (time, H, W) lazy DataArray
+    """
+    # 표층만 사용 (depth=0)
+    if "depth" in da.dims:
+        da = da.isel(depth=0)
+
+    time_dim = "time" if "time" in da.dims else da.dims[0]
+    if time_range is not None:
+        da = da.sel({time_dim: slice(*time_range)})
+    if n_time is not None:
+        da = da.isel({time_dim: slice(0, n_time)})
+
+    if region is not None:
+        da = da.isel({
+            name: coordinate_slice(np.asarray(da[name].values), bounds)
+            for name, bounds in region.items()
+        })
+
+    if not crop:
+        return da
+
+    # 공간 해상도에서 중앙 HxW 패치 추출 (너무 크면 잘라냄)
+    y_dim, x_dim = da.dims[-2:]
+    full_H, full_W = da.sizes[y_dim], da.sizes[x_dim]
+    if full_H < H or full_W < W:
+        raise ValueError(f"선택 영역이 너무 작음: {full_H}x{full_W} < {H}x{W}")
+    start_y = (full_H - H) // 2
+    start_x = (full_W - W) // 2
+    return da.isel({y_dim: slice(start_y, start_y + H), x_dim: slice(start_x, start_x + W)})
+
+
+def read_time_chunks(
+    da: xr.DataArray, time_chunk: int = 24, regridder: Regridder | None = None
+) -> np.ndarray:
+    """
+    (time, H, W) lazy DataArray 를 time_chunk 개씩 나눠서 float32 numpy 로 읽음.
+    파일에서 실제로 읽는 양은 한 번에 한 chunk 분량의 패치뿐이라
+    최대 메모리 ~ 결과 배열 + chunk 하나 (전체 격자 크기와 무관).
+    regridder 가 주어지면 chunk 마다 모델 격자로 regrid (sparse matmul 한 번).
+    """
+    time_dim = da.dims[0]
+    n_time = da.sizes[time_dim]
+    spatial = da.shape[1:] if regridder is None else regridder.dst_shape
+    out = np.empty((n_time, *spatial), dtype=np.float32)
+    for t0 in range(0, n_time, time_chunk):
+        t1 = min(t0 + time_chunk, n_time)
+        chunk = da.isel({time_dim: slice(t0, t1)}).values
+        out[t0:t1] = chunk if regridder is None else regridder(chunk.astype(np.float32))
+    return out
 
 
 def build_cmems_sequences(
@@ -19,46 +95,100 @@ def build_cmems_sequences(
     T_total: int = 15,
     H: int = 64,
     W: int = 64,
+    region: dict | None = None,
+    time_range: tuple | None = None,
+    time_chunk: int = 24,
+    target_grid: tuple | None = None,
+    regrid_method: str = "bilinear",
+    regrid_cache_dir: str | None = None,
+    wind: tuple | None = None,
 ) -> np.ndarray:
     """
     CMEMS 실측 해류(u, v)를 이용해서 oil + U + V 시퀀스를 만드는 함수.
-    출력 shape: (N, T, C, H, W),  C=3 (0: oil, 1: U, 2: V)
+    출력 shape: (N, T, C, H, W),  C=3 (0: oil, 1: U, 2: V), wind 가 있으면 C=5
+
+    영역 / 표층 / 시간 구간은 select_surface_patch 로 lazy 하게 먼저 자르고,
+    필요한 HxW 패치만 read_time_chunks 로 time_chunk 개씩 읽음.
+    (전역 · 수개월 시간별 파일도 패치 크기만큼의 메모리로 처리 가능)
+
+    target_grid: (lat, lon) 1차원 좌표. 주어지면 중앙 패치를 자르는 대신
+                 data/regrid.py 의 Regridder 로 모델 격자에 보간함 (H, W 는 무시).
+                 sparse 행렬은 한 번만 만들고 regrid_cache_dir 에 캐시
+    regrid_method: "bilinear" 혹은 "conservative"
+    wind: (wind_u, wind_v) DataArray, (time, H, W) - 패치(또는 target_grid)와 같은
+          격자의 10 m 바람 (예: data_loader.regrid_to_grid 결과).
+          해류 시각에 맞춰 ForcingInterpolator 로 필요한 step 만 시간 보간하고,
+          채널 3, 4 로 저장 + windage 표류에 사용 → C=5
     """
 
     # ---- 1) 변수 이름 맞추기 (필요하면 여기만 수정하면 됨) ----
     # 보통 GLOBAL_ANALYSISFORECAST_PHY_001_024 제품은 uo / vo 를 씀.
     # depth, latitude, longitude 축 이름은 파일마다 조금씩 다르니,
-    # 안 맞으면 ds 출력 보고 isel 부분만 고치면 됨.
+    # 안 맞으면 ds 출력 보고 select_surface_patch 부분만 고치면 됨.
     u3d = ds["uo"]  # (time, depth, lat, lon) 혹은 (time, depth, y, x)
     v3d = ds["vo"]
 
-    # 표층만 사용 (depth=0)
-    u2d = u3d.isel(depth=0)
-    v2d = v3d.isel(depth=0)
-
-    # numpy 배열로 변환: (time, Y, X)
-    u_all = u2d.values
-    v_all = v2d.values
+    regridder = None
+    if target_grid is not None:
+        dst_lat, dst_lon = (np.asarray(c, dtype=np.float64) for c in target_grid)
+        H, W = dst_lat.size, dst_lon.size
+        if region is None:
+            # 모델 격자 범위 + 원본 격자 2칸 여유만 읽음
+            region = {}
+            for name, dst in zip(u3d.dims[-2:], (dst_lat, dst_lon)):
+                src = np.asarray(u3d[name].values)
+                margin = 2.0 * np.abs(np.diff(src)).max()
+                region[name] = (dst.min() - margin, dst.max() + margin)
+
+    # 표층 / 영역 / 시간 구간 선택 (lazy, 아직 읽지 않음): (time, H, W)
+    crop = target_grid is None
+    u_sel = select_surface_patch(u3d, H, W, region=region, time_range=time_range, crop=crop)
+    v_sel = select_surface_patch(v3d, H, W, region=region, time_range=time_range, crop=crop)
+
+    if target_grid is not None:
+        y_dim, x_dim = u_sel.dims[-2:]
+        regridder = Regridder(
+            u_sel[y_dim].values,
+            u_sel[x_dim].values,
+            dst_lat,
+            dst_lon,
+            method=regrid_method,
+            cache_dir=regrid_cache_dir,
+        )
 
-    # 사용할 time 범위 확인
-    n_time, full_H, full_W = u_all.shape
+    # 사용할 time 범위 확인 (시퀀스 n 은 time n ~ n + T_total - 1 을 사용)
+    n_time = u_sel.shape[0]
     if n_time < T_total + num_sequences:
         raise ValueError(f"시간 축이 부족함: {n_time} < {T_total + num_sequences}")
+    n_needed = num_sequences + T_total - 1
 
-    # 공간 해상도에서 중앙 HxW 패치 추출 (너무 크면 잘라냄)
-    start_y = (full_H - H) // 2 if full_H > H else 0
-    start_x = (full_W - W) // 2 if full_W > W else 0
+    # numpy 배열로 변환: (time, H, W) - 필요한 시간만 chunk 단위로 읽음
+    u_patch = read_time_chunks(u_sel[:n_needed], time_chunk, regridder)
+    v_patch = read_time_chunks(v_sel[:n_needed], time_chunk, regridder)
 
-    u_patch = u_all[:, start_y : start_y + H, start_x : start_x + W]
-    v_patch = v_all[:, start_y : start_y + H, start_x : start_x + W]
+    # 육지 마스크: uo/vo 가 NaN 인 격자 = 육지 (물리 스텝에서 계산 제외)
+    land_mask = LandMask.from_currents(u_patch, v_patch)
 
     # 속도 스케일링 (대략 synthetic 데이터 스케일과 비슷하게)
     max_speed = np.nanmax(np.sqrt(u_patch**2 + v_patch**2)) + 1e-6
-    u_patch = 0.5 * u_patch / max_speed
-    v_patch = 0.5 * v_patch / max_speed
+    # 모델 입력에는 NaN 이 들어가면 안 되므로 육지 해류는 0 으로 채움
+    u_patch = land_mask.fill_land(0.5 * u_patch / max_speed)
+    v_patch = land_mask.fill_land(0.5 * v_patch / max_speed)
+
+    # 바람: 해류 time step 마다 bracketing index / weight 를 미리 계산해 두고
+    # 프레임은 필요할 때만 읽어서 보간 (전체를 해류 시간 해상도로 만들지 않음)
+    wind_interp = None
+    if wind is not None:
+        wind_u, wind_v = wind
+        wind_interp = ForcingInterpolator(
+            wind_u[wind_u.dims[0]].values,
+            u_sel[u_sel.dims[0]].values[:n_needed],
+            {"wind_u": wind_u, "wind_v": wind_v},
+        )
+    n_channels = 3 if wind_interp is None else 5
 
     # 출력 배열
-    data = np.zeros((num_sequences, T_total, 3, H, W), dtype=np.float32)
+    data = np.zeros((num_sequences, T_total, n_channels, H, W), dtype=np.float32)
 
     # 격자 좌표 (oil 초기 분포용)
     xs = np.arange(W)
@@ -82,7 +212,8 @@ def build_cmems_sequences(
         oil0 = np.exp(-(((xx - cy) ** 2 + (yy - cx) ** 2) / (2 * sigma**2))).astype(
             np.float32
         )
-        oil = oil0.copy()
+        # 육지 위에는 기름 없음
+        oil = land_mask.fill_land(oil0)
 
         # 물리 파라미터 (논문 기반으로 나중에 보정 가능)
         dt = 1.0
@@ -94,17 +225,29 @@ def build_cmems_sequences(
             data[n, t, 0] = oil
             data[n, t, 1] = u_seq[t]
             data[n, t, 2] = v_seq[t]
+            if wind_interp is not None:
+                # 해류와 같은 스케일로 맞춤 (windage 비율 유지)
+                forcing = wind_interp(t0 + t)
+                data[n, t, 3] = 0.5 * forcing["wind_u"] / max_speed
+                data[n, t, 4] = 0.5 * forcing["wind_v"] / max_speed
 
             # 마지막 프레임은 업데이트 안 함
             if t == T_total - 1:
                 break
 
-            # 다음 스텝으로 전파: 확산 + 해류에 의한 advection
-            oil = apply_diffusion(oil, D=D, dt=dt)
-            oil = apply_current_advection(oil, u_seq[t], v_seq[t], beta=beta, dt=dt)
-
-            # 수치적 이상 방지
-            oil = np.clip(oil, 0.0, 1.0)
+            # 다음 스텝으로 전파: 확산 + 해류에 의한 advection (바다 격자만)
+            # 해안에 닿은 기름은 좌초되어 바다에서 빠짐, 결과는 [0, 1] 로 clip 됨
+            oil = step_physics(
+                oil,
+                beta * u_seq[t],
+                beta * v_seq[t],
+                D=D,
+                dt=dt,
+                dx=1.0,
+                land_mask=land_mask,
+                wind_u=data[n, t, 3] if wind_interp is not None else None,
+                wind_v=data[n, t, 4] if wind_interp is not None else None,
+            )
 
     return data
 
@@ -113,22 +256,59 @@ def main():
     # 경로 설정
     here = os.path.dirname(__file__)
 
-    raw_nc = os.path.join(here, "raw", "cmems_mod_glo_phy_anfc_0.083deg_PT1H-m.nc")
+    parser = argparse.ArgumentParser(description="CMEMS 해류로 oil + U + V 시퀀스 생성")
+    parser.add_argument(
+        "--source",
+        default=os.path.join(here, "raw", "cmems_mod_glo_phy_anfc_0.083deg_PT1H-m.nc"),
+        help="NetCDF 파일 하나, 또는 일별 파일이 든 디렉터리 / glob 패턴",
+    )
+    parser.add_argument("--lat", type=float, nargs=2, default=None, help="위도 범위 (min max)")
+    parser.add_argument("--lon", type=float, nargs=2, default=None, help="경도 범위 (min max)")
+    parser.add_argument("--workers", type=int, default=None, help="파일 여는 스레드 수")
+    parser.add_argument(
+        "--cache-dir",
+        default=os.path.join(here, "cache"),
+        help="여러 파일을 subset 한 결과 캐시 위치 (파일 mtime + 영역 기준)",
+    )
+    args = parser.parse_args()
+
     save_dir = os.path.join(here, "processed")
     os.makedirs(save_dir, exist_ok=True)
     save_path = os.path.join(save_dir, "cmems_sequences.npz")
 
-    print(f"[INFO] Loading CMEMS file: {raw_nc}")
-    ds = xr.open_dataset(raw_nc)
-
-    print("[INFO] Building sequences from CMEMS currents...")
-    features = build_cmems_sequences(
-        ds,
-        num_sequences=32,  # 필요에 따라 늘리기
-        T_total=15,
-        H=64,
-        W=64,
-    )
+    region = {}
+    if args.lat:
+        region["latitude"] = tuple(args.lat)
+    if args.lon:
+        region["longitude"] = tuple(args.lon)
+
+    if is_archive(args.source):
+        # 일별 파일 여러 개: 스레드 풀로 동시에 열고 subset 후 time 순으로 이어 붙임
+        print(f"[INFO] Loading CMEMS archive: {args.source}")
+        ds = open_netcdf_archive(
+            args.source,
+            variables=["uo", "vo"],
+            region=region or None,
+            depth_index=0,
+            max_workers=args.workers,
+            cache_dir=args.cache_dir,
+        )
+        region = {}  # 이미 영역을 잘랐음
+    else:
+        print(f"[INFO] Opening CMEMS file (lazy): {args.source}")
+        ds = xr.open_dataset(args.source)
+
+    with ds:
+        print("[INFO] Building sequences from CMEMS currents...")
+        features = build_cmems_sequences(
+            ds,
+            num_sequences=32,  # 필요에 따라 늘리기
+            T_total=15,
+            H=64,
+            W=64,
+            region=region or None,
+            time_chunk=24,  # 한 번에 읽을 time step 수 (메모리 상한 조절)
+        )
 
     print(f"[INFO] Saving to {save_path}")
     np.savez_compressed(save_path, features=features)
@@ -0,0 +1,228 @@
+# data/regrid.py
+"""
+Sparse regridding from a rectilinear lat/lon grid onto the model grid.
+
+`Regridder` builds the interpolation operator for one (source grid, target
+grid) pair as a scipy.sparse matrix of shape (n_target, n_source), once, and
+then regrids any number of frames as a single sparse matmul:
+
+    (n_target, n_source) @ (n_source, frames)
+
+For rectilinear grids the operator is separable, so it is assembled as the
+Kronecker product of two 1-D operators (latitude x longitude):
+
+    bilinear        2 source points per axis, 4 non-zeros per target cell
+    conservative    area-overlap fractions of the cells (latitude overlaps
+                    measured in sin(lat), i.e. true area on the sphere)
+
+Matrices are cached on disk (`cache_dir`) under a hash of both grids and the
+method, so a preprocessing run over months of hourly forcing costs one build
+plus cheap multiplications, and later runs skip even the build.
+
+NaN source values (land in CMEMS) are excluded and the weights of each
+target cell are renormalized over the valid points; target cells with no
+valid source point are NaN.
+"""
+
+from __future__ import annotations
+import hashlib
+import os
+
+import numpy as np
+import xarray as xr
+from scipy import sparse
+
+METHODS = ("bilinear", "conservative")
+
+
+def _bilinear_1d(src: np.ndarray, dst: np.ndarray) -> sparse.csr_matrix:
+    """(n_dst, n_src) linear interpolation weights; rows outside src are empty."""
+    order = np.argsort(src)
+    s = src[order]
+    i0 = np.clip(np.searchsorted(s, dst) - 1, 0, s.size - 2)
+    w = (dst - s[i0]) / (s[i0 + 1] - s[i0])
+    inside = (dst >= s[0]) & (dst <= s[-1])
+
+    rows = np.flatnonzero(inside)
+    i0, w = i0[inside], w[inside]
+    return sparse.csr_matrix(
+        (np.concatenate([1.0 - w, w]),
+         (np.concatenate([rows, rows]), np.concatenate([order[i0], order[i0 + 1]]))),
+        shape=(dst.size, src.size),
+    )
+
+
+def _cell_edges(centers: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Lower / upper cell edges from (any-order) cell centres."""
+    order = np.argsort(centers)
+    c = centers[order]
+    mid = 0.5 * (c[1:] + c[:-1])
+    edges = np.concatenate([[c[0] - (mid[0] - c[0])], mid, [c[-1] + (c[-1] - mid[-1])]])
+    lo, hi = np.empty_like(c), np.empty_like(c)
+    lo[order], hi[order] = edges[:-1], edges[1:]
+    return lo, hi
+
+
+def _conservative_1d(src: np.ndarray, dst: np.ndarray, measure) -> sparse.csr_matrix:
+    """(n_dst, n_src) overlap of each target cell with each source cell,
+    as a fraction of the target cell (`measure` maps edges to length units)."""
+    s_lo, s_hi = (measure(e) for e in _cell_edges(src))
+    d_lo, d_hi = (measure(e) for e in _cell_edges(dst))
+    overlap = np.minimum(d_hi[:, None], s_hi[None, :]) - np.maximum(d_lo[:, None], s_lo[None, :])
+    frac = np.clip(overlap, 0.0, None) / (d_hi - d_lo)[:, None]
+    return sparse.csr_matrix(frac)
+
+
+def _sin_lat(edges: np.ndarray) -> np.ndarray:
+    return np.sin(np.deg2rad(np.clip(edges, -90.0, 90.0)))
+
+
+def build_weights(src_lat, src_lon, dst_lat, dst_lon, method: str = "bilinear") -> sparse.csr_matrix:
+    """
+    Sparse (n_dst, n_src) regridding matrix between two rectilinear grids,
+    with cells flattened row-major as (lat, lon).
+    """
+    src_lat, src_lon, dst_lat, dst_lon = (
+        np.asarray(a, dtype=np.float64) for a in (src_lat, src_lon, dst_lat, dst_lon)
+    )
+    if min(src_lat.size, src_lon.size) < 2:
+        raise ValueError("source grid needs at least 2 points per axis")
+
+    if method == "bilinear":
+        lat_w = _bilinear_1d(src_lat, dst_lat)
+        lon_w = _bilinear_1d(src_lon, dst_lon)
+    elif method == "conservative":
+        lat_w = _conservative_1d(src_lat, dst_lat, _sin_lat)
+        lon_w = _conservative_1d(src_lon, dst_lon, lambda e: e)
+    else:
+        raise ValueError(f"Unknown regrid method: {method!r} (use one of {METHODS})")
+
+    weights = sparse.kron(lat_w, lon_w, format="csr")
+    weights.eliminate_zeros()
+    return weights
+
+
+def _grid_hash(*arrays, method: str) -> str:
+    h = hashlib.sha1(method.encode("utf-8"))
+    for a in arrays:
+        a = np.ascontiguousarray(a, dtype=np.float64)
+        h.update(str(a.shape).encode("utf-8"))
+        h.update(a.tobytes())
+    return h.hexdigest()[:16]
+
+
+class Regridder:
+    """
+    Reusable regridding operator between two rectilinear lat/lon grids.
+
+    Usage:
+        regrid = Regridder(ds.latitude, ds.longitude, model_lat, model_lon,
+                           method="conservative", cache_dir="data/cache")
+        u_model = regrid(u_native)               # (..., Hs, Ws) -> (..., Hd, Wd)
+        forcing = regrid.regrid_dataset(ds)      # every variable, one matmul
+
+    Args:
+        src_lat, src_lon: 1-D source coordinates (either order)
+        dst_lat, dst_lon: 1-D target (model grid) coordinates
+        method: "bilinear" or "conservative"
+        cache_dir: if set, the matrix is loaded from / saved to
+            regrid_<hash>.npz there
+    """
+
+    def __init__(self, src_lat, src_lon, dst_lat, dst_lon, method: str = "bilinear", cache_dir: str | None = None):
+        self.src_lat, self.src_lon, self.dst_lat, self.dst_lon = (
+            np.asarray(a, dtype=np.float64) for a in (src_lat, src_lon, dst_lat, dst_lon)
+        )
+        self.method = method
+        self.src_shape = (self.src_lat.size, self.src_lon.size)
+        self.dst_shape = (self.dst_lat.size, self.dst_lon.size)
+
+        cache_path = None
+        if cache_dir is not None:
+            key = _grid_hash(self.src_lat, self.src_lon, self.dst_lat, self.dst_lon, method=method)
+            cache_path = os.path.join(cache_dir, f"regrid_{key}.npz")
+
+        if cache_path is not None and os.path.isfile(cache_path):
+            self.weights = sparse.load_npz(cache_path).tocsr()
+        else:
+            self.weights = build_weights(self.src_lat, self.src_lon, self.dst_lat, self.dst_lon, method)
+            if cache_path is not None:
+                os.makedirs(cache_dir, exist_ok=True)
+                tmp_path = cache_path[:-len(".npz")] + ".tmp.npz"
+                sparse.save_npz(tmp_path, self.weights)
+                os.replace(tmp_path, cache_path)
+
+        # Row sums for the all-valid fast path (< 1 where a target cell is
+        # only partly covered by the source grid)
+        self._row_sum = np.asarray(self.weights.sum(axis=1)).ravel()
+        self._weights_by_dtype = {np.dtype(np.float64): self.weights}
+
+    def _weights_as(self, dtype) -> sparse.csr_matrix:
+        dtype = np.dtype(dtype)
+        if dtype not in self._weights_by_dtype:
+            self._weights_by_dtype[dtype] = self.weights.astype(dtype)
+        return self._weights_by_dtype[dtype]
+
+    def regrid_frames(self, frames: np.ndarray) -> np.ndarray:
+        """(F, n_src) -> (F, n_dst) with one sparse matmul (two if NaNs present)."""
+        dtype = np.float32 if frames.dtype == np.float32 else np.float64
+        frames = np.asarray(frames, dtype=dtype)
+        weights = self._weights_as(dtype)
+
+        valid = np.isfinite(frames)
+        if valid.all():
+            num = weights @ frames.T
+            den = self._row_sum.astype(dtype)[:, None]
+        else:
+            num = weights @ np.where(valid, frames, 0).T
+            den = weights @ valid.T.astype(dtype)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            out = np.where(den > 1e-6, num / den, np.nan)
+        return np.ascontiguousarray(out.T, dtype=dtype)
+
+    def __call__(self, field: np.ndarray) -> np.ndarray:
+        """Regrid (..., Hs, Ws) -> (..., Hd, Wd)."""
+        field = np.asarray(field)
+        if field.shape[-2:] != self.src_shape:
+            raise ValueError(f"expected trailing shape {self.src_shape}, got {field.shape[-2:]}")
+        lead = field.shape[:-2]
+        out = self.regrid_frames(field.reshape(-1, self.src_shape[0] * self.src_shape[1]))
+        return out.reshape(*lead, *self.dst_shape)
+
+    def regrid_dataset(self, data, lat_name: str = "latitude", lon_name: str = "longitude"):
+        """
+        Regrid every variable with (lat, lon) dims of a Dataset or DataArray.
+
+        All frames of all variables are stacked into one matrix, so the whole
+        dataset costs a single sparse matmul. Variables without both spatial
+        dims are dropped from the result.
+        """
+        if isinstance(data, xr.DataArray):
+            name = data.name if data.name is not None else "__data__"
+            return self.regrid_dataset(data.to_dataset(name=name), lat_name, lon_name)[name]
+
+        names = [n for n, da in data.data_vars.items() if {lat_name, lon_name} <= set(da.dims)]
+        arrays = [data[n].transpose(..., lat_name, lon_name) for n in names]
+        n_src = self.src_shape[0] * self.src_shape[1]
+        stacked = np.concatenate(
+            [np.asarray(da.values, dtype=np.float32).reshape(-1, n_src) for da in arrays]
+        )
+        regridded = self.regrid_frames(stacked)
+
+        out, start = {}, 0
+        for name, da in zip(names, arrays):
+            lead_shape = da.shape[:-2]
+            count = int(np.prod(lead_shape, dtype=np.int64))
+            out[name] = xr.DataArray(
+                regridded[start:start + count].reshape(*lead_shape, *self.dst_shape),
+                dims=da.dims,
+                coords={
+                    **{d: da[d] for d in da.dims[:-2] if d in da.coords},
+                    lat_name: self.dst_lat,
+                    lon_name: self.dst_lon,
+                },
+                attrs=da.attrs,
+            )
+            start += count
+        return xr.Dataset(out, attrs=data.attrs)
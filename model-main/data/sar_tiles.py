@@ -0,0 +1,311 @@
+# data/sar_tiles.py
+"""
+Windowed, tiled access to large SAR scenes.
+
+Sentinel-1 scenes are tens of thousands of pixels per side, so reading a
+whole scene to cut out a slick is wasteful. `SARTileReader` splits the scene
+into fixed-size tiles and serves reads by bounding box and downsample
+factor:
+
+    .npy            memory-mapped (np.load(mmap_mode="r"))
+    .tif / .tiff    windowed reads with rasterio if it is installed,
+                    otherwise the whole image is decoded once with cv2
+                    (same as data_loader.load_sar_image)
+
+Only the tiles that intersect a request are read, each is block-averaged
+into the output as soon as it is loaded (so memory is the output plus one
+tile, even for a full-scene overview), and recently used tiles stay in an
+LRU cache bounded in bytes.
+
+`SARTileReader.resample` area-averages a window onto an exact output grid
+(fractional cell edges), and `initial_oil_from_sar` uses it to turn a slick
+mask (or thresholded backscatter) into an initial oil field on the model
+grid.
+"""
+
+from __future__ import annotations
+from collections import OrderedDict
+
+import numpy as np
+
+
+class _ArraySource:
+    """Tile source over an array-like (in-memory array or np.memmap)."""
+
+    def __init__(self, array):
+        if array.ndim == 3:
+            array = array[..., 0]  # first band
+        self.array = array
+        self.shape = array.shape
+        self.dtype = array.dtype
+
+    def read(self, r0: int, r1: int, c0: int, c1: int) -> np.ndarray:
+        return np.array(self.array[r0:r1, c0:c1])
+
+    def close(self) -> None:
+        pass
+
+
+class _RasterioSource:
+    """Tile source over a GeoTIFF band, read window by window."""
+
+    def __init__(self, path: str):
+        import rasterio
+        from rasterio.windows import Window
+
+        self._window = Window
+        self.dataset = rasterio.open(path)
+        self.shape = (self.dataset.height, self.dataset.width)
+        self.dtype = np.dtype(self.dataset.dtypes[0])
+
+    def read(self, r0: int, r1: int, c0: int, c1: int) -> np.ndarray:
+        return self.dataset.read(1, window=self._window(c0, r0, c1 - c0, r1 - r0))
+
+    def close(self) -> None:
+        self.dataset.close()
+
+
+def _open_source(path: str):
+    if path.endswith(".npy"):
+        return _ArraySource(np.load(path, mmap_mode="r"))
+    if path.endswith(".tif") or path.endswith(".tiff"):
+        try:
+            return _RasterioSource(path)
+        except ImportError:
+            import cv2
+            image = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+            if image is None:
+                raise FileNotFoundError(path)
+            return _ArraySource(image)
+    raise ValueError("Unsupported SAR format")
+
+
+def _block_sums(values: np.ndarray, offset_r: int, offset_c: int, fy: int, fx: int):
+    """
+    Sum `values` into fy x fx blocks whose grid starts `offset_*` pixels
+    before values[0, 0]. Returns (sums, first block row, first block col).
+
+    The values are copied into a zero-padded, block-aligned float32 buffer
+    so the reduction is a reshape + sum (much faster than np.add.reduceat
+    along rows).
+    """
+    h, w = values.shape
+    pr, pc = offset_r % fy, offset_c % fx
+    buf = np.zeros((-(-(pr + h) // fy) * fy, -(-(pc + w) // fx) * fx), dtype=np.float32)
+    buf[pr:pr + h, pc:pc + w] = values
+    bh, bw = buf.shape[0] // fy, buf.shape[1] // fx
+    sums = buf.reshape(bh, fy, bw, fx).sum(axis=3, dtype=np.float64).sum(axis=1)
+    return sums, offset_r // fy, offset_c // fx
+
+
+def _area_weights(start: int, stop: int, n_in: int, n_out: int) -> np.ndarray:
+    """
+    (n_out, stop - start) area-averaging weights from input pixels
+    start..stop-1 of an axis of `n_in` pixels onto `n_out` equal bins.
+
+    Bin j spans [j * n_in / n_out, (j + 1) * n_in / n_out) in pixel units;
+    each weight is the overlap of a pixel with a bin divided by the bin
+    width, so summed over all input pixels each row adds up to one.
+    """
+    edges = np.arange(n_out + 1) * (n_in / n_out)
+    pixels = np.arange(start, stop, dtype=np.float64)
+    overlap = (
+        np.minimum(pixels + 1.0, edges[1:, None]) - np.maximum(pixels, edges[:-1, None])
+    )
+    return np.clip(overlap, 0.0, None) * (n_out / n_in)
+
+
+class SARTileReader:
+    """
+    Tiled reader for one SAR scene (first band).
+
+    Usage:
+        with SARTileReader("scene.npy", tile_size=1024) as sar:
+            overview = sar.read(downsample=32)                      # whole scene
+            patch = sar.read((12000, 14048, 3000, 5048), downsample=4)
+            grid = sar.resample((12000, 14048, 3000, 5048), (300, 300))
+
+    Args:
+        path: .npy or .tif / .tiff scene
+        tile_size: tile edge in pixels
+        cache_bytes: upper bound on the memory held by cached tiles
+    """
+
+    def __init__(self, path: str, tile_size: int = 1024, cache_bytes: int = 256 * 2**20):
+        if tile_size < 1:
+            raise ValueError(f"tile_size must be positive, got {tile_size}")
+        self.path = path
+        self.tile_size = int(tile_size)
+        self.cache_bytes = int(cache_bytes)
+        self._source = _open_source(path)
+        self._tiles: OrderedDict = OrderedDict()
+        self._cached_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return tuple(self._source.shape)
+
+    def __enter__(self) -> "SARTileReader":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self) -> None:
+        self._tiles.clear()
+        self._cached_bytes = 0
+        self._source.close()
+
+    def tile(self, ty: int, tx: int) -> np.ndarray:
+        """Tile (ty, tx) as a read-only array, from the cache if possible."""
+        key = (ty, tx)
+        tile = self._tiles.get(key)
+        if tile is not None:
+            self.hits += 1
+            self._tiles.move_to_end(key)
+            return tile
+
+        self.misses += 1
+        H, W = self.shape
+        r0, c0 = ty * self.tile_size, tx * self.tile_size
+        tile = self._source.read(r0, min(r0 + self.tile_size, H), c0, min(c0 + self.tile_size, W))
+        tile.flags.writeable = False
+
+        if tile.nbytes <= self.cache_bytes:
+            self._tiles[key] = tile
+            self._cached_bytes += tile.nbytes
+            while self._cached_bytes > self.cache_bytes:
+                _, evicted = self._tiles.popitem(last=False)
+                self._cached_bytes -= evicted.nbytes
+        return tile
+
+    def read(
+        self,
+        bbox: tuple[int, int, int, int] | None = None,
+        downsample=1,
+        transform=None,
+    ) -> np.ndarray:
+        """
+        Read a window, block-averaged by `downsample`.
+
+        Args:
+            bbox: (row0, row1, col0, col1) in scene pixels, end-exclusive;
+                default is the whole scene. Clipped to the scene.
+            downsample: int or (fy, fx) block size; each output pixel is the
+                mean of the block (partial blocks at the far edges included)
+            transform: optional fn(tile) -> array applied to each raw tile
+                before averaging (e.g. a backscatter threshold); cached tiles
+                stay untransformed
+
+        Returns:
+            float32 (ceil(h / fy), ceil(w / fx)) array
+        """
+        H, W = self.shape
+        r0, r1, c0, c1 = (0, H, 0, W) if bbox is None else bbox
+        r0, r1 = max(int(r0), 0), min(int(r1), H)
+        c0, c1 = max(int(c0), 0), min(int(c1), W)
+        if r1 <= r0 or c1 <= c0:
+            raise ValueError(f"empty window {bbox} for scene of shape {self.shape}")
+        fy, fx = (downsample, downsample) if np.ndim(downsample) == 0 else downsample
+        fy, fx = int(fy), int(fx)
+
+        out_h, out_w = -(-(r1 - r0) // fy), -(-(c1 - c0) // fx)
+        sums = np.zeros((out_h, out_w), dtype=np.float64)
+        ts = self.tile_size
+        for ty in range(r0 // ts, (r1 - 1) // ts + 1):
+            for tx in range(c0 // ts, (c1 - 1) // ts + 1):
+                tile = self.tile(ty, tx)
+                if transform is not None:
+                    tile = transform(tile)
+                # Part of the tile inside the window, in tile coordinates
+                a0, a1 = max(r0 - ty * ts, 0), min(r1 - ty * ts, tile.shape[0])
+                b0, b1 = max(c0 - tx * ts, 0), min(c1 - tx * ts, tile.shape[1])
+                block, br, bc = _block_sums(
+                    tile[a0:a1, b0:b1], ty * ts + a0 - r0, tx * ts + b0 - c0, fy, fx
+                )
+                sums[br:br + block.shape[0], bc:bc + block.shape[1]] += block
+
+        # Pixels per block (edge blocks are partial)
+        count_r = np.minimum(fy, (r1 - r0) - np.arange(out_h) * fy)
+        count_c = np.minimum(fx, (c1 - c0) - np.arange(out_w) * fx)
+        return (sums / np.outer(count_r, count_c)).astype(np.float32)
+
+    def resample(
+        self,
+        bbox: tuple[int, int, int, int],
+        shape: tuple[int, int],
+        transform=None,
+    ) -> np.ndarray:
+        """
+        Area-average a window onto exactly `shape` output cells.
+
+        Unlike `read`, the window need not be a multiple of the output size:
+        output cell (i, j) covers rows [row0 + i * h / out_h, ...) and
+        columns likewise, with fractional edges, and pixels split across two
+        cells are shared between them by overlap. The output spans the
+        window exactly, so no cell is padded or shifted.
+
+        Args:
+            bbox: (row0, row1, col0, col1) in scene pixels, end-exclusive;
+                must lie inside the scene
+            shape: (out_h, out_w)
+            transform: as in `read`
+
+        Returns:
+            float32 (out_h, out_w) array
+        """
+        H, W = self.shape
+        r0, r1, c0, c1 = (int(b) for b in bbox)
+        if not (0 <= r0 < r1 <= H and 0 <= c0 < c1 <= W):
+            raise ValueError(f"window {bbox} is empty or outside the scene of shape {self.shape}")
+        out_h, out_w = (int(n) for n in shape)
+        if out_h < 1 or out_w < 1:
+            raise ValueError(f"output shape must be positive, got {shape}")
+
+        out = np.zeros((out_h, out_w), dtype=np.float64)
+        ts = self.tile_size
+        for ty in range(r0 // ts, (r1 - 1) // ts + 1):
+            for tx in range(c0 // ts, (c1 - 1) // ts + 1):
+                tile = self.tile(ty, tx)
+                if transform is not None:
+                    tile = transform(tile)
+                a0, a1 = max(r0 - ty * ts, 0), min(r1 - ty * ts, tile.shape[0])
+                b0, b1 = max(c0 - tx * ts, 0), min(c1 - tx * ts, tile.shape[1])
+                # Window-relative pixel ranges of this tile part
+                wy = _area_weights(ty * ts + a0 - r0, ty * ts + a1 - r0, r1 - r0, out_h)
+                wx = _area_weights(tx * ts + b0 - c0, tx * ts + b1 - c0, c1 - c0, out_w)
+                out += wy @ np.asarray(tile[a0:a1, b0:b1], dtype=np.float64) @ wx.T
+        return out.astype(np.float32)
+
+
+def initial_oil_from_sar(
+    reader: SARTileReader,
+    bbox: tuple[int, int, int, int],
+    H: int,
+    W: int,
+    threshold: float | None = None,
+) -> np.ndarray:
+    """
+    Initial oil field on an (H, W) model grid from a SAR window.
+
+    Each model cell gets the fraction of its SAR pixels that are slick, so
+    the result is in [0, 1] like physics_ops.generate_initial_oil. The window
+    is mapped exactly onto the grid (see `SARTileReader.resample`), whatever
+    its size relative to (H, W).
+
+    Args:
+        reader: open SARTileReader
+        bbox: (row0, row1, col0, col1) window covering the model domain
+        H, W: model grid size
+        threshold: if given, pixels with backscatter below it count as slick
+            (oil dampens capillary waves and shows up dark); otherwise the
+            scene is taken to be a 0/1 slick mask already
+
+    Returns:
+        oil: (H, W) float32 in [0, 1]
+    """
+    transform = None if threshold is None else (lambda tile: tile < threshold)
+    coverage = reader.resample(bbox, (H, W), transform=transform)
+    return np.clip(coverage, 0.0, 1.0)
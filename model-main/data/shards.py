@@ -0,0 +1,336 @@
+# data/shards.py
+"""
+On-disk storage for (N, T, C, H, W) feature sequences.
+
+Three layouts are supported by `open_feature_store`:
+    train_sequences.npz     compressed, fully decoded into memory on open
+    train_sequences.npy     raw float32, opened with mmap_mode="r"
+    train_shards/           shard set (below), raw .npy or .npz shards
+
+A shard set is a directory with:
+    manifest.json       shapes, dtype and the ordered list of shard files
+    shard_00000.npy     features: (n_0, T, C, H, W)   (or shard_00000.npz)
+    shard_00001.npy     ...
+
+`ShardWriter` appends sequences as they are produced and writes a shard each
+time `shard_size` sequences are buffered, so memory stays bounded by one
+shard. The manifest is rewritten after every shard, so a partial set can be
+inspected while generation is still running; readers refuse a set whose
+manifest is not marked complete unless asked with allow_partial=True.
+
+`ShardedFeatures` opens a shard set read-only and serves sequences by global
+index, keeping only a few decoded shards in memory. Raw .npy files and shards
+are memory-mapped, so DataLoader workers share the OS page cache instead of
+each holding a private copy. Shards are raw .npy by default: a shuffled
+training loader touches a different shard for almost every window, and an
+.npz shard has to be decompressed whole for each of those reads. Compressed
+shards are meant for archiving and transfer.
+
+Convert an existing archive with:
+    python -m data.shards data/processed/train_sequences.npz
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import os
+import zipfile
+from collections import OrderedDict
+
+import numpy as np
+
+MANIFEST_NAME = "manifest.json"
+SHARD_FORMAT = "oil-spill-shards"
+SHARD_VERSION = 1
+
+
+def manifest_path(path: str) -> str:
+    """Resolve a shard-set directory or manifest file to the manifest path."""
+    if os.path.isdir(path):
+        return os.path.join(path, MANIFEST_NAME)
+    return path
+
+
+def is_shard_set(path: str) -> bool:
+    """True if `path` is a shard-set directory or its manifest file."""
+    if not (os.path.isdir(path) or path.endswith(".json")):
+        return False
+    return os.path.isfile(manifest_path(path))
+
+
+class ShardWriter:
+    """
+    Stream sequences into fixed-size shards.
+
+    Shards are raw .npy files that readers memory-map; with compress=True
+    they are compressed .npz (smaller, but every random read decodes a
+    whole shard, so use them for archiving rather than training).
+
+    Usage:
+        with ShardWriter(out_dir, shard_size=64) as writer:
+            for features in chunks:          # (n, T, C, H, W)
+                writer.write(features)
+    """
+
+    def __init__(self, out_dir: str, shard_size: int = 64, compress: bool = False):
+        if shard_size < 1:
+            raise ValueError(f"shard_size must be >= 1, got {shard_size}")
+        self.out_dir = out_dir
+        self.shard_size = int(shard_size)
+        self.compress = bool(compress)
+
+        self._buffer: np.ndarray | None = None
+        self._filled = 0
+        self._shards: list[dict] = []
+        self._num_sequences = 0
+        self._closed = False
+
+        os.makedirs(out_dir, exist_ok=True)
+
+    def __enter__(self) -> "ShardWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # On error, keep what was flushed but leave the manifest incomplete
+        if exc_type is None:
+            self.close()
+
+    @property
+    def num_sequences(self) -> int:
+        """Sequences written to disk or buffered so far."""
+        return self._num_sequences + self._filled
+
+    def write(self, features: np.ndarray) -> None:
+        """Append (n, T, C, H, W) sequences, flushing every full shard."""
+        if self._closed:
+            raise RuntimeError("ShardWriter is closed")
+        features = np.asarray(features, dtype=np.float32)
+        if features.ndim != 5:
+            raise ValueError(f"features must be (n, T, C, H, W), got {features.shape}")
+
+        if self._buffer is None:
+            self._buffer = np.empty((self.shard_size,) + features.shape[1:], dtype=np.float32)
+        elif features.shape[1:] != self._buffer.shape[1:]:
+            raise ValueError(
+                f"sequence shape {features.shape[1:]} does not match "
+                f"{self._buffer.shape[1:]}"
+            )
+
+        pos = 0
+        while pos < len(features):
+            take = min(self.shard_size - self._filled, len(features) - pos)
+            self._buffer[self._filled:self._filled + take] = features[pos:pos + take]
+            self._filled += take
+            pos += take
+            if self._filled == self.shard_size:
+                self._flush()
+
+    def close(self) -> str:
+        """Flush the last partial shard and mark the manifest complete."""
+        if not self._closed:
+            if self._filled:
+                self._flush()
+            self._closed = True
+            self._write_manifest(complete=True)
+        return manifest_path(self.out_dir)
+
+    def _flush(self) -> None:
+        name = f"shard_{len(self._shards):05d}.{'npz' if self.compress else 'npy'}"
+        path = os.path.join(self.out_dir, name)
+        if self.compress:
+            np.savez_compressed(path, features=self._buffer[:self._filled])
+        else:
+            np.save(path, self._buffer[:self._filled])
+        self._shards.append({"file": name, "num_sequences": self._filled})
+        self._num_sequences += self._filled
+        self._filled = 0
+        self._write_manifest(complete=False)
+
+    def _write_manifest(self, complete: bool) -> None:
+        sequence_shape = [] if self._buffer is None else list(self._buffer.shape[1:])
+        manifest = {
+            "format": SHARD_FORMAT,
+            "version": SHARD_VERSION,
+            "complete": complete,
+            "dtype": "float32",
+            "sequence_shape": sequence_shape,  # (T, C, H, W)
+            "num_sequences": self._num_sequences,
+            "shards": self._shards,
+        }
+        # Write-then-rename so readers never see a half-written manifest
+        path = manifest_path(self.out_dir)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, path)
+
+
+def read_manifest(path: str, allow_partial: bool = False) -> dict:
+    """
+    Load and validate a shard-set manifest.
+
+    A set whose writer has not closed it (still running, or crashed) is
+    rejected unless `allow_partial` is set; its shards hold only the
+    sequences flushed so far.
+    """
+    path = manifest_path(path)
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"shard manifest not found: {path}")
+    with open(path) as f:
+        manifest = json.load(f)
+    if manifest.get("format") != SHARD_FORMAT:
+        raise ValueError(f"not a shard manifest: {path}")
+    if not manifest.get("complete", False) and not allow_partial:
+        raise ValueError(
+            f"shard set is incomplete ({manifest.get('num_sequences', 0)} sequences "
+            f"so far): {path}; pass allow_partial=True to read it anyway"
+        )
+    return manifest
+
+
+class ShardedFeatures:
+    """
+    Read-only, array-like view of a shard set.
+
+    Supports `len()`, `.shape` and integer indexing returning one
+    (T, C, H, W) sequence. Decoded .npz shards (or .npy memory maps) are
+    kept in a small LRU cache, which is dropped when pickled to a worker.
+    """
+
+    def __init__(self, path: str, cache_shards: int = 2, allow_partial: bool = False):
+        self.root = os.path.dirname(manifest_path(path))
+        self.manifest = read_manifest(path, allow_partial=allow_partial)
+
+        counts = [s["num_sequences"] for s in self.manifest["shards"]]
+        self._files = [os.path.join(self.root, s["file"]) for s in self.manifest["shards"]]
+        self._starts = np.concatenate([[0], np.cumsum(counts)]).astype(int)
+
+        self.shape = (int(self._starts[-1]),) + tuple(self.manifest["sequence_shape"])
+        self.dtype = np.dtype(self.manifest["dtype"])
+
+        self._cache_shards = max(1, int(cache_shards))
+        self._cache: OrderedDict[int, np.ndarray] = OrderedDict()
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def __getitem__(self, idx: int) -> np.ndarray:
+        idx = int(idx)
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError(f"sequence index {idx} out of range for {len(self)}")
+
+        shard = int(np.searchsorted(self._starts, idx, side="right")) - 1
+        return self._load_shard(shard)[idx - self._starts[shard]]
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_cache"] = OrderedDict()
+        return state
+
+    def _load_shard(self, shard: int) -> np.ndarray:
+        if shard in self._cache:
+            self._cache.move_to_end(shard)
+            return self._cache[shard]
+
+        path = self._files[shard]
+        if path.endswith(".npy"):
+            features = np.load(path, mmap_mode="r")
+        else:
+            with np.load(path) as data:
+                features = data["features"].astype(np.float32, copy=False)
+        self._cache[shard] = features
+        if len(self._cache) > self._cache_shards:
+            self._cache.popitem(last=False)
+        return features
+
+
+def open_feature_store(path: str, allow_partial: bool = False):
+    """
+    Open a feature store in any supported layout.
+
+    Returns an array-like of shape (N, T, C, H, W): a read-only float32
+    memory map for .npy, a `ShardedFeatures` for a shard set, and an
+    in-memory float32 array for .npz. `allow_partial` is passed to
+    `read_manifest` for shard sets.
+    """
+    if is_shard_set(path):
+        return ShardedFeatures(path, allow_partial=allow_partial)
+
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"feature file not found: {path}")
+
+    if path.endswith(".npy"):
+        features = np.load(path, mmap_mode="r")
+        if features.dtype != np.float32:
+            raise ValueError(
+                f"{path} has dtype {features.dtype}; re-save it as float32 to memory-map it"
+            )
+        return features
+
+    data = np.load(path)
+    if "features" not in data:
+        raise KeyError("npz file must contain 'features' array")
+    return data["features"].astype(np.float32)
+
+
+def convert_npz_to_npy(
+    npz_path: str,
+    npy_path: str | None = None,
+    key: str = "features",
+    chunk_bytes: int = 64 << 20,
+) -> str:
+    """
+    Convert the `key` array of an .npz archive to a raw float32 .npy file.
+
+    The compressed member is streamed in chunks of about `chunk_bytes` into a
+    memory-mapped output, so the archive is never decoded fully in memory.
+
+    Returns:
+        path of the written .npy file
+    """
+    if npy_path is None:
+        npy_path = os.path.splitext(npz_path)[0] + ".npy"
+    tmp_path = npy_path + ".tmp"
+
+    with zipfile.ZipFile(npz_path) as zf, zf.open(f"{key}.npy") as src:
+        version = np.lib.format.read_magic(src)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(src)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(src)
+        if fortran_order or dtype.hasobject:
+            raise ValueError(f"{npz_path}:{key} must be a C-ordered numeric array")
+
+        out = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=np.float32, shape=shape)
+        row_items = int(np.prod(shape[1:], dtype=np.int64))
+        rows_per_chunk = max(1, chunk_bytes // max(1, row_items * dtype.itemsize))
+
+        for start in range(0, shape[0], rows_per_chunk):
+            n = min(rows_per_chunk, shape[0] - start)
+            buf = src.read(n * row_items * dtype.itemsize)
+            out[start:start + n] = np.frombuffer(buf, dtype=dtype).reshape((n,) + shape[1:])
+
+        out.flush()
+        del out
+
+    os.replace(tmp_path, npy_path)
+    return npy_path
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Convert a features .npz archive to a memory-mappable .npy file."
+    )
+    parser.add_argument("npz_path")
+    parser.add_argument("npy_path", nargs="?", default=None)
+    args = parser.parse_args()
+
+    print(f"[INFO] Converting {args.npz_path} ...")
+    npy_path = convert_npz_to_npy(args.npz_path, args.npy_path)
+    print(f"[INFO] Saved to: {npy_path}")
+
+
+if __name__ == "__main__":
+    main()
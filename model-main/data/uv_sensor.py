@@ -0,0 +1,168 @@
+# data/uv_sensor.py
+"""
+Chunked ingestion of UV / fluorescence sensor logs.
+
+Shipborne fluorometers log millions of rows per campaign, so the CSV is read
+in fixed-size chunks with explicit column dtypes (no type inference, float32
+intensities), each chunk is calibrated to oil concentration with the
+chemistry_ops calibration curves, and optionally binned onto the model grid
+by accumulating per-cell sums and counts. Memory is one chunk plus the grid,
+whatever the file size.
+
+Expected columns (names configurable through `columns`):
+    time        timestamp (kept as text)
+    lat, lon    position [deg]
+    intensity   raw UV / fluorescence reading
+
+Usage:
+    grid = GridAccumulator(model_lat, model_lon)
+    stats = process_uv_file("campaign.csv", coeffs=[0.0, 1.8, 0.02], grid=grid,
+                            out_path="campaign_calibrated.csv")
+    conc_map = grid.mean()        # (H, W), NaN where no samples
+"""
+
+from __future__ import annotations
+import os
+
+import numpy as np
+import pandas as pd
+
+from utils.chemistry_ops import uv_to_concentration_linear, uv_to_concentration_poly
+
+DEFAULT_COLUMNS = {"time": "time", "lat": "lat", "lon": "lon", "intensity": "intensity"}
+COLUMN_DTYPES = {"time": "string", "lat": "float64", "lon": "float64", "intensity": "float32"}
+DEFAULT_CHUNKSIZE = 200_000
+
+
+def iter_uv_chunks(path: str, chunksize: int = DEFAULT_CHUNKSIZE, columns: dict | None = None):
+    """
+    Yield typed DataFrame chunks with the standard column names.
+
+    Only the four sensor columns are parsed; rows without an intensity or
+    position are dropped.
+    """
+    names = {**DEFAULT_COLUMNS, **(columns or {})}
+    rename = {src: key for key, src in names.items()}
+    dtype = {names[key]: COLUMN_DTYPES[key] for key in names}
+
+    reader = pd.read_csv(path, usecols=list(names.values()), dtype=dtype, chunksize=chunksize)
+    for chunk in reader:
+        chunk = chunk.rename(columns=rename)
+        yield chunk.dropna(subset=["lat", "lon", "intensity"])
+
+
+def calibrate(intensity, a=None, b=None, coeffs=None) -> np.ndarray:
+    """
+    Intensity -> concentration with either the linear (a, b) or the
+    polynomial (coeffs) curve of utils.chemistry_ops.
+    """
+    if (coeffs is None) == (a is None or b is None):
+        raise ValueError("give either a and b (linear) or coeffs (polynomial)")
+    intensity = np.asarray(intensity, dtype=np.float32)
+    if coeffs is not None:
+        conc = uv_to_concentration_poly(intensity, np.asarray(coeffs, dtype=np.float32))
+    else:
+        conc = uv_to_concentration_linear(intensity, np.float32(a), np.float32(b))
+    return np.asarray(conc, dtype=np.float32)
+
+
+def _edges(centers: np.ndarray) -> np.ndarray:
+    """Increasing cell edges from (either-order) cell centres."""
+    c = np.sort(np.asarray(centers, dtype=np.float64))
+    mid = 0.5 * (c[1:] + c[:-1])
+    return np.concatenate([[2 * c[0] - mid[0]], mid, [2 * c[-1] - mid[-1]]])
+
+
+class GridAccumulator:
+    """
+    Running per-cell mean of point samples on a rectilinear lat/lon grid.
+
+    Args:
+        lat, lon: 1-D cell-centre coordinates of the model grid (either
+            order; the output follows the given order)
+    """
+
+    def __init__(self, lat, lon):
+        lat, lon = np.asarray(lat, dtype=np.float64), np.asarray(lon, dtype=np.float64)
+        if lat.size < 2 or lon.size < 2:
+            raise ValueError("grid needs at least 2 cells per axis")
+        self.shape = (lat.size, lon.size)
+        self._lat_edges, self._lon_edges = _edges(lat), _edges(lon)
+        # Bin i (sorted edges) -> index of that cell in the given order
+        self._lat_order = np.argsort(lat)
+        self._lon_order = np.argsort(lon)
+        self.sum = np.zeros(self.shape, dtype=np.float64)
+        self.count = np.zeros(self.shape, dtype=np.int64)
+
+    def add(self, lat, lon, values) -> int:
+        """Accumulate samples; points outside the grid are ignored.
+
+        Returns the number of samples that fell on the grid."""
+        i = np.searchsorted(self._lat_edges, lat, side="right") - 1
+        j = np.searchsorted(self._lon_edges, lon, side="right") - 1
+        inside = (i >= 0) & (i < self.shape[0]) & (j >= 0) & (j < self.shape[1])
+        inside &= np.isfinite(values)
+        flat = self._lat_order[i[inside]] * self.shape[1] + self._lon_order[j[inside]]
+        n_cells = self.shape[0] * self.shape[1]
+        self.sum += np.bincount(flat, weights=values[inside], minlength=n_cells).reshape(self.shape)
+        self.count += np.bincount(flat, minlength=n_cells).reshape(self.shape)
+        return int(inside.sum())
+
+    def mean(self) -> np.ndarray:
+        """(H, W) float32 mean per cell, NaN where there were no samples."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.count > 0, self.sum / self.count, np.nan).astype(np.float32)
+
+
+def process_uv_file(
+    path: str,
+    a=None,
+    b=None,
+    coeffs=None,
+    grid: GridAccumulator | None = None,
+    out_path: str | None = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    columns: dict | None = None,
+) -> dict:
+    """
+    Stream a sensor CSV: typed chunks -> calibration -> (gridding, output).
+
+    Args:
+        path: sensor CSV
+        a, b / coeffs: calibration, see `calibrate`
+        grid: optional GridAccumulator that receives every calibrated sample
+        out_path: optional CSV of (time, lat, lon, intensity, conc), written
+            chunk by chunk (replaced atomically when done)
+        chunksize: rows per chunk
+        columns: mapping from standard names to the file's column names
+
+    Returns:
+        {"rows": samples read, "gridded": samples on the grid,
+         "conc_min": ..., "conc_max": ..., "conc_mean": ...}
+    """
+    stats = {"rows": 0, "gridded": 0, "conc_min": np.inf, "conc_max": -np.inf}
+    conc_sum = 0.0
+    tmp_path = None if out_path is None else out_path + ".tmp"
+    header = True
+
+    for chunk in iter_uv_chunks(path, chunksize, columns):
+        conc = calibrate(chunk["intensity"].to_numpy(), a=a, b=b, coeffs=coeffs)
+        if conc.size == 0:
+            continue
+
+        stats["rows"] += conc.size
+        stats["conc_min"] = min(stats["conc_min"], float(np.nanmin(conc)))
+        stats["conc_max"] = max(stats["conc_max"], float(np.nanmax(conc)))
+        conc_sum += float(np.nansum(conc, dtype=np.float64))
+
+        if grid is not None:
+            stats["gridded"] += grid.add(chunk["lat"].to_numpy(), chunk["lon"].to_numpy(), conc)
+        if tmp_path is not None:
+            chunk = chunk.assign(conc=conc)
+            chunk.to_csv(tmp_path, mode="w" if header else "a", header=header, index=False)
+            header = False
+
+    if tmp_path is not None and os.path.exists(tmp_path):
+        os.replace(tmp_path, out_path)
+    stats["conc_mean"] = conc_sum / stats["rows"] if stats["rows"] else float("nan")
+    return stats
@@ -4,8 +4,21 @@ import pandas as pd
 import requests
 import os
 
-def load_sar_image(path):
-    """Load SAR image (e.g., .tif, .png, .npy)."""
+from data.netcdf_archive import is_archive, open_netcdf_archive
+from data.regrid import Regridder
+from data.sar_tiles import SARTileReader
+from data.uv_sensor import iter_uv_chunks
+from utils.forcing import wind_dataset_components
+
+def load_sar_image(path, bbox=None, downsample=1, tile_size=1024):
+    """Load SAR image (e.g., .tif, .png, .npy).
+
+    With `bbox` (row0, row1, col0, col1) and/or `downsample`, only the tiles
+    covering the window are read (see data.sar_tiles.SARTileReader); keep a
+    SARTileReader open instead when reading many windows of one scene."""
+    if bbox is not None or downsample != 1:
+        with SARTileReader(path, tile_size=tile_size) as reader:
+            return reader.read(bbox, downsample=downsample)
     if path.endswith(".npy"):
         return np.load(path)
     elif path.endswith(".tif") or path.endswith(".tiff"):
@@ -14,26 +27,66 @@ def load_sar_image(path):
     else:
         raise ValueError("Unsupported SAR format")
 
-def load_uv_data(path):
-    """Load UV fluorescence or optical sensor data."""
+def load_uv_data(path, chunksize=None, columns=None):
+    """Load UV fluorescence or optical sensor data.
+
+    With `chunksize`, returns an iterator of typed DataFrame chunks instead
+    (see data.uv_sensor, which also calibrates and grids them)."""
+    if chunksize is not None:
+        return iter_uv_chunks(path, chunksize=chunksize, columns=columns)
     df = pd.read_csv(path)
     return df
 
-def load_current_data(path):
-    """Load ocean current data (u/v components)."""
-    ds = xr.open_dataset(path)
+def _open_netcdf(path, variables, region=None, time_range=None, cache_dir=None, max_workers=None):
+    """Single file: lazy xr.open_dataset. Directory / glob / list, or any
+    subsetting option: data.netcdf_archive.open_netcdf_archive (parallel
+    per-file subset, concatenated along time, optional on-disk cache)."""
+    if not is_archive(path) and region is None and time_range is None and cache_dir is None:
+        return xr.open_dataset(path)
+    return open_netcdf_archive(
+        path,
+        variables=variables,
+        region=region,
+        time_range=time_range,
+        max_workers=max_workers,
+        cache_dir=cache_dir,
+    )
+
+def load_current_data(path, **archive_kw):
+    """Load ocean current data (u/v components).
+
+    `path` may be a file, a directory of daily files or a glob; `archive_kw`
+    (region, time_range, cache_dir, max_workers) go to open_netcdf_archive."""
+    ds = _open_netcdf(path, ['u', 'v'], **archive_kw)
     return ds['u'], ds['v']
 
-def load_wind_data(path):
-    """Load wind speed/direction."""
-    ds = xr.open_dataset(path)
+def load_wind_data(path, **archive_kw):
+    """Load wind speed/direction (file, directory or glob; see load_current_data)."""
+    ds = _open_netcdf(path, ['wind_speed', 'wind_dir'], **archive_kw)
     return ds['wind_speed'], ds['wind_dir']
 
-def load_temperature(path):
-    """Sea surface temperature."""
-    ds = xr.open_dataset(path)
+def load_temperature(path, **archive_kw):
+    """Sea surface temperature (file, directory or glob; see load_current_data)."""
+    ds = _open_netcdf(path, ['sst'], **archive_kw)
     return ds['sst']
 
+def regrid_to_grid(data, lat, lon, method="bilinear", cache_dir=None,
+                   lat_name="latitude", lon_name="longitude"):
+    """Map a wind/SST/current DataArray or Dataset onto the model grid (lat, lon).
+
+    Uses data.regrid.Regridder: the sparse weights are built once per grid pair
+    (and cached in `cache_dir`), then all time steps are one sparse matmul.
+
+    Wind direction is an angle and is not interpolated: pass load_wind_data's
+    (speed, dir) pair (or a Dataset with both) and the result holds
+    wind_u / wind_v instead (utils.forcing.wind_dataset_components)."""
+    if isinstance(data, tuple):
+        data = xr.merge(data)
+    data = wind_dataset_components(data)
+    regridder = Regridder(data[lat_name].values, data[lon_name].values, lat, lon,
+                          method=method, cache_dir=cache_dir)
+    return regridder.regrid_dataset(data, lat_name=lat_name, lon_name=lon_name)
+
 def download_from_url(url, save_path):
     """For automatic dataset download."""
     r = requests.get(url)
@@ -19,6 +19,7 @@ except ImportError:
 from data.make_synthetic_data import generate_synthetic_data
 from ai_predictor.train_predictor import train_predictor
 from ai_predictor.model_conv_lstm import ConvLSTMPredictor
+from ai_predictor.inference import InferenceEngine, export_engine
 from utils.biology_ops import update_DO, plankton_response, ecological_recovery_index
 
 def main():
@@ -69,17 +70,21 @@ def main():
     
     # Prepare for model
     device = "cuda" if torch.cuda.is_available() else "cpu"
-    model = ConvLSTMPredictor(input_channels=3, hidden_channels=32, num_layers=2)
-    
-    # Load trained weights
-    model.load_state_dict(torch.load("conv_lstm_predictor.pth", map_location=device))
-    model.to(device)
-    model.eval()
-    
-    with torch.no_grad():
-        x_tensor = torch.from_numpy(input_seq).unsqueeze(0).float().to(device) # (1, 4, C, H, W)
-        pred_tensor = model(x_tensor) # (1, 1, H, W)
-        pred_oil = pred_tensor.squeeze().cpu().numpy() # (H, W)
+    ckpt_path = "conv_lstm_predictor.pth"
+    export_path = "conv_lstm_predictor_ts.pt"
+
+    # Serve the exported TorchScript artifact if it is newer than the weights,
+    # otherwise export the trained weights now (eager model as a fallback)
+    if os.path.exists(export_path) and os.path.getmtime(export_path) >= os.path.getmtime(ckpt_path):
+        engine = InferenceEngine.from_export(export_path, map_location=device)
+    else:
+        model = ConvLSTMPredictor(input_channels=3, hidden_channels=32, num_layers=2)
+        model.load_state_dict(torch.load(ckpt_path, map_location=device))
+        model.to(device)
+        engine = export_engine(model, export_path, t_in=T_in)
+
+    pred_tensor = engine.predict(input_seq[None]) # (1, 1, H, W)
+    pred_oil = pred_tensor.squeeze().cpu().numpy() # (H, W)
         
     print("Prediction complete.")
     print(f"Max Predicted Oil Concentration: {pred_oil.max():.4f}")
@@ -0,0 +1,119 @@
+# tests/test_dataset.py
+"""
+Tests for ai_predictor/dataset.py.
+
+Run from model-main/:
+    python -m pytest -q tests
+"""
+
+import os
+import pickle
+import sys
+
+import numpy as np
+import torch
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from ai_predictor.dataset import OilSpillSequenceDataset, build_dataloaders
+
+
+def _features(N=4, T=8, C=3, H=6, W=5):
+    rng = np.random.default_rng(0)
+    return rng.random((N, T, C, H, W)).astype(np.float32)
+
+
+def _save_npy(tmp_path, features):
+    path = str(tmp_path / "features.npy")
+    np.save(path, features)
+    return path
+
+
+def _assert_same_samples(a, b):
+    assert len(a) == len(b)
+    for i in (0, len(a) // 2, len(a) - 1):
+        for x, y in zip(a[i], b[i]):
+            torch.testing.assert_close(x, y)
+
+
+def test_window_index_covers_every_offset_of_every_sequence():
+    features = _features()
+    dataset = OilSpillSequenceDataset(features, t_in=3, t_out=2, with_forcing=True)
+    assert len(dataset) == 4 * 4  # T - T_IN - T_OUT + 1 windows per sequence
+
+    for i in range(len(dataset)):
+        n, t0 = divmod(i, 4)
+        assert (dataset.window_seq[i], dataset.window_offset[i]) == (n, t0)
+        X, y, forcing = dataset[i]
+        np.testing.assert_array_equal(X.numpy(), features[n, t0:t0 + 3])
+        np.testing.assert_array_equal(y.numpy(), features[n, t0 + 3:t0 + 5, 0:1])
+        np.testing.assert_array_equal(forcing.numpy(), features[n, t0 + 3:t0 + 5, 1:])
+
+
+def test_window_index_first_window_only():
+    dataset = OilSpillSequenceDataset(_features(), t_in=3, t_out=2, all_windows=False)
+    assert len(dataset) == 4
+    np.testing.assert_array_equal(dataset.window_seq, np.arange(4))
+    np.testing.assert_array_equal(dataset.window_offset, np.zeros(4))
+
+
+def test_subset_returns_all_windows_of_the_sequences():
+    dataset = OilSpillSequenceDataset(_features(), t_in=3, t_out=2)
+    subset = dataset.subset([2, 0])
+    assert sorted(set(dataset.window_seq[subset.indices])) == [0, 2]
+    assert len(subset) == 2 * 4
+
+
+def test_build_dataloaders_splits_by_sequence():
+    loaders = build_dataloaders(_features(N=10), batch_size=2, t_in=3, t_out=2)
+    splits = [set(loader.dataset.dataset.window_seq[loader.dataset.indices]) for loader in loaders]
+
+    train, val, test = splits
+    assert (len(train), len(val), len(test)) == (7, 2, 1)
+    assert not (train & val or train & test or val & test)
+    assert train | val | test == set(range(10))
+    # Every window of a held-out sequence stays with it
+    assert len(loaders[1].dataset) == 2 * 4
+
+
+def test_pickle_roundtrip_npy_path_reopens_memmap(tmp_path):
+    dataset = OilSpillSequenceDataset(_save_npy(tmp_path, _features()), t_in=3, t_out=2)
+    state = pickle.dumps(dataset)
+    assert len(state) < dataset.features.nbytes  # data is not pickled
+    clone = pickle.loads(state)
+    assert isinstance(clone.features, np.memmap)
+    _assert_same_samples(clone, dataset)
+
+
+def test_pickle_roundtrip_memmap_passed_directly(tmp_path):
+    memmap = np.load(_save_npy(tmp_path, _features()), mmap_mode="r")
+    dataset = OilSpillSequenceDataset(memmap, t_in=3, t_out=2)
+    state = pickle.dumps(dataset)
+    assert len(state) < memmap.nbytes
+    clone = pickle.loads(state)
+    assert isinstance(clone.features, np.memmap)
+    _assert_same_samples(clone, dataset)
+
+
+def test_pickle_roundtrip_memmap_view_keeps_data(tmp_path):
+    memmap = np.load(_save_npy(tmp_path, _features()), mmap_mode="r")
+    dataset = OilSpillSequenceDataset(memmap[1:3], t_in=3, t_out=2)
+    _assert_same_samples(pickle.loads(pickle.dumps(dataset)), dataset)
+
+
+def test_pickle_roundtrip_in_memory_array():
+    dataset = OilSpillSequenceDataset(_features(), t_in=3, t_out=2, with_forcing=True)
+    _assert_same_samples(pickle.loads(pickle.dumps(dataset)), dataset)
+
+
+def test_spawn_worker_reads_direct_memmap(tmp_path):
+    memmap = np.load(_save_npy(tmp_path, _features()), mmap_mode="r")
+    dataset = OilSpillSequenceDataset(memmap, t_in=3, t_out=2)
+    loader = torch.utils.data.DataLoader(
+        dataset, batch_size=len(dataset), num_workers=1, multiprocessing_context="spawn"
+    )
+    X, y = next(iter(loader))
+    torch.testing.assert_close(X[-1], dataset[len(dataset) - 1][0])
+    torch.testing.assert_close(y[0], dataset[0][1])
@@ -0,0 +1,42 @@
+# tests/test_inference.py
+"""
+Tests for ai_predictor/inference.py.
+
+Run from model-main/:
+    python -m pytest -q tests
+"""
+
+import os
+import sys
+
+import pytest
+import torch
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from ai_predictor.inference import InferenceEngine, export_engine, load_exported
+from ai_predictor.model_conv_lstm import ConvLSTMPredictor
+
+pytestmark = pytest.mark.filterwarnings("ignore::FutureWarning")
+
+
+def test_export_engine_matches_eager(tmp_path):
+    torch.manual_seed(0)
+    model = ConvLSTMPredictor(3, hidden_channels=8).eval()
+    x = torch.rand(5, 4, 3, 20, 24)
+
+    engine = export_engine(model, str(tmp_path / "model_ts.pt"), t_in=4, batch_size=2)
+    assert isinstance(engine.model, torch.jit.ScriptModule)
+    with torch.no_grad():
+        torch.testing.assert_close(engine.predict(x), model(x), atol=1e-5, rtol=1e-4)
+
+    _, config = load_exported(str(tmp_path / "model_ts.pt"))
+    assert config["t_in"] == 4 and config["hidden_channels"] == 8
+
+
+def test_engine_rejects_wrong_window_length():
+    engine = InferenceEngine(ConvLSTMPredictor(3, hidden_channels=4), t_in=4)
+    with pytest.raises(ValueError):
+        engine.predict(torch.rand(1, 3, 3, 8, 8))
@@ -0,0 +1,33 @@
+# tests/test_make_synthetic_data.py
+"""
+Tests for data/make_synthetic_data.py.
+
+Run from model-main/:
+    python -m pytest -q tests
+"""
+
+import os
+import sys
+
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from data.make_synthetic_data import generate_synthetic_dataset, num_channels
+
+
+def test_dataset_is_identical_for_any_worker_count():
+    kwargs = dict(num_sequences=5, t_total=4, H=12, W=10, seed=7)
+    serial = generate_synthetic_dataset(num_workers=1, **kwargs)
+    pooled = generate_synthetic_dataset(num_workers=2, **kwargs)
+    assert serial.shape == (5, 4, num_channels(), 12, 10)
+    np.testing.assert_array_equal(serial, pooled)
+
+
+def test_sequence_does_not_depend_on_dataset_size():
+    kwargs = dict(t_total=4, H=12, W=10, num_workers=1, seed=7)
+    short = generate_synthetic_dataset(num_sequences=2, **kwargs)
+    long = generate_synthetic_dataset(num_sequences=5, **kwargs)
+    np.testing.assert_array_equal(short, long[:2])
@@ -0,0 +1,54 @@
+# tests/test_model_conv_lstm.py
+"""
+Tests for ai_predictor/model_conv_lstm.py.
+
+Run from model-main/:
+    python -m pytest -q tests
+"""
+
+import os
+import sys
+
+import torch
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from ai_predictor.model_conv_lstm import ConvLSTMPredictor
+
+
+def _pair(t_out=1):
+    torch.manual_seed(0)
+    fused = ConvLSTMPredictor(3, hidden_channels=8, num_layers=2, t_out=t_out)
+    hoisted = ConvLSTMPredictor(3, hidden_channels=8, num_layers=2, t_out=t_out, hoist_input=True)
+    hoisted.load_state_dict(fused.state_dict())
+    return fused, hoisted
+
+
+def test_hoisted_forward_matches_fused():
+    fused, hoisted = _pair(t_out=2)
+    x = torch.rand(3, 5, 3, 12, 10)
+    with torch.no_grad():
+        torch.testing.assert_close(hoisted(x), fused(x), atol=1e-6, rtol=1e-5)
+
+
+def test_hoisted_encode_continues_from_states():
+    fused, hoisted = _pair()
+    x = torch.rand(2, 6, 3, 9, 9)
+    with torch.no_grad():
+        states = fused.encode(x[:, :4])
+        expected = fused.encode(x[:, 4:], states)
+        got = hoisted.encode(x[:, 4:], states)
+    for (h_e, c_e), (h_g, c_g) in zip(expected, got):
+        torch.testing.assert_close(h_g, h_e, atol=1e-6, rtol=1e-5)
+        torch.testing.assert_close(c_g, c_e, atol=1e-6, rtol=1e-5)
+
+
+def test_hoisted_gradients_match_fused():
+    fused, hoisted = _pair()
+    x = torch.rand(2, 4, 3, 8, 8)
+    fused(x).square().sum().backward()
+    hoisted(x).square().sum().backward()
+    for (name, p_f), p_h in zip(fused.named_parameters(), hoisted.parameters()):
+        torch.testing.assert_close(p_h.grad, p_f.grad, atol=1e-5, rtol=1e-4, msg=name)
@@ -0,0 +1,215 @@
+# tests/test_physics_ops.py
+"""
+Tests for utils/physics_ops.py.
+
+Run from model-main/:
+    python -m pytest -q tests
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+from scipy.ndimage import laplace
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from utils.land_mask import LandMask
+from utils.physics_ops import (
+    SemiLagrangianAdvector,
+    _spectral_transfer,
+    apply_advection,
+    apply_diffusion,
+    apply_diffusion_spectral,
+    courant_number,
+    step_physics,
+    step_physics_adaptive,
+    step_physics_batch,
+)
+
+
+def _slick(H=32, W=32):
+    oil = np.zeros((H, W), dtype=np.float32)
+    oil[12:20, 12:20] = 0.8
+    return oil
+
+
+def test_courant_number_ignores_nan_cells():
+    u = np.full((8, 8), 0.5)
+    v = np.zeros((8, 8))
+    u[0, :] = np.nan
+    u[3, 3] = -2.0
+    assert np.isclose(courant_number(u, v, dt=1.0, dx=1.0), 2.0)
+
+
+def test_courant_number_ignores_inf_cells():
+    u = np.full((8, 8), 0.5)
+    v = np.zeros((8, 8))
+    u[2, 2] = np.inf
+    v[4, 4] = -np.inf
+    assert np.isclose(courant_number(u, v, dt=2.0, dx=1.0), 1.0)
+
+
+def test_adaptive_step_substeps_on_finite_max_with_inf_cell():
+    u = np.full((32, 32), 2.5, dtype=np.float32)
+    v = np.zeros((32, 32), dtype=np.float32)
+    u[0, 0] = np.inf
+    _, n_substeps = step_physics_adaptive(_slick(), u, v, D=0.1, dt=1.0, dx=1.0)
+    assert n_substeps == 3
+
+
+def test_courant_number_all_nan_is_zero():
+    nan = np.full((8, 8), np.nan)
+    assert courant_number(nan, nan, dt=1.0, dx=1.0) == 0.0
+
+
+def test_adaptive_step_all_nan_currents_takes_one_substep():
+    nan = np.full((32, 32), np.nan, dtype=np.float32)
+    oil_next, n_substeps = step_physics_adaptive(_slick(), nan, nan, D=0.1, dt=1.0, dx=1.0)
+    assert n_substeps == 1
+    assert oil_next.shape == (32, 32)
+
+
+def test_adaptive_step_matches_step_physics_when_slow():
+    rng = np.random.default_rng(0)
+    u = rng.uniform(-0.3, 0.3, (32, 32)).astype(np.float32)
+    v = rng.uniform(-0.3, 0.3, (32, 32)).astype(np.float32)
+    oil = _slick()
+
+    oil_next, n_substeps = step_physics_adaptive(oil, u, v, D=0.1, dt=1.0, dx=1.0)
+    assert n_substeps == 1
+    np.testing.assert_allclose(oil_next, step_physics(oil, u, v, D=0.1, dt=1.0, dx=1.0))
+
+
+def test_adaptive_step_substeps_fast_currents():
+    u = np.full((32, 32), 3.5, dtype=np.float32)
+    v = np.zeros((32, 32), dtype=np.float32)
+    _, n_substeps = step_physics_adaptive(_slick(), u, v, D=0.1, dt=1.0, dx=1.0)
+    assert n_substeps == 4
+
+
+def _coastal_mask(H=40, W=40):
+    land = np.zeros((H, W), dtype=bool)
+    land[:, :8] = True
+    land[:8, :] = True
+    return LandMask(land)
+
+
+def test_land_mask_laplace_matches_scipy_on_open_water():
+    field = np.random.default_rng(0).random((9, 7))
+    mask = LandMask(np.zeros(field.shape, dtype=bool))
+    np.testing.assert_allclose(
+        mask.expand(mask.laplace(mask.compress(field))), laplace(field, mode="reflect"), atol=1e-12
+    )
+
+
+def test_masked_diffusion_is_no_flux_at_the_coast():
+    mask = _coastal_mask()
+    oil = np.zeros(mask.shape, dtype=np.float32)
+    oil[8:12, 8:12] = 0.5  # touching the shoreline
+    still = np.zeros(mask.shape, dtype=np.float32)
+    stranded = np.zeros(mask.shape, dtype=np.float32)
+
+    out = oil
+    for _ in range(20):
+        out = step_physics(out, still, still, D=0.3, dt=1.0, dx=1.0, land_mask=mask, stranded=stranded)
+    assert np.isclose(out.sum(), oil.sum(), rtol=1e-5)
+    assert stranded.sum() == 0.0
+    assert out[mask.land].max() == 0.0
+
+
+def test_masked_step_conserves_mass_for_diagonal_onshore_flow():
+    mask = _coastal_mask()
+    oil = np.zeros(mask.shape, dtype=np.float32)
+    oil[18:28, 18:28] = 0.2
+    u = np.where(mask.land, np.nan, -0.7).astype(np.float32)
+    v = np.where(mask.land, np.nan, -0.45).astype(np.float32)
+    stranded = np.zeros(mask.shape, dtype=np.float32)
+
+    out = oil
+    for _ in range(40):
+        out = step_physics(out, u, v, D=0.2, dt=1.0, dx=1.0, land_mask=mask, stranded=stranded)
+    assert stranded.sum() > 0.9 * oil.sum()  # most of the slick reached the coast
+    assert np.isclose(out.sum() + stranded.sum(), oil.sum(), rtol=1e-5)
+
+
+def test_masked_step_rejects_spectral_diffusion():
+    mask = _coastal_mask()
+    zero = np.zeros(mask.shape, dtype=np.float32)
+    with pytest.raises(ValueError):
+        step_physics(zero, zero, zero, D=0.1, dt=1.0, dx=1.0, diffusion="spectral", land_mask=mask)
+
+
+def test_spectral_diffusion_matches_gaussian():
+    oil = np.random.default_rng(1).random((24, 31)).astype(np.float32)
+    for D in (0.05, 0.7, 4.0):
+        np.testing.assert_allclose(
+            apply_diffusion_spectral(oil, D, 1.0, 1.0), apply_diffusion(oil, D, 1.0, 1.0), atol=1e-5
+        )
+
+
+def test_spectral_batch_matches_single_fields_and_hits_cache():
+    rng = np.random.default_rng(2)
+    oil = rng.random((5, 16, 20)).astype(np.float32)
+    D = np.array([0.3, 1.1, 0.3, 0.0, 2.5])
+
+    batch = apply_diffusion_spectral(oil, D, 1.0, 1.0)
+    for n in range(len(D)):
+        np.testing.assert_allclose(batch[n], apply_diffusion_spectral(oil[n], D[n], 1.0, 1.0), atol=1e-6)
+
+    before = _spectral_transfer.cache_info()
+    apply_diffusion_spectral(oil, D, 1.0, 1.0)
+    after = _spectral_transfer.cache_info()
+    assert after.misses == before.misses
+    assert after.hits - before.hits == 2 * len(np.unique(D))
+
+
+def _fields(N=3, H=24, W=28, seed=3):
+    rng = np.random.default_rng(seed)
+    oil = rng.random((N, H, W)).astype(np.float32) * 0.5
+    u = rng.uniform(-1.5, 1.5, (N, H, W)).astype(np.float32)
+    v = rng.uniform(-1.5, 1.5, (N, H, W)).astype(np.float32)
+    return oil, u, v
+
+
+@pytest.mark.parametrize("diffusion", ["gaussian", "spectral"])
+def test_batch_step_matches_single_field_steps(diffusion):
+    oil, u, v = _fields()
+    D = np.array([0.1, 0.4, 1.2])
+    batch = step_physics_batch(oil, u, v, D, dt=1.0, dx=1.0, diffusion=diffusion)
+    for n in range(len(D)):
+        single = step_physics(oil[n], u[n], v[n], D[n], dt=1.0, dx=1.0, diffusion=diffusion)
+        np.testing.assert_allclose(batch[n], single, atol=1e-5)
+
+
+def test_advector_matches_apply_advection():
+    oil, u, v = _fields(N=1)
+    expected = apply_advection(oil[0], u[0], v[0], dt=1.0, dx=1.0)
+
+    advector = SemiLagrangianAdvector(oil.shape[1:])
+    np.testing.assert_allclose(advector(oil[0], u[0], v[0], 1.0, 1.0), expected, atol=1e-6)
+
+    out = np.empty_like(oil[0])
+    result = advector(oil[0], u[0], v[0], 1.0, 1.0, out=out)
+    assert result is out
+    np.testing.assert_allclose(out, expected, atol=1e-6)
+
+
+def test_batch_advector_matches_single_fields():
+    oil, u, v = _fields()
+    batch = SemiLagrangianAdvector(oil.shape)(oil, u, v, 1.0, 1.0)
+    for n in range(oil.shape[0]):
+        np.testing.assert_allclose(batch[n], apply_advection(oil[n], u[n], v[n], 1.0, 1.0), atol=1e-6)
+
+
+def test_step_with_advector_matches_plain_step():
+    oil, u, v = _fields(N=1)
+    advector = SemiLagrangianAdvector(oil.shape[1:])
+    np.testing.assert_allclose(
+        step_physics(oil[0], u[0], v[0], 0.3, 1.0, 1.0, advector=advector),
+        step_physics(oil[0], u[0], v[0], 0.3, 1.0, 1.0),
+        atol=1e-6,
+    )
@@ -0,0 +1,87 @@
+# tests/test_regrid.py
+"""
+Tests for data/regrid.py and the wind handling of utils/forcing.py.
+
+Run from model-main/:
+    python -m pytest -q tests
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+import xarray as xr
+from scipy.interpolate import RegularGridInterpolator
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from data.regrid import Regridder
+from utils.forcing import wind_dataset_components
+
+SRC_LAT = np.linspace(30.0, 40.0, 21)
+SRC_LON = np.linspace(120.0, 132.0, 25)
+DST_LAT = np.linspace(31.1, 38.9, 17)
+DST_LON = np.linspace(121.3, 130.7, 13)
+
+
+def test_bilinear_matches_regular_grid_interpolator():
+    field = np.random.default_rng(0).random((3, SRC_LAT.size, SRC_LON.size))
+    out = Regridder(SRC_LAT, SRC_LON, DST_LAT, DST_LON)(field)
+
+    points = np.stack(np.meshgrid(DST_LAT, DST_LON, indexing="ij"), axis=-1)
+    for t in range(field.shape[0]):
+        expected = RegularGridInterpolator((SRC_LAT, SRC_LON), field[t])(points)
+        np.testing.assert_allclose(out[t], expected, atol=1e-12)
+
+
+def test_descending_source_latitude_gives_same_result():
+    field = np.random.default_rng(1).random((SRC_LAT.size, SRC_LON.size))
+    ascending = Regridder(SRC_LAT, SRC_LON, DST_LAT, DST_LON)(field)
+    descending = Regridder(SRC_LAT[::-1], SRC_LON, DST_LAT, DST_LON)(field[::-1])
+    np.testing.assert_allclose(descending, ascending, atol=1e-12)
+
+
+@pytest.mark.parametrize("method", ["bilinear", "conservative"])
+def test_constant_field_is_preserved_with_land(method):
+    field = np.full((SRC_LAT.size, SRC_LON.size), 2.5)
+    field[:6, :8] = np.nan  # land
+    out = Regridder(SRC_LAT, SRC_LON, DST_LAT, DST_LON, method=method)(field)
+    finite = np.isfinite(out)
+    assert finite.mean() > 0.5
+    np.testing.assert_allclose(out[finite], 2.5, rtol=1e-12)
+
+
+def test_weights_are_cached_on_disk(tmp_path):
+    first = Regridder(SRC_LAT, SRC_LON, DST_LAT, DST_LON, cache_dir=str(tmp_path))
+    assert len(os.listdir(tmp_path)) == 1
+    second = Regridder(SRC_LAT, SRC_LON, DST_LAT, DST_LON, cache_dir=str(tmp_path))
+    assert (first.weights != second.weights).nnz == 0
+
+
+def test_wind_is_regridded_as_components_across_north():
+    # Direction alternates 350 / 10 degrees: both are northerly winds
+    shape = (1, SRC_LAT.size, SRC_LON.size)
+    direction = np.where(np.indices(shape)[2] % 2 == 0, 350.0, 10.0)
+    dims = ("time", "latitude", "longitude")
+    coords = {"time": [0], "latitude": SRC_LAT, "longitude": SRC_LON}
+    ds = xr.Dataset({
+        "wind_speed": xr.DataArray(np.full(shape, 5.0), dims=dims, coords=coords),
+        "wind_dir": xr.DataArray(direction, dims=dims, coords=coords),
+    })
+
+    regridded = Regridder(SRC_LAT, SRC_LON, DST_LAT, DST_LON).regrid_dataset(wind_dataset_components(ds))
+    assert set(regridded.data_vars) == {"wind_u", "wind_v"}
+    # Blowing towards the south, not the ~180 degree average of the raw angles
+    assert (regridded["wind_v"].values < -4.5).all()
+    assert np.abs(regridded["wind_u"].values).max() < 1.0
+
+
+def test_lone_wind_direction_is_rejected():
+    da = xr.DataArray(np.zeros((2, 2)), dims=("latitude", "longitude"), name="wind_dir")
+    with pytest.raises(ValueError):
+        wind_dataset_components(da)
+    with pytest.raises(ValueError):
+        wind_dataset_components(da.to_dataset())
@@ -0,0 +1,89 @@
+# tests/test_sar_tiles.py
+"""
+Tests for data/sar_tiles.py.
+
+Run from model-main/:
+    python -m pytest -q tests
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from data.sar_tiles import SARTileReader, initial_oil_from_sar
+
+
+def _scene(tmp_path, H=70, W=53, seed=0):
+    scene = np.random.default_rng(seed).random((H, W)).astype(np.float32)
+    path = str(tmp_path / "scene.npy")
+    np.save(path, scene)
+    return scene, path
+
+
+def _block_mean(a, fy, fx):
+    h, w = a.shape
+    return a.reshape(h // fy, fy, w // fx, fx).mean(axis=(1, 3))
+
+
+def test_read_matches_block_mean_across_tiles(tmp_path):
+    scene, path = _scene(tmp_path)
+    with SARTileReader(path, tile_size=16) as sar:
+        window = sar.read((3, 63, 5, 50), downsample=(4, 3))
+        full = sar.read()
+    np.testing.assert_allclose(window, _block_mean(scene[3:63, 5:50], 4, 3), rtol=1e-6)
+    np.testing.assert_array_equal(full, scene)
+
+
+def test_read_averages_partial_edge_blocks(tmp_path):
+    scene, path = _scene(tmp_path)
+    with SARTileReader(path, tile_size=16) as sar:
+        out = sar.read(downsample=8)
+    assert out.shape == (9, 7)
+    np.testing.assert_allclose(out[-1, -1], scene[64:, 48:].mean(), rtol=1e-6)
+    np.testing.assert_allclose(out[2, 3], scene[16:24, 24:32].mean(), rtol=1e-6)
+
+
+def test_resample_matches_read_when_divisible(tmp_path):
+    _, path = _scene(tmp_path)
+    bbox = (2, 62, 4, 49)
+    with SARTileReader(path, tile_size=16) as sar:
+        np.testing.assert_allclose(
+            sar.resample(bbox, (15, 9)), sar.read(bbox, downsample=(4, 5)), rtol=1e-5
+        )
+
+
+def test_resample_is_exact_area_average(tmp_path):
+    scene, path = _scene(tmp_path)
+    r0, r1, c0, c1 = 1, 68, 2, 51  # 67 x 49 pixels onto 10 x 7 cells
+    out_h, out_w = 10, 7
+    with SARTileReader(path, tile_size=16) as sar:
+        out = sar.resample((r0, r1, c0, c1), (out_h, out_w))
+
+    # Split every pixel into out_h x out_w sub-pixels so cell edges fall on
+    # sub-pixel boundaries, then a plain block mean is the exact answer
+    fine = np.kron(scene[r0:r1, c0:c1].astype(np.float64), np.ones((out_h, out_w)))
+    np.testing.assert_allclose(out, _block_mean(fine, r1 - r0, c1 - c0), rtol=1e-5)
+    assert np.isclose(out.mean(), scene[r0:r1, c0:c1].mean(), rtol=1e-5)
+
+
+def test_resample_rejects_window_outside_scene(tmp_path):
+    _, path = _scene(tmp_path)
+    with SARTileReader(path, tile_size=16) as sar:
+        with pytest.raises(ValueError):
+            sar.resample((0, 71, 0, 10), (5, 5))
+
+
+def test_initial_oil_from_sar_is_slick_fraction(tmp_path):
+    scene, path = _scene(tmp_path, H=64, W=48)
+    with SARTileReader(path, tile_size=16) as sar:
+        oil = initial_oil_from_sar(sar, (0, 64, 0, 48), H=16, W=12, threshold=0.3)
+    assert oil.shape == (16, 12)
+    assert oil.dtype == np.float32
+    assert oil.min() >= 0.0 and oil.max() <= 1.0
+    np.testing.assert_allclose(oil, _block_mean((scene < 0.3).astype(np.float64), 4, 4), rtol=1e-6)
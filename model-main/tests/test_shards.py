@@ -0,0 +1,94 @@
+# tests/test_shards.py
+"""
+Tests for data/shards.py.
+
+Run from model-main/:
+    python -m pytest -q tests
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from data.shards import (
+    ShardWriter,
+    ShardedFeatures,
+    convert_npz_to_npy,
+    open_feature_store,
+    read_manifest,
+)
+
+
+def _features(N=7, T=4, C=3, H=6, W=5, seed=0):
+    return np.random.default_rng(seed).random((N, T, C, H, W)).astype(np.float32)
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_sharded_features_match_written_sequences(tmp_path, compress):
+    features = _features()
+    with ShardWriter(str(tmp_path), shard_size=3, compress=compress) as writer:
+        writer.write(features[:2])
+        writer.write(features[2:])
+
+    manifest = read_manifest(str(tmp_path))
+    assert [s["num_sequences"] for s in manifest["shards"]] == [3, 3, 1]
+
+    store = open_feature_store(str(tmp_path))
+    assert isinstance(store, ShardedFeatures)
+    assert store.shape == features.shape
+    for n in list(range(len(features))) + [-1]:
+        np.testing.assert_array_equal(store[n], features[n])
+    with pytest.raises(IndexError):
+        store[len(features)]
+
+
+def test_incomplete_shard_set_needs_allow_partial(tmp_path):
+    features = _features()
+    writer = ShardWriter(str(tmp_path), shard_size=3)
+    writer.write(features[:5])  # one shard flushed, two sequences buffered
+
+    with pytest.raises(ValueError, match="incomplete"):
+        read_manifest(str(tmp_path))
+    with pytest.raises(ValueError, match="incomplete"):
+        open_feature_store(str(tmp_path))
+
+    partial = open_feature_store(str(tmp_path), allow_partial=True)
+    assert len(partial) == 3
+    np.testing.assert_array_equal(partial[2], features[2])
+
+    writer.close()
+    assert len(open_feature_store(str(tmp_path))) == 5
+
+
+def test_failed_writer_leaves_set_incomplete(tmp_path):
+    features = _features()
+    with pytest.raises(RuntimeError):
+        with ShardWriter(str(tmp_path), shard_size=3) as writer:
+            writer.write(features)
+            raise RuntimeError("generation failed")
+
+    with pytest.raises(ValueError, match="incomplete"):
+        read_manifest(str(tmp_path))
+    assert read_manifest(str(tmp_path), allow_partial=True)["num_sequences"] == 6
+
+
+def test_convert_npz_to_npy_streams_in_chunks(tmp_path):
+    features = _features().astype(np.float64)
+    npz_path = str(tmp_path / "train_sequences.npz")
+    np.savez_compressed(npz_path, features=features)
+
+    # Chunk smaller than a sequence, so every row is read separately
+    npy_path = convert_npz_to_npy(npz_path, chunk_bytes=64)
+    assert npy_path == str(tmp_path / "train_sequences.npy")
+    assert not os.path.exists(npy_path + ".tmp")
+
+    converted = open_feature_store(npy_path)
+    assert isinstance(converted, np.memmap)
+    assert converted.dtype == np.float32
+    np.testing.assert_array_equal(converted, features.astype(np.float32))
@@ -0,0 +1,92 @@
+# tests/test_streaming.py
+"""
+Tests for ai_predictor/streaming.py.
+
+Run from model-main/:
+    python -m pytest -q tests
+"""
+
+import os
+import sys
+
+import pytest
+import torch
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from ai_predictor.model_conv_lstm import ConvLSTMPredictor
+from ai_predictor.streaming import StreamingPredictor
+
+H, W = 10, 12
+
+
+def _model(hoist_input=False):
+    torch.manual_seed(0)
+    return ConvLSTMPredictor(3, hidden_channels=8, num_layers=2, hoist_input=hoist_input).eval()
+
+
+def _frames(n=3, T=5):
+    torch.manual_seed(1)
+    return torch.rand(n, T, 3, H, W)
+
+
+@pytest.mark.parametrize("hoist_input", [False, True])
+def test_updates_match_forward_on_growing_history(hoist_input):
+    model = _model(hoist_input)
+    x = _frames()
+    stream = StreamingPredictor(model, num_streams=3, grid_shape=(H, W))
+    with torch.no_grad():
+        for t in range(x.shape[1]):
+            torch.testing.assert_close(stream.update(x[:, t]), model(x[:, :t + 1]), atol=1e-6, rtol=1e-5)
+    assert stream.steps.tolist() == [5, 5, 5]
+
+
+def test_warmup_matches_forward_and_updates():
+    model = _model()
+    x = _frames()
+    stream = StreamingPredictor(model, num_streams=3, grid_shape=(H, W))
+    with torch.no_grad():
+        torch.testing.assert_close(stream.warmup(x[:, :4]), model(x[:, :4]), atol=1e-6, rtol=1e-5)
+        torch.testing.assert_close(stream.update(x[:, 4]), model(x), atol=1e-6, rtol=1e-5)
+
+
+def test_update_of_selected_streams_leaves_others_untouched():
+    model = _model()
+    x = _frames()
+    stream = StreamingPredictor(model, num_streams=3, grid_shape=(H, W))
+    stream.warmup(x[:, :3])
+    untouched = stream.states[0][0][1].clone()
+
+    out = stream.update(x[[2, 0], 3], streams=[2, 0])
+    with torch.no_grad():
+        torch.testing.assert_close(out, model(x[[2, 0], :4]), atol=1e-6, rtol=1e-5)
+    torch.testing.assert_close(stream.states[0][0][1], untouched)
+    assert stream.steps.tolist() == [4, 3, 4]
+
+
+def test_snapshot_restore_and_reset():
+    model = _model()
+    x = _frames()
+    stream = StreamingPredictor(model, num_streams=3, grid_shape=(H, W))
+    stream.warmup(x[:, :3])
+    saved = stream.snapshot()
+
+    expected = stream.update(x[:, 3])
+    stream.update(x[:, 4])
+    stream.restore(saved)
+    torch.testing.assert_close(stream.update(x[:, 3]), expected)
+
+    stream.reset(streams=[1])
+    with torch.no_grad():
+        torch.testing.assert_close(stream.update(x[[1], 4], streams=[1]), model(x[[1], 4:]),
+                                   atol=1e-6, rtol=1e-5)
+
+
+def test_update_rejects_wrong_frame_shape():
+    stream = StreamingPredictor(_model(), num_streams=3, grid_shape=(H, W))
+    with pytest.raises(ValueError):
+        stream.update(torch.rand(2, 3, H, W))
+    with pytest.raises(IndexError):
+        stream.update(torch.rand(1, 3, H, W), streams=[3])
@@ -0,0 +1,73 @@
+# tests/test_tiling.py
+"""
+Tests for ai_predictor/tiling.py.
+
+Run from model-main/:
+    python -m pytest -q tests
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+import torch
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from ai_predictor.model_conv_lstm import ConvLSTMPredictor
+from ai_predictor.rollout import forecast
+from ai_predictor.tiling import _tile_layout, receptive_radius, tiled_predict
+
+H, W = 150, 131
+
+
+def _model(t_out=1):
+    torch.manual_seed(0)
+    return ConvLSTMPredictor(3, hidden_channels=4, num_layers=2, t_out=t_out).eval()
+
+
+def _frames(T=3):
+    return np.random.default_rng(0).random((T, 3, H, W)).astype(np.float32)
+
+
+def test_receptive_radius_grows_with_layers_and_rollout():
+    model = _model()
+    assert receptive_radius(model, t_in=1) == 2
+    assert receptive_radius(model, t_in=3) == 4
+    assert receptive_radius(model, t_in=3, horizon=3) == 8
+
+
+def test_tile_layout_covers_axis_with_overlap():
+    tile, starts = _tile_layout(H, 48, 16)
+    assert tile <= 48 and starts[0] == 0 and starts[-1] + tile == H
+    assert all(b - a <= tile - 16 for a, b in zip(starts, starts[1:]))
+    assert _tile_layout(40, 48, 16) == (40, [0])
+
+
+@pytest.mark.parametrize("t_out", [1, 2])
+def test_tiled_predict_matches_full_domain(t_out):
+    model = _model(t_out)
+    x = _frames()
+    with torch.no_grad():
+        full = forecast(model, torch.from_numpy(x)[None])[0, :, 0]
+    tiled = tiled_predict(model, x, tile_size=48, batch_size=3)
+    assert tiled.shape == (t_out, H, W)
+    torch.testing.assert_close(tiled, full, atol=1e-5, rtol=0)
+
+
+def test_tiled_rollout_matches_full_domain():
+    model = _model()
+    x = _frames()
+    forcing = np.random.default_rng(1).random((2, 2, H, W)).astype(np.float32)
+    with torch.no_grad():
+        full = forecast(model, torch.from_numpy(x)[None], 3, torch.from_numpy(forcing)[None])[0, :, 0]
+    tiled = tiled_predict(model, torch.from_numpy(x), tile_size=64, future_forcing=forcing, horizon=3)
+    torch.testing.assert_close(tiled, full, atol=1e-5, rtol=0)
+
+
+def test_tiled_predict_rejects_overlap_not_below_tile():
+    with pytest.raises(ValueError):
+        tiled_predict(_model(), _frames(), tile_size=16)
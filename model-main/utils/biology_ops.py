@@ -40,7 +40,8 @@ def update_DO(
     k_consume=None,
     k_reaer=None,
     dt=3600.0,
-    oil_dampening=OIL_DAMPENING_DEFAULT
+    oil_dampening=OIL_DAMPENING_DEFAULT,
+    land_mask=None,
 ):
     """
     Update Dissolved Oxygen (DO) concentration.
@@ -69,11 +70,24 @@ def update_DO(
         Time step [s]
     oil_dampening : float
         Factor (0~1) reducing reaeration due to oil slick.
+    land_mask : LandMask, optional
+        If given (see utils/land_mask.py), only ocean cells are updated;
+        land cells keep their input DO.
 
     Returns
     -------
     DO_new : np.ndarray
     """
+    if land_mask is not None:
+        DO_ocean = update_DO(
+            *land_mask.compress(DO, DO_sat, oil_conc),
+            k_consume=k_consume,
+            k_reaer=k_reaer,
+            dt=dt,
+            oil_dampening=oil_dampening,
+        )
+        return land_mask.expand(DO_ocean, like=np.asarray(DO, dtype=float))
+
     DO = np.asarray(DO, dtype=float)
     DO_sat = np.asarray(DO_sat, dtype=float)
     oil_conc = np.asarray(oil_conc, dtype=float)
@@ -114,7 +128,8 @@ def plankton_response(
     sens_coeff=None, 
     dt=3600.0, 
     lc50=ZOO_LC50_DEFAULT,
-    recovery_rate=RECOVERY_RATE_PLANKTON
+    recovery_rate=RECOVERY_RATE_PLANKTON,
+    land_mask=None,
 ):
     """
     Calculate Plankton Biomass response (Mortality & Recovery).
@@ -138,11 +153,24 @@ def plankton_response(
         Lethal Concentration 50% [mg/L]
     recovery_rate : float
         Growth rate [1/s] when no oil is present.
+    land_mask : LandMask, optional
+        If given (see utils/land_mask.py), only ocean cells are updated;
+        land cells keep their input biomass.
 
     Returns
     -------
     plankton_new : np.ndarray
     """
+    if land_mask is not None:
+        plankton_ocean = plankton_response(
+            *land_mask.compress(plankton, oil_conc),
+            sens_coeff=sens_coeff,
+            dt=dt,
+            lc50=lc50,
+            recovery_rate=recovery_rate,
+        )
+        return land_mask.expand(plankton_ocean, like=np.asarray(plankton, dtype=float))
+
     plankton = np.asarray(plankton, dtype=float)
     oil_conc = np.asarray(oil_conc, dtype=float)
     
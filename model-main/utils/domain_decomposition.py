@@ -0,0 +1,192 @@
+# utils/domain_decomposition.py
+"""
+Domain-decomposed, multi-process version of physics_ops.step_physics.
+
+The grid is split into tiles that a process pool advances in parallel.
+Oil (double-buffered) and the current step's U/V live in
+multiprocessing.shared_memory, so the halo exchange is each worker reading
+the rows and columns around its tile straight from the shared "current"
+buffer before writing its interior into the "next" buffer.
+
+The halo of a tile is sized to the stencil of one step: the Gaussian kernel
+radius (4 sigma, as in gaussian_filter), the largest current displacement
+inside the tile, and one cell for the bilinear gather. Interior cells then
+see the same neighbourhood they see on the full grid, so the result matches
+the single-process run to float32 rounding (departure points are computed in
+tile-local coordinates, which round slightly differently).
+"""
+
+from __future__ import annotations
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from utils.physics_ops import step_physics
+
+# Shared buffers, by role: oil ping-pong pair and the step's currents
+_BUFFERS = ("oil_a", "oil_b", "u", "v")
+
+# Per-process views of the shared buffers (set by _attach in each worker)
+_shared_views: dict[str, np.ndarray] = {}
+_shared_handles: list[shared_memory.SharedMemory] = []
+
+
+def _attach(names: dict[str, str], shape: tuple[int, int]) -> None:
+    """Pool initializer: map the shared buffers into this worker."""
+    for key, name in names.items():
+        shm = shared_memory.SharedMemory(name=name)
+        _shared_handles.append(shm)
+        _shared_views[key] = np.ndarray(shape, dtype=np.float32, buffer=shm.buf)
+
+
+def _step_tile(
+    rows: tuple[int, int],
+    cols: tuple[int, int],
+    src: str,
+    dst: str,
+    D: float,
+    dt: float,
+    dx: float,
+    diffusion: str,
+) -> None:
+    """Advance one tile: read tile + halo from `src`, write the interior to `dst`."""
+    cur, nxt = _shared_views[src], _shared_views[dst]
+    u, v = _shared_views["u"], _shared_views["v"]
+    H, W = cur.shape
+    r0, r1 = rows
+    c0, c1 = cols
+
+    # Halo = diffusion radius + local advection displacement + bilinear stencil
+    sigma = np.sqrt(max(2.0 * D * dt, 0.0)) / (dx + 1e-8)
+    radius = int(4.0 * sigma + 0.5) if sigma >= 1e-3 else 0
+    speed = max(
+        float(np.max(np.abs(u[r0:r1, c0:c1]))),
+        float(np.max(np.abs(v[r0:r1, c0:c1]))),
+    )
+    halo = radius + int(np.ceil(speed * dt / (dx + 1e-8))) + 1
+
+    pr0, pr1 = max(r0 - halo, 0), min(r1 + halo, H)
+    pc0, pc1 = max(c0 - halo, 0), min(c1 + halo, W)
+    window = (slice(pr0, pr1), slice(pc0, pc1))
+
+    tile = step_physics(cur[window], u[window], v[window], D, dt, dx, diffusion=diffusion)
+    nxt[r0:r1, c0:c1] = tile[r0 - pr0:r1 - pr0, c0 - pc0:c1 - pc0]
+
+
+def split_tiles(H: int, W: int, tiles: tuple[int, int]) -> list[tuple[tuple[int, int], tuple[int, int]]]:
+    """Split an (H, W) grid into ny x nx near-equal tiles as ((r0, r1), (c0, c1))."""
+    ny, nx = tiles
+    row_edges = np.linspace(0, H, ny + 1).astype(int)
+    col_edges = np.linspace(0, W, nx + 1).astype(int)
+    return [
+        ((int(row_edges[i]), int(row_edges[i + 1])), (int(col_edges[j]), int(col_edges[j + 1])))
+        for i in range(ny)
+        for j in range(nx)
+        if row_edges[i + 1] > row_edges[i] and col_edges[j + 1] > col_edges[j]
+    ]
+
+
+class DomainDecomposedSimulation:
+    """
+    Tiled multi-process rollout of `step_physics` on one large grid.
+
+    Usage:
+        with DomainDecomposedSimulation(4096, 4096, D=0.3, dt=1.0, dx=1.0,
+                                        num_workers=8) as sim:
+            oil_T = sim.run(oil0, U, V)      # U, V: (T, H, W) or per-step iterables
+
+    Args:
+        H, W: grid size
+        D, dt, dx: physical parameters, as in step_physics
+        num_workers: pool size (default: CPU count)
+        tiles: (ny, nx) tile layout; default is one row strip per worker,
+            which keeps each tile contiguous in memory
+        diffusion: "gaussian" or "spectral", as in step_physics
+    """
+
+    def __init__(
+        self,
+        H: int,
+        W: int,
+        D: float,
+        dt: float,
+        dx: float,
+        num_workers: int | None = None,
+        tiles: tuple[int, int] | None = None,
+        diffusion: str = "gaussian",
+    ):
+        self.H, self.W = int(H), int(W)
+        self.D, self.dt, self.dx = float(D), float(dt), float(dx)
+        self.diffusion = diffusion
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.tiles = split_tiles(self.H, self.W, tiles or (self.num_workers, 1))
+
+        nbytes = self.H * self.W * np.dtype(np.float32).itemsize
+        self._shm = {key: shared_memory.SharedMemory(create=True, size=nbytes) for key in _BUFFERS}
+        self._views = {
+            key: np.ndarray((self.H, self.W), dtype=np.float32, buffer=shm.buf)
+            for key, shm in self._shm.items()
+        }
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.num_workers,
+            initializer=_attach,
+            initargs=({key: shm.name for key, shm in self._shm.items()}, (self.H, self.W)),
+        )
+
+    def __enter__(self) -> "DomainDecomposedSimulation":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self) -> None:
+        """Shut down the pool and release the shared buffers."""
+        if self._pool is None:
+            return
+        self._pool.shutdown()
+        self._pool = None
+        self._views.clear()
+        for shm in self._shm.values():
+            shm.close()
+            shm.unlink()
+
+    def run(self, oil: np.ndarray, U, V, callback=None) -> np.ndarray:
+        """
+        Advance `oil` through every step of the forcing.
+
+        Args:
+            oil: (H, W) initial field
+            U, V: (T, H, W) arrays, or iterables of (H, W) fields per step
+            callback: optional fn(t, oil_view) called after each step; the
+                view is only valid until the next step
+
+        Returns:
+            oil: (H, W) float32 after the last step (a copy)
+        """
+        if oil.shape != (self.H, self.W):
+            raise ValueError(f"expected shape {(self.H, self.W)}, got {oil.shape}")
+
+        src, dst = "oil_a", "oil_b"
+        self._views[src][...] = oil
+
+        for t, (u, v) in enumerate(zip(U, V)):
+            self._views["u"][...] = u
+            self._views["v"][...] = v
+
+            futures = [
+                self._pool.submit(
+                    _step_tile, rows, cols, src, dst, self.D, self.dt, self.dx, self.diffusion
+                )
+                for rows, cols in self.tiles
+            ]
+            # Waiting on every tile is the step barrier
+            for future in futures:
+                future.result()
+
+            src, dst = dst, src
+            if callback is not None:
+                callback(t, self._views[src])
+
+        return self._views[src].copy()
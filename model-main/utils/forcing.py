@@ -0,0 +1,170 @@
+# utils/forcing.py
+"""
+Time interpolation of external forcing (currents, wind) onto model steps.
+
+Forcing products are usually coarser in time than the model step (hourly or
+6-hourly wind vs. a model step of minutes). `ForcingInterpolator` precomputes,
+once, the bracketing forcing indices and linear weights of every model step,
+and then builds each step's fields on demand from just the two bracketing
+frames. Fields are never materialized at model resolution; the source arrays
+may be lazy (xarray DataArray, np.memmap), and a small LRU cache keeps the
+frames shared by consecutive steps in memory.
+
+Also provides `wind_components` to turn (speed, direction) wind into (u, v),
+and `wind_dataset_components` to do that for an xarray Dataset before it is
+interpolated in space (an angle cannot be averaged across the 0/360 wrap).
+"""
+
+from __future__ import annotations
+from collections import OrderedDict
+
+import numpy as np
+
+
+def _as_seconds(times, origin=None) -> tuple[np.ndarray, object]:
+    """Numeric times as float64; datetime64 times as seconds since `origin`."""
+    times = np.asarray(times)
+    if np.issubdtype(times.dtype, np.datetime64):
+        times = times.astype("datetime64[ns]")
+        origin = times[0] if origin is None else np.datetime64(origin, "ns")
+        return (times - origin) / np.timedelta64(1, "s"), origin
+    return times.astype(np.float64), origin
+
+
+def wind_components(speed, direction_deg):
+    """
+    (u, v) wind from speed and meteorological direction.
+
+    The direction is where the wind blows *from*, in degrees clockwise from
+    north (the usual convention of `wind_dir`), so a 0 degree wind blows
+    towards the south (v < 0).
+    """
+    theta = np.deg2rad(np.asarray(direction_deg, dtype=np.float64))
+    speed = np.asarray(speed, dtype=np.float64)
+    return (-speed * np.sin(theta)).astype(np.float32), (-speed * np.cos(theta)).astype(np.float32)
+
+
+def wind_dataset_components(data):
+    """
+    Replace wind_speed / wind_dir of an xarray Dataset by wind_u / wind_v.
+
+    Interpolating `wind_dir` directly averages angles (359 and 1 degrees give
+    180), so spatial regridding must work on components. Data without a
+    `wind_dir` variable is returned unchanged; a `wind_dir` without
+    `wind_speed` (or a lone wind_dir DataArray) raises ValueError.
+    """
+    if not hasattr(data, "data_vars"):  # DataArray
+        if data.name == "wind_dir":
+            raise ValueError("wind_dir is an angle; regrid wind_speed and wind_dir together as a Dataset")
+        return data
+    if "wind_dir" not in data.data_vars:
+        return data
+    if "wind_speed" not in data.data_vars:
+        raise ValueError("wind_dir needs wind_speed to be converted to wind_u / wind_v")
+
+    speed, direction = data["wind_speed"], data["wind_dir"]
+    wind_u, wind_v = wind_components(speed.values, direction.values)
+    return data.drop_vars(["wind_speed", "wind_dir"]).assign(
+        wind_u=speed.copy(data=wind_u), wind_v=speed.copy(data=wind_v)
+    )
+
+
+class ForcingInterpolator:
+    """
+    Linear-in-time forcing at model steps, computed lazily.
+
+    Usage:
+        interp = ForcingInterpolator(ds.time, model_times,
+                                     {"wind_u": ds.u10, "wind_v": ds.v10})
+        for step in range(len(interp)):
+            f = interp(step)                    # {"wind_u": (H, W), ...}
+            oil = step_physics(oil, u, v, D, dt, dx,
+                               wind_u=f["wind_u"], wind_v=f["wind_v"])
+
+    Args:
+        forcing_times: (T_f,) increasing times of the forcing frames
+            (numbers or datetime64)
+        step_times: (S,) model step times, same kind as forcing_times;
+            steps outside the forcing period take the first / last frame
+        fields: name -> array-like indexed as field[i] -> (H, W); only the
+            frames a step needs are ever read
+        cache_frames: number of source frames kept in memory
+            (default: two per field, the bracketing pair)
+
+    Attributes:
+        index0, index1: (S,) bracketing forcing indices per step
+        weight: (S,) float32 weight of index1 (0 -> exactly frame index0)
+    """
+
+    def __init__(self, forcing_times, step_times, fields: dict, cache_frames: int | None = None):
+        forcing, origin = _as_seconds(forcing_times)
+        steps, _ = _as_seconds(step_times, origin)
+        if forcing.ndim != 1 or forcing.size == 0:
+            raise ValueError("forcing_times must be a non-empty 1-D sequence")
+        if np.any(np.diff(forcing) <= 0):
+            raise ValueError("forcing_times must be strictly increasing")
+        for name, field in fields.items():
+            if len(field) != forcing.size:
+                raise ValueError(f"field {name!r} has {len(field)} frames, expected {forcing.size}")
+
+        # Bracketing indices and weights, computed once for every step
+        if forcing.size == 1:
+            self.index0 = np.zeros(steps.size, dtype=np.intp)
+            self.index1 = self.index0
+            self.weight = np.zeros(steps.size, dtype=np.float32)
+        else:
+            clamped = np.clip(steps, forcing[0], forcing[-1])
+            i0 = np.clip(np.searchsorted(forcing, clamped, side="right") - 1, 0, forcing.size - 2)
+            w = (clamped - forcing[i0]) / (forcing[i0 + 1] - forcing[i0])
+            # Snap steps that fall on a frame, so they read a single frame
+            on_upper = w >= 1.0
+            i0 = np.where(on_upper, i0 + 1, i0)
+            w = np.where(on_upper, 0.0, w)
+            self.index0 = i0.astype(np.intp)
+            self.index1 = np.minimum(self.index0 + 1, forcing.size - 1)
+            self.weight = w.astype(np.float32)
+
+        self.fields = dict(fields)
+        self.cache_frames = cache_frames or 2 * max(len(self.fields), 1)
+        self._frames: OrderedDict = OrderedDict()
+
+    def __len__(self) -> int:
+        return int(self.weight.size)
+
+    def frame(self, name: str, index: int) -> np.ndarray:
+        """Source frame `index` of field `name` as read-only float32 (LRU cached)."""
+        key = (name, int(index))
+        frame = self._frames.get(key)
+        if frame is not None:
+            self._frames.move_to_end(key)
+            return frame
+
+        frame = np.asarray(self.fields[name][int(index)], dtype=np.float32)
+        if not frame.flags.owndata:
+            frame = frame.copy()
+        frame.flags.writeable = False
+        self._frames[key] = frame
+        while len(self._frames) > self.cache_frames:
+            self._frames.popitem(last=False)
+        return frame
+
+    def field(self, name: str, step: int) -> np.ndarray:
+        """Field `name` at model step `step`, (H, W) float32.
+
+        Steps that fall on a forcing frame return the cached (read-only)
+        frame itself; otherwise a new array is returned.
+        """
+        w = self.weight[step]
+        f0 = self.frame(name, self.index0[step])
+        if w == 0.0:
+            return f0
+        f1 = self.frame(name, self.index1[step])
+        return f0 + w * (f1 - f0)
+
+    def __call__(self, step: int) -> dict:
+        """All fields at model step `step`."""
+        return {name: self.field(name, step) for name in self.fields}
+
+    def __iter__(self):
+        for step in range(len(self)):
+            yield self(step)
@@ -0,0 +1,135 @@
+# utils/land_mask.py
+"""
+Land / ocean layout of a model grid.
+
+CMEMS currents are NaN over land. `LandMask` turns that into precomputed
+index arrays so the physics, biology and cleanup models can work on ocean
+cells only ("compact" 1-D arrays of length n_ocean) instead of the full
+(H, W) grid:
+
+- ocean_index: flat indices of ocean cells (row-major order)
+- ocean_neighbors: (n_ocean, 4) compact indices of the N/S/W/E neighbours;
+  a neighbour on land or off the grid points back at the cell itself, which
+  makes the compact Laplacian no-flux at the coast and the domain edge
+- coast_index: flat indices of land cells touching the ocean (the shoreline
+  where oil strands)
+"""
+
+from __future__ import annotations
+import numpy as np
+
+# N, S, W, E offsets (row, col)
+_OFFSETS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+
+class LandMask:
+    """
+    Precomputed ocean-cell indexing for an (H, W) grid.
+
+    Usage:
+        mask = LandMask.from_currents(U, V)        # land where U/V are NaN
+        oil = step_physics(oil, u, v, D, dt, dx, land_mask=mask, stranded=beached)
+        do_ocean = mask.compress(do_map)            # (n_ocean,)
+        do_map = mask.expand(do_ocean, like=do_map)
+
+    Args:
+        land: (H, W) boolean array, True on land
+    """
+
+    def __init__(self, land: np.ndarray):
+        land = np.asarray(land, dtype=bool)
+        if land.ndim != 2:
+            raise ValueError(f"land mask must be 2-D, got shape {land.shape}")
+        self.land = land
+        self.ocean = ~land
+        self.shape = land.shape
+        H, W = self.shape
+
+        self.ocean_index = np.flatnonzero(self.ocean)
+        self.land_index = np.flatnonzero(land)
+
+        # Flat -> compact position of each ocean cell (-1 on land)
+        compact = np.full(H * W, -1, dtype=np.intp)
+        compact[self.ocean_index] = np.arange(self.ocean_index.size)
+
+        # Neighbour tables; off-grid neighbours are marked -1 like land
+        rows, cols = np.divmod(np.arange(H * W), W)
+        neighbor_flat = np.full((H * W, 4), -1, dtype=np.intp)
+        for k, (dr, dc) in enumerate(_OFFSETS):
+            r, c = rows + dr, cols + dc
+            inside = (r >= 0) & (r < H) & (c >= 0) & (c < W)
+            neighbor_flat[inside, k] = r[inside] * W + c[inside]
+        neighbor_ocean = np.where(neighbor_flat >= 0, compact[neighbor_flat], -1)
+
+        # Ocean cells: neighbours on land / off the grid reflect to the cell itself
+        self_compact = np.arange(self.ocean_index.size)[:, None]
+        ocean_nbrs = neighbor_ocean[self.ocean_index]
+        self.ocean_neighbors = np.where(ocean_nbrs >= 0, ocean_nbrs, self_compact)
+
+        # Shoreline: land cells with at least one ocean neighbour
+        on_coast = (neighbor_ocean[self.land_index] >= 0).any(axis=1)
+        self.coast_index = self.land_index[on_coast]
+
+        # Grid coordinates of the ocean cells, for the advection trace
+        self.ocean_y, self.ocean_x = (
+            a.astype(np.float32) for a in np.divmod(self.ocean_index, W)
+        )
+
+    @classmethod
+    def from_currents(cls, u: np.ndarray, v: np.ndarray) -> "LandMask":
+        """
+        Land = cells where u or v is not finite at any time.
+
+        Args:
+            u, v: (H, W) or (T, H, W) current fields (e.g. CMEMS uo / vo)
+        """
+        finite = np.isfinite(u) & np.isfinite(v)
+        if finite.ndim == 3:
+            finite = finite.all(axis=0)
+        return cls(~finite)
+
+    @property
+    def n_ocean(self) -> int:
+        return int(self.ocean_index.size)
+
+    @property
+    def ocean_fraction(self) -> float:
+        return self.n_ocean / self.land.size
+
+    def compress(self, *fields):
+        """
+        Ocean values of each field as compact (n_ocean,) arrays.
+
+        Scalars pass through unchanged, so per-cell and uniform parameters can
+        be mixed. Returns a single value for one field, a tuple otherwise.
+        """
+        out = tuple(
+            field if np.ndim(field) == 0 else np.asarray(field).reshape(-1)[self.ocean_index]
+            for field in fields
+        )
+        return out[0] if len(out) == 1 else out
+
+    def expand(self, values: np.ndarray, like: np.ndarray | None = None, fill: float = 0.0) -> np.ndarray:
+        """
+        Scatter compact ocean values back onto the (H, W) grid.
+
+        Land cells keep the values of `like` (copied) or are set to `fill`.
+        """
+        if like is None:
+            out = np.full(self.shape, fill, dtype=np.result_type(values))
+        else:
+            out = np.array(like, dtype=np.result_type(like, values), copy=True)
+        out.reshape(-1)[self.ocean_index] = values
+        return out
+
+    def fill_land(self, field: np.ndarray, value: float = 0.0) -> np.ndarray:
+        """Copy of `field` ((H, W) or (T, H, W)) with land cells set to `value`."""
+        return np.where(self.land, np.asarray(value, dtype=np.result_type(field)), field)
+
+    def laplace(self, values: np.ndarray) -> np.ndarray:
+        """
+        5-point Laplacian of compact ocean values, no-flux at land and edges.
+
+        On an all-ocean grid this equals scipy.ndimage.laplace (mode="reflect").
+        """
+        return values[self.ocean_neighbors].sum(axis=1) - 4.0 * values
@@ -2,9 +2,14 @@ import numpy as np
 from scipy.ndimage import laplace  # [핵심] 심화 모델의 상징!
 
 class ScientificCleanupRecovery:
-    def __init__(self, H=64, W=64):
+    def __init__(self, H=64, W=64, land_mask=None):
         self.H = H
         self.W = W
+
+        # 육지 마스크 (utils/land_mask.py 의 LandMask). 주어지면 바다 격자만 계산
+        if land_mask is not None and land_mask.shape != (H, W):
+            raise ValueError(f"land mask shape {land_mask.shape} != {(H, W)}")
+        self.land_mask = land_mask
         
         # [Scientific Constants]
         self.k_deg_natural = 0.05   # 자연 분해율
@@ -25,6 +30,9 @@ class ScientificCleanupRecovery:
         # 민감도 맵
         y, x = np.ogrid[:H, :W]
         self.bio_sensitivity = 0.5 + 0.5 * (x / W)
+        if land_mask is not None:
+            # 육지는 방제 우선순위 0
+            self.bio_sensitivity = np.where(land_mask.land, 0.0, self.bio_sensitivity)
 
     def step_1_calculate_hotspots(self, oil_map, toc_map):
         norm_oil = oil_map / (np.max(oil_map) + 1e-6)
@@ -36,7 +44,14 @@ class ScientificCleanupRecovery:
         cleaned_oil = oil_map.copy()
         cleaned_toc = toc_map.copy()
         flat_priority = priority_map.flatten()
-        target_indices = np.argpartition(flat_priority, -ships * capacity)[-ships * capacity:]
+        if self.land_mask is None:
+            target_indices = np.argpartition(flat_priority, -ships * capacity)[-ships * capacity:]
+        else:
+            # 배는 바다 격자만 갈 수 있음: 바다 후보 중에서 상위 격자 선택
+            ocean = self.land_mask.ocean_index
+            n_targets = min(ships * capacity, ocean.size)
+            top = np.argpartition(flat_priority[ocean], -n_targets)[-n_targets:]
+            target_indices = ocean[top]
         
         removal_eff = 0.9
         ys, xs = np.unravel_index(target_indices, (self.H, self.W))
@@ -48,10 +63,27 @@ class ScientificCleanupRecovery:
         return cleaned_oil, cleaned_toc, mask
 
     def step_3_recovery_odes(self, oil_map, do_map, plankton_map, dt_days=1.0):
+        if self.land_mask is None:
+            return self._recovery_update(oil_map, do_map, plankton_map, laplace, dt_days)
+
+        # 육지 마스크: 바다 격자만 1차원으로 모아서 계산하고 다시 격자로 펼침
+        # (육지 값은 그대로 유지, 해안은 no-flux 경계)
+        mask = self.land_mask
+        next_oil, next_do, next_plank, _ = self._recovery_update(
+            *mask.compress(oil_map, do_map, plankton_map), mask.laplace, dt_days
+        )
+        return (
+            mask.expand(next_oil, like=oil_map),
+            mask.expand(next_do, like=do_map),
+            mask.expand(next_plank, like=plankton_map),
+            None,
+        )
+
+    def _recovery_update(self, oil_map, do_map, plankton_map, laplacian, dt_days):
         # [심화] 1. 확산 (Diffusion) 계산
-        diff_oil = self.D_oil * laplace(oil_map)
-        diff_do = self.D_oxygen * laplace(do_map)
-        diff_plank = self.D_plankton * laplace(plankton_map)
+        diff_oil = self.D_oil * laplacian(oil_map)
+        diff_do = self.D_oxygen * laplacian(do_map)
+        diff_plank = self.D_plankton * laplacian(plankton_map)
         
         # 2. 반응 (Reaction) 계산
         delta_oil = self.k_deg_natural * oil_map 